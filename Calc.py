@@ -1,9 +1,17 @@
+import hashlib
+import html
+import importlib
+import math
+import os
+import threading
+from contextlib import contextmanager
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 
+import metrics
+import profiling
+
 st.set_page_config(
     page_title="CECS Financial Analytics | UTK",
     page_icon="🍊",
@@ -14,402 +22,118 @@ st.set_page_config(
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
 if 'theme' not in st.session_state:
-    st.session_state.theme = 'light'
-if 'scenarios' not in st.session_state:
-    st.session_state.scenarios = []
+    st.session_state.theme = 'dark'
+if 'input_mode' not in st.session_state:
+    st.session_state.input_mode = 'instant'
+if 'username' not in st.session_state:
+    st.session_state.username = None
+
+# The analytics stack (pandas, numpy, plotly, reportlab) is imported only past the login screen,
+# so the login screen renders without it; prewarm_analytics() loads it in the background meanwhile
+if st.session_state.logged_in:
+    import pandas as pd
+
+    import artifacts
+    import export
+    import model
+    import report
+    import risk
+    import scenarios
+    import tables
+
+    if 'recalculation' not in st.session_state:
+        # The model's dependency graph for this session; a rerun recomputes only what changed inputs feed
+        st.session_state.recalculation = model.Recalculation()
+
+# Python-format twin of tables.MONEY, for Styler
+MONEY_FORMAT = '${:,.0f}'
+
+
+def number_columns(frame):
+    # Tables stay numeric; currency, count and percent formatting is applied only when displayed
+    return {column: st.column_config.NumberColumn(format=tables.COLUMN_FORMATS[column])
+            for column in frame.columns if column in tables.COLUMN_FORMATS}
+
+
+def plotly_chart(figure, name):
+    # Sending a figure to the browser is timed as its own section when timing is on
+    with profiling.section(f"chart: {name}"):
+        st.plotly_chart(figure, width="stretch", theme=None)
+
+
+def dataframe(data, name, **kwargs):
+    with profiling.section(f"table: {name}"):
+        st.dataframe(data, width="stretch", hide_index=True, **kwargs)
+
+
+def growth_schedule(text):
+    # "3" -> 0.03, "5, 4, 3" -> (0.05, 0.04, 0.03); raises ValueError on anything else
+    rates = tuple(float(value) / 100 for value in text.replace('%', '').split(',') if value.strip())
+    if not rates or not all(math.isfinite(r) and r > -1 for r in rates):
+        raise ValueError(text)
+    return rates[0] if len(rates) == 1 else rates
+
+
+@contextmanager
+def input_group(key):
+    # In apply mode the block is a form: its inputs are sent together, one rerun per Apply
+    if st.session_state.input_mode != 'apply':
+        yield
+        return
+    with st.form(key, border=False):
+        yield
+        st.form_submit_button("✅ Apply Changes", width="stretch")
+
+
+def kept(widget, *args, key, **kwargs):
+    # A widget inside a tab. Tabs are lazy, so a closed tab's widgets are not rendered and Streamlit
+    # drops their state; the value is also kept under a second key and seeds the widget when it is back
+    stored = f'kept_{key}'
+    if stored in st.session_state:
+        value = st.session_state[stored]
+        if widget in (st.selectbox, st.radio):
+            kwargs['index'] = list(args[1]).index(value)
+        elif widget is st.multiselect:
+            kwargs['default'] = [v for v in value if v in args[1]]
+        else:
+            kwargs['value'] = value
+    st.session_state[stored] = value = widget(*args, key=key, **kwargs)
+    return value
+
+
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'cecs.min.css')
+
+
+@st.cache_resource(show_spinner=False)
+def stylesheet_version(modified):
+    # Content hash in the URL; a changed stylesheet gets a new URL, an unchanged one stays in the browser cache
+    with open(STYLESHEET_PATH, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
 
 def load_css():
-    st.markdown("""
-        <style>
-        /* ========== GLOBAL STYLES ========== */
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
-
-        * {
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        }
-
-        /* Main background - dark */
-        .main {
-            background-color: #1a1a1a;
-        }
-
-        /* ========== SIDEBAR - GREY NOT WHITE ========== */
-        section[data-testid="stSidebar"] {
-            background-color: #2c2c2c !important;
-            border-right: 1px solid #3a3a3a;
-        }
-
-        section[data-testid="stSidebar"] > div {
-            padding-top: 2rem;
-            background-color: #2c2c2c;
-        }
-
-        /* Sidebar text colors */
-        section[data-testid="stSidebar"] h2,
-        section[data-testid="stSidebar"] h3,
-        section[data-testid="stSidebar"] label,
-        section[data-testid="stSidebar"] p,
-        section[data-testid="stSidebar"] span {
-            color: #e0e0e0 !important;
-        }
-
-        section[data-testid="stSidebar"] .stMarkdown {
-            color: #e0e0e0 !important;
-        }
-
-        /* ========== TYPOGRAPHY ========== */
-        h1, h2, h3, h4, h5, h6 {
-            font-weight: 700;
-            letter-spacing: -0.02em;
-        }
-
-        /* Main title - WHITE not grey */
-        h1 {
-            color: #FFFFFF !important;
-            font-size: 2.5rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-
-        /* Subtitle - ORANGE */
-        h3 {
-            color: #FF8200 !important;
-            font-size: 1.3rem !important;
-        }
-
-        h2 {
-            color: #e0e0e0 !important;
-            font-size: 1.8rem !important;
-            margin-top: 1.5rem !important;
-        }
-
-        h4 {
-            color: #FF8200 !important;
-            font-size: 1.1rem !important;
-        }
-
-        /* Regular text on dark background */
-        p, span, div {
-            color: #e0e0e0;
-        }
-
-        /* ========== METRIC CARDS - DARK CARDS WITH ORANGE BORDER ========== */
-        div[data-testid="stMetric"] {
-            background: linear-gradient(135deg, #2c2c2c 0%, #3a3a3a 100%) !important;
-            padding: 1.5rem;
-            border-radius: 12px;
-            border: 2px solid #FF8200;
-            box-shadow: 0 4px 12px rgba(255, 130, 0, 0.3);
-            transition: all 0.3s ease;
-        }
-
-        div[data-testid="stMetric"]:hover {
-            transform: translateY(-4px);
-            box-shadow: 0 8px 20px rgba(255, 130, 0, 0.5);
-            border-color: #ff9f40;
-            background: linear-gradient(135deg, #3a3a3a 0%, #4a4a4a 100%) !important;
-        }
-
-        /* Metric values - WHITE on dark cards */
-        div[data-testid="stMetricValue"] {
-            color: #FFFFFF !important;
-            font-size: 2.2rem !important;
-            font-weight: 800 !important;
-            line-height: 1.2 !important;
-        }
-
-        div[data-testid="stMetricValue"] > div {
-            color: #FFFFFF !important;
-        }
-
-        /* Metric labels - LIGHT GREY on dark cards */
-        div[data-testid="stMetricLabel"] {
-            color: #b0b0b0 !important;
-            font-weight: 600 !important;
-            font-size: 0.875rem !important;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            margin-bottom: 0.5rem !important;
-        }
-
-        div[data-testid="stMetricLabel"] > div {
-            color: #b0b0b0 !important;
-        }
-
-        /* Metric delta - BRIGHT ORANGE */
-        div[data-testid="stMetricDelta"] {
-            color: #ff9f40 !important;
-            font-weight: 600 !important;
-            font-size: 0.875rem !important;
-        }
-
-        div[data-testid="stMetricDelta"] svg {
-            fill: #ff9f40 !important;
-        }
-
-        /* ========== INPUT FIELDS ========== */
-        div[data-testid="stNumberInput"] > div > div > input {
-            font-size: 1.1rem !important;
-            font-weight: 600 !important;
-            color: #e0e0e0 !important;
-            background-color: #3a3a3a !important;
-            border: 2px solid #4a4a4a !important;
-            border-radius: 8px !important;
-            padding: 0.75rem !important;
-            transition: all 0.2s ease;
-        }
-
-        div[data-testid="stNumberInput"] > div > div > input:focus {
-            border-color: #FF8200 !important;
-            box-shadow: 0 0 0 3px rgba(255, 130, 0, 0.2) !important;
-            outline: none !important;
-            background-color: #404040 !important;
-        }
-
-        /* ========== TEXT INPUTS ========== */
-        input[type="text"], input[type="password"] {
-            color: #e0e0e0 !important;
-            background-color: #3a3a3a !important;
-            border-color: #4a4a4a !important;
-        }
-
-        input[type="text"]:focus, input[type="password"]:focus {
-            border-color: #FF8200 !important;
-            background-color: #404040 !important;
-        }
-
-        /* ========== SLIDERS ========== */
-        .stSlider > div > div > div > div {
-            background-color: #FF8200 !important;
-        }
-
-        .stSlider > div > div > div > div > div {
-            color: #e0e0e0 !important;
-            font-weight: 600 !important;
-        }
-
-        .stSlider [role="slider"] {
-            background-color: #FF8200 !important;
-        }
-
-        .stSlider label {
-            color: #e0e0e0 !important;
-            font-weight: 600 !important;
-        }
-
-        /* ========== TABS ========== */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 0.5rem;
-            background-color: transparent;
-        }
-
-        .stTabs [data-baseweb="tab"] {
-            background-color: #3a3a3a;
-            border-radius: 8px;
-            color: #b0b0b0 !important;
-            font-weight: 600;
-            padding: 0.75rem 1.5rem;
-            border: 2px solid transparent;
-            transition: all 0.2s ease;
-        }
-
-        .stTabs [data-baseweb="tab"]:hover {
-            background-color: #4a4a4a;
-            color: #FF8200 !important;
-        }
-
-        .stTabs [aria-selected="true"] {
-            background-color: #FF8200 !important;
-            color: white !important;
-            border-color: #FF8200;
-        }
-
-        /* ========== BUTTONS ========== */
-        .stButton > button {
-            background-color: #FF8200;
-            color: white !important;
-            font-weight: 600;
-            border-radius: 8px;
-            border: none;
-            padding: 0.75rem 2rem;
-            transition: all 0.2s ease;
-            box-shadow: 0 4px 6px rgba(255, 130, 0, 0.3);
-        }
-
-        .stButton > button:hover {
-            background-color: #e67700;
-            box-shadow: 0 6px 12px rgba(255, 130, 0, 0.5);
-            transform: translateY(-1px);
-        }
-
-        .stButton > button p {
-            color: white !important;
-        }
-
-        /* ========== CUSTOM COMPONENTS ========== */
-        .hero-banner {
-            background: linear-gradient(135deg, #FF8200 0%, #ff9f40 100%);
-            padding: 2rem;
-            border-radius: 16px;
-            color: white !important;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 10px 30px rgba(255, 130, 0, 0.4);
-        }
-
-        .hero-banner h1, .hero-banner p {
-            color: white !important;
-        }
-
-        .alert-success {
-            background-color: #1e4620;
-            border-left: 4px solid #28a745;
-            padding: 1rem;
-            border-radius: 8px;
-            color: #8fd99c !important;
-            font-weight: 600;
-        }
-
-        .alert-warning {
-            background-color: #4a3b1a;
-            border-left: 4px solid #ffc107;
-            padding: 1rem;
-            border-radius: 8px;
-            color: #ffd666 !important;
-            font-weight: 600;
-        }
-
-        .alert-danger {
-            background-color: #4a1a1a;
-            border-left: 4px solid #dc3545;
-            padding: 1rem;
-            border-radius: 8px;
-            color: #ff8888 !important;
-            font-weight: 600;
-        }
-
-        /* ========== EXPANDER ========== */
-        .streamlit-expanderHeader {
-            background-color: #3a3a3a;
-            border-radius: 8px;
-            border: 1px solid #4a4a4a;
-            font-weight: 600;
-            color: #e0e0e0 !important;
-        }
-
-        details summary {
-            color: #e0e0e0 !important;
-        }
-
-        /* ========== DATAFRAME ========== */
-        .dataframe {
-            border-radius: 8px;
-            overflow: hidden;
-            background-color: #2c2c2c;
-        }
-
-        .dataframe th {
-            background-color: #FF8200 !important;
-            color: white !important;
-        }
-
-        .dataframe td {
-            color: #e0e0e0 !important;
-            background-color: #3a3a3a !important;
-        }
-
-        .dataframe tr:hover td {
-            background-color: #4a4a4a !important;
-        }
-
-        /* ========== CHECKBOX ========== */
-        .stCheckbox label {
-            color: #e0e0e0 !important;
-        }
-
-        /* ========== COLOR PICKER ========== */
-        .stColorPicker label {
-            color: #e0e0e0 !important;
-        }
-
-        /* ========== ANIMATIONS ========== */
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(20px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-
-        .fade-in {
-            animation: fadeIn 0.5s ease-out;
-        }
-
-        /* ========== PLOTLY CHARTS - DARK BACKGROUND ========== */
-        .js-plotly-plot {
-            border-radius: 12px;
-            overflow: hidden;
-            background: linear-gradient(135deg, #2c2c2c 0%, #3a3a3a 100%) !important;
-            box-shadow: 0 4px 12px rgba(255, 130, 0, 0.3);
-            border: 2px solid #FF8200;
-            padding: 1rem;
-        }
-
-        /* ========== RADIO BUTTONS ========== */
-        .stRadio label {
-            color: #e0e0e0 !important;
-        }
-
-        /* ========== SELECT BOX ========== */
-        .stSelectbox label {
-            color: #e0e0e0 !important;
-        }
-
-        /* ========== DIVIDER ========== */
-        hr {
-            border-color: #3a3a3a !important;
-        }
-
-        /* ========== INFO BOXES ========== */
-        .stAlert {
-            background-color: #2c2c2c !important;
-            color: #e0e0e0 !important;
-            border: 1px solid #4a4a4a !important;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    # Only a link and the theme marker travel per rerun; the stylesheet is served from static/
+    version = stylesheet_version(os.path.getmtime(STYLESHEET_PATH))
+    theme_marker = '<span class="cecs-theme-light"></span>' if st.session_state.theme == 'light' else ''
+    st.markdown(f'<link rel="stylesheet" href="app/static/cecs.min.css?v={version}">{theme_marker}',
+                unsafe_allow_html=True)
+
+
+# Importing artifacts pulls in the rest of the stack: model, tables, charts, export and report
+ANALYTICS_MODULES = ('pandas', 'artifacts', 'risk', 'scenarios')
+
+
+@st.cache_resource(show_spinner=False)
+def prewarm_analytics():
+    # Once per server process, while the first login screen is up
+    thread = threading.Thread(target=lambda: [importlib.import_module(name) for name in ANALYTICS_MODULES],
+                              name='cecs-prewarm', daemon=True)
+    thread.start()
+    return thread
+
 
 def login_page():
-    st.markdown("""
-        <style>
-        .main {
-            background: linear-gradient(135deg, #1a1a1a 0%, #2c2c2c 100%);
-        }
-        .login-container {
-            background: #2c2c2c;
-            padding: 3rem;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.5);
-            max-width: 450px;
-            margin: 5rem auto;
-            border: 1px solid #3a3a3a;
-        }
-        .login-logo {
-            text-align: center;
-            font-size: 4rem;
-            margin-bottom: 1rem;
-        }
-        .login-title {
-            color: #FF8200 !important;
-            text-align: center;
-            font-size: 2rem;
-            font-weight: 800;
-            margin-bottom: 0.5rem;
-        }
-        .login-subtitle {
-            color: #b0b0b0 !important;
-            text-align: center;
-            font-size: 1rem;
-            margin-bottom: 2rem;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    load_css()
 
     col1, col2, col3 = st.columns([1, 2, 1])
 
@@ -425,11 +149,12 @@ def login_page():
         with st.form("login_form"):
             username = st.text_input("👤 Username", placeholder="Enter your username")
             password = st.text_input("🔒 Password", type="password", placeholder="Enter your password")
-            submit = st.form_submit_button("🚀 Login", use_container_width=True)
+            submit = st.form_submit_button("🚀 Login", width="stretch")
 
             if submit:
                 if username == "CECS" and password == "UTK":
                     st.session_state.logged_in = True
+                    st.session_state.username = username
                     st.success("✅ Login successful! Redirecting...")
                     st.rerun()
                 else:
@@ -437,1031 +162,1090 @@ def login_page():
 
         st.markdown("---")
         st.markdown("""
-            <p style='text-align: center; color: #b0b0b0; font-size: 0.875rem;'>
+            <p class='cecs-muted' style='text-align: center; font-size: 0.875rem;'>
                 <strong>Demo Credentials:</strong><br>
                 Username: <code>CECS</code> | Password: <code>UTK</code>
             </p>
         """, unsafe_allow_html=True)
 
-def main_dashboard():
-    load_css()
 
-    # HEADER
-    col1, col2, col3 = st.columns([1, 6, 1])
+@st.fragment
+@metrics.fragment("Executive Dashboard")
+def executive_dashboard_tab(params):
+    results = st.session_state.recalculation.results()
+    students = params.students
+    other_revenue = params.other_revenue
+    total_personnel = results['total_personnel']
+    total_cost = results['total_cost']
+    total_revenue = results['total_revenue']
+    net_result = results['net_result']
+    margin = results['margin']
+
+    st.markdown("<h2>📊 Executive Summary</h2>", unsafe_allow_html=True)
+
+    # KEY METRICS
+    st.markdown("<h3>💎 Key Performance Indicators</h3>", unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.markdown("<div style='font-size: 3rem;'>🍊</div>", unsafe_allow_html=True)
+        st.metric(
+            "Total Revenue",
+            f"${total_revenue:,.0f}",
+            delta=f"{(other_revenue / total_revenue * 100):.1f}% other" if other_revenue > 0 else None
+        )
 
     with col2:
-        st.markdown("<h1 style='color: #FFFFFF !important;'>UNIVERSITY OF TENNESSEE</h1>", unsafe_allow_html=True)
-        st.markdown(
-            "<h3 style='color: #FF8200 !important;'>College of Emerging & Collaborative Studies | Financial Analytics Platform</h3>",
-            unsafe_allow_html=True)
+        st.metric(
+            "Total Expenses",
+            f"${total_cost:,.0f}",
+            delta=f"{(total_cost / total_revenue * 100):.1f}% of revenue" if total_revenue > 0 else None
+        )
 
     with col3:
-        if st.button("🚪 Logout", key="logout"):
-            st.session_state.logged_in = False
-            st.rerun()
+        delta_text = "Surplus" if net_result >= 0 else "Deficit"
+        st.metric(
+            "Net Position",
+            f"${net_result:,.0f}",
+            delta=delta_text,
+            delta_color="normal" if net_result >= 0 else "inverse"
+        )
+
+    with col4:
+        st.metric(
+            "Profit Margin",
+            f"{margin:.2f}%",
+            delta="Healthy" if margin > 10 else "Monitor"
+        )
 
     st.markdown("---")
 
-    # SIDEBAR
-    with st.sidebar:
-        st.markdown("## ⚙️ SCENARIO CONFIGURATION")
-        st.markdown("---")
+    # FINANCIAL HEALTH ALERT
+    if net_result >= 0:
+        st.markdown(f"""
+            <div class="alert-success">
+                ✅ <strong>SURPLUS POSITION:</strong> The college is projected to operate with a surplus of ${net_result:,.0f}.
+            </div>
+        """, unsafe_allow_html=True)
+    elif net_result > -100000:
+        st.markdown(f"""
+            <div class="alert-warning">
+                ⚠️ <strong>MINOR DEFICIT:</strong> Projected deficit of ${abs(net_result):,.0f}. Consider optimization.
+            </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+            <div class="alert-danger">
+                🚨 <strong>SIGNIFICANT DEFICIT:</strong> Projected deficit of ${abs(net_result):,.0f}. Immediate action required.
+            </div>
+        """, unsafe_allow_html=True)
 
-        st.markdown("### 📊 Enrollment Data")
-        students = st.number_input(
-            "Total Students Enrolled",
-            min_value=0,
-            max_value=50000,
-            value=6000,
-            step=100,
-            help="Projected student enrollment"
-        )
+    st.markdown("---")
 
-        st.markdown("### 💰 Revenue Parameters")
-        tuition_per_student = st.number_input(
-            "Average Tuition per Student",
-            min_value=0,
-            max_value=100000,
-            value=12000,
-            step=500,
-            help="Annual tuition revenue per student"
-        )
+    # VISUAL BREAKDOWN - DARK BACKGROUNDS
+    col1, col2 = st.columns(2)
 
-        other_revenue = st.number_input(
-            "Other Revenue Sources",
-            min_value=0,
-            value=0,
-            step=10000,
-            help="Grants, donations, auxiliary revenue"
-        )
+    with col1:
+        st.markdown("<h3>💰 Revenue vs Expenses</h3>", unsafe_allow_html=True)
 
-        st.markdown("---")
+        fig_comparison = artifacts.revenue_expense_figure(params, theme=st.session_state.theme)
 
-        with st.expander("🔧 Advanced Settings"):
-            inflation_rate = st.slider("Inflation Rate (%)", 0.0, 10.0, 3.0, 0.1)
-            contingency_fund = st.slider("Contingency Fund (%)", 0, 20, 5, 1)
-            show_detailed_breakdown = st.checkbox("Show Detailed Breakdown", value=True)
+        plotly_chart(fig_comparison, "Revenue vs Expenses")
 
-        st.markdown("---")
+    with col2:
+        st.markdown("<h3>📊 Expense Distribution</h3>", unsafe_allow_html=True)
 
-        st.markdown("### 💾 Scenario Management")
-        scenario_name = st.text_input("Scenario Name", placeholder="e.g., Conservative 2025")
-        if st.button("💾 Save Current Scenario", use_container_width=True):
-            st.session_state.scenarios.append({
-                'name': scenario_name if scenario_name else f"Scenario {len(st.session_state.scenarios) + 1}",
-                'students': students,
-                'date': datetime.now().strftime("%Y-%m-%d %H:%M")
-            })
-            st.success("✅ Scenario saved!")
+        fig_pie = artifacts.expense_figure(params, theme=st.session_state.theme)
 
-        if st.session_state.scenarios:
-            st.markdown("**Saved Scenarios:**")
-            for idx, scenario in enumerate(st.session_state.scenarios):
-                st.markdown(
-                    f"<p style='color: #b0b0b0;'>{idx + 1}. {scenario['name']} ({scenario['students']:,} students)</p>",
-                    unsafe_allow_html=True)
+        plotly_chart(fig_pie, "Expense Distribution")
 
-    # HERO BANNER
-    st.markdown(f"""
-        <div class="hero-banner fade-in">
-            <h1 style="color: white; margin: 0; font-size: 2.5rem;">FINANCIAL SCENARIO ANALYSIS</h1>
-            <p style="font-size: 1.5rem; margin: 0.5rem 0 0 0; font-weight: 600; color: white;">
-                {students:,} Students | Academic Year 2025-2026
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
+    # QUICK STATS
+    st.markdown("---")
+    st.markdown("<h3>📋 Quick Statistics</h3>", unsafe_allow_html=True)
 
-    # TABS
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Executive Dashboard",
-        "👥 Staffing Analysis",
-        "💰 Financial Details",
-        "📈 Advanced Analytics"
-    ])
+    col1, col2, col3, col4 = st.columns(4)
 
-    with tab1:
-        st.markdown("<h2 style='color: #e0e0e0;'>📊 Executive Summary</h2>", unsafe_allow_html=True)
+    with col1:
+        st.metric("Cost per Student", f"${results['cost_per_student']:,.2f}")
 
-        with st.expander("⚙️ Configure Staffing Ratios & Compensation"):
-            st.markdown("### Staffing Ratios")
-            col1, col2, col3 = st.columns(3)
+    with col2:
+        st.metric("Revenue per Student", f"${results['revenue_per_student']:,.2f}")
 
-            with col1:
-                st.markdown("**👨‍🏫 Faculty**")
-                faculty_ratio = st.slider("Students per FT Faculty", 10, 100, 50)
-                adjunct_ratio = st.slider("Students per Adjunct", 20, 200, 100)
+    with col3:
+        student_staff_ratio = students / total_personnel if total_personnel > 0 else 0
+        st.metric("Student:Staff Ratio", f"{student_staff_ratio:.1f}:1")
 
-            with col2:
-                st.markdown("**👔 Staff & Support**")
-                staff_ratio = st.slider("Students per Staff", 50, 500, 200)
-                ambassador_ratio = st.slider("Students per Ambassador", 100, 1000, 300)
+    with col4:
+        st.metric("Total Personnel", f"{total_personnel:,}")
 
-            with col3:
-                st.markdown("**🎓 Academic Support**")
-                grader_ratio = st.slider("Students per Grader", 50, 300, 150)
-                tutor_ratio = st.slider("Students per Tutor", 50, 300, 200)
 
-            st.markdown("---")
-            st.markdown("### Annual Compensation")
+@st.fragment
+@metrics.fragment("Staffing Analysis")
+def staffing_analysis_tab(params):
+    results = st.session_state.recalculation.results()
+    students = params.students
+    full_time_faculty = results['full_time_faculty']
+    adjunct_faculty = results['adjunct_faculty']
+    staff_members = results['staff_members']
+    ambassadors = results['ambassadors']
+    graders = results['graders']
+    tutors = results['tutors']
+    total_personnel = results['total_personnel']
+    total_personnel_cost = results['total_personnel_cost']
 
-            col1, col2, col3 = st.columns(3)
+    st.markdown("<h2>👥 Comprehensive Staffing Analysis</h2>", unsafe_allow_html=True)
 
-            with col1:
-                faculty_salary = st.number_input("FT Faculty Salary", value=75000, step=5000)
-                adjunct_salary = st.number_input("Adjunct Salary", value=40000, step=2000)
+    # STAFFING OVERVIEW
+    col1, col2, col3 = st.columns(3)
 
-            with col2:
-                staff_salary = st.number_input("Staff Salary", value=50000, step=2000)
-                ambassador_pay = st.number_input("Ambassador Pay", value=15000, step=1000)
+    with col1:
+        st.metric("Total Workforce", f"{total_personnel:,}",
+                  delta=f"{(total_personnel / students * 100):.1f}% of students")
+    with col2:
+        st.metric("Faculty Members", f"{full_time_faculty + adjunct_faculty:,}",
+                  delta=f"{full_time_faculty} FT + {adjunct_faculty} Adj")
+    with col3:
+        st.metric("Support Staff", f"{staff_members + ambassadors + graders + tutors:,}",
+                  delta="Non-faculty personnel")
 
-            with col3:
-                grader_pay = st.number_input("Grader Pay", value=10000, step=500)
-                tutor_pay = st.number_input("Tutor Pay", value=12000, step=500)
+    st.markdown("---")
 
-            operating_per_student = st.number_input(
-                "Operating Cost per Student",
-                value=500,
-                step=50
-            )
+    # DETAILED STAFFING BREAKDOWN
+    col1, col2 = st.columns(2)
 
-        # CALCULATIONS
-        full_time_faculty = max(1, int(students / faculty_ratio)) if faculty_ratio > 0 else 0
-        adjunct_faculty = max(1, int(students / adjunct_ratio)) if adjunct_ratio > 0 else 0
-        staff_members = max(1, int(students / staff_ratio)) if staff_ratio > 0 else 0
-        ambassadors = int(students / ambassador_ratio) if ambassador_ratio > 0 else 0
-        graders = int(students / grader_ratio) if grader_ratio > 0 else 0
-        tutors = int(students / tutor_ratio) if tutor_ratio > 0 else 0
-
-        faculty_cost = full_time_faculty * faculty_salary
-        adjunct_cost = adjunct_faculty * adjunct_salary
-        staff_cost = staff_members * staff_salary
-        ambassador_cost = ambassadors * ambassador_pay
-        grader_cost = graders * grader_pay
-        tutor_cost = tutors * tutor_pay
-        operating_cost = students * operating_per_student
-
-        total_personnel = (full_time_faculty + adjunct_faculty + staff_members +
-                           ambassadors + graders + tutors)
-        total_personnel_cost = (faculty_cost + adjunct_cost + staff_cost +
-                                ambassador_cost + grader_cost + tutor_cost)
-        total_cost = total_personnel_cost + operating_cost
-
-        total_revenue = (students * tuition_per_student) + other_revenue
-        net_result = total_revenue - total_cost
-
-        # KEY METRICS
-        st.markdown("<h3 style='color: #e0e0e0;'>💎 Key Performance Indicators</h3>", unsafe_allow_html=True)
+    with col1:
+        st.markdown("<h4>📊 Staffing Requirements by Role</h4>", unsafe_allow_html=True)
 
-        col1, col2, col3, col4 = st.columns(4)
+        staffing_df = artifacts.staffing_table(params)
 
-        with col1:
-            st.metric(
-                "Total Revenue",
-                f"${total_revenue:,.0f}",
-                delta=f"{(other_revenue / total_revenue * 100):.1f}% other" if other_revenue > 0 else None
-            )
+        dataframe(staffing_df, "Staffing Requirements", column_config=number_columns(staffing_df))
 
-        with col2:
-            st.metric(
-                "Total Expenses",
-                f"${total_cost:,.0f}",
-                delta=f"{(total_cost / total_revenue * 100):.1f}% of revenue" if total_revenue > 0 else None
-            )
+    with col2:
+        st.markdown("<h4>💰 Compensation by Role</h4>", unsafe_allow_html=True)
 
-        with col3:
-            delta_text = "Surplus" if net_result >= 0 else "Deficit"
-            st.metric(
-                "Net Position",
-                f"${net_result:,.0f}",
-                delta=delta_text,
-                delta_color="normal" if net_result >= 0 else "inverse"
-            )
+        comp_df = artifacts.compensation_table(params)
 
-        with col4:
-            margin = (net_result / total_revenue * 100) if total_revenue > 0 else 0
-            st.metric(
-                "Profit Margin",
-                f"{margin:.2f}%",
-                delta="Healthy" if margin > 10 else "Monitor"
-            )
+        dataframe(comp_df, "Compensation", column_config=number_columns(comp_df))
 
-        st.markdown("---")
+    st.markdown("---")
 
-        # FINANCIAL HEALTH ALERT
-        if net_result >= 0:
-            st.markdown(f"""
-                <div class="alert-success">
-                    ✅ <strong>SURPLUS POSITION:</strong> The college is projected to operate with a surplus of ${net_result:,.0f}.
-                </div>
-            """, unsafe_allow_html=True)
-        elif net_result > -100000:
-            st.markdown(f"""
-                <div class="alert-warning">
-                    ⚠️ <strong>MINOR DEFICIT:</strong> Projected deficit of ${abs(net_result):,.0f}. Consider optimization.
-                </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-                <div class="alert-danger">
-                    🚨 <strong>SIGNIFICANT DEFICIT:</strong> Projected deficit of ${abs(net_result):,.0f}. Immediate action required.
-                </div>
-            """, unsafe_allow_html=True)
+    # STAFFING VISUALIZATIONS - DARK BACKGROUNDS
+    col1, col2 = st.columns(2)
 
-        st.markdown("---")
+    with col1:
+        st.markdown("<h4>📊 Headcount Distribution</h4>", unsafe_allow_html=True)
 
-        # VISUAL BREAKDOWN - DARK BACKGROUNDS
-        col1, col2 = st.columns(2)
+        fig_staffing = artifacts.headcount_figure(params, theme=st.session_state.theme)
 
-        with col1:
-            st.markdown("<h3 style='color: #e0e0e0;'>💰 Revenue vs Expenses</h3>", unsafe_allow_html=True)
-
-            fig_comparison = go.Figure()
-            fig_comparison.add_trace(go.Bar(
-                name='Revenue',
-                x=['Financial Overview'],
-                y=[total_revenue],
-                marker_color='#28a745',
-                text=[f'${total_revenue:,.0f}'],
-                textposition='outside',
-                textfont=dict(color='#e0e0e0', size=14, family='Inter')
-            ))
-            fig_comparison.add_trace(go.Bar(
-                name='Expenses',
-                x=['Financial Overview'],
-                y=[total_cost],
-                marker_color='#dc3545',
-                text=[f'${total_cost:,.0f}'],
-                textposition='outside',
-                textfont=dict(color='#e0e0e0', size=14, family='Inter')
-            ))
-
-            fig_comparison.update_layout(
-                barmode='group',
-                height=400,
-                showlegend=True,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(44, 44, 44, 1)',
-                font=dict(size=12, color='#e0e0e0', family='Inter'),
-                margin=dict(t=20, b=20, l=20, r=20),
-                legend=dict(font=dict(color='#e0e0e0'))
-            )
+        plotly_chart(fig_staffing, "Headcount Distribution")
 
-            st.plotly_chart(fig_comparison, use_container_width=True)
+    with col2:
+        st.markdown("<h4>💵 Cost Distribution</h4>", unsafe_allow_html=True)
 
-        with col2:
-            st.markdown("<h3 style='color: #e0e0e0;'>📊 Expense Distribution</h3>", unsafe_allow_html=True)
-
-            expense_data = pd.DataFrame({
-                'Category': ['Faculty (FT)', 'Faculty (Adj)', 'Staff', 'Ambassadors',
-                             'Graders', 'Tutors', 'Operations'],
-                'Amount': [faculty_cost, adjunct_cost, staff_cost, ambassador_cost,
-                           grader_cost, tutor_cost, operating_cost]
-            })
-
-            fig_pie = px.pie(
-                expense_data,
-                values='Amount',
-                names='Category',
-                color_discrete_sequence=px.colors.sequential.Oranges_r,
-                hole=0.4
-            )
+        fig_cost = artifacts.cost_figure(params, theme=st.session_state.theme)
 
-            fig_pie.update_traces(
-                textposition='inside',
-                textinfo='percent+label',
-                textfont_size=11,
-                textfont_color='white'
-            )
+        plotly_chart(fig_cost, "Cost Distribution")
 
-            fig_pie.update_layout(
-                height=400,
-                showlegend=False,
-                paper_bgcolor='rgba(44, 44, 44, 1)',
-                margin=dict(t=20, b=20, l=20, r=20),
-                font=dict(family='Inter', color='#e0e0e0')
-            )
+    st.markdown("---")
 
-            st.plotly_chart(fig_pie, use_container_width=True)
+    # WORKFORCE COMPOSITION
+    st.markdown("<h4>🎯 Workforce Composition Analysis</h4>", unsafe_allow_html=True)
 
-        # QUICK STATS
-        st.markdown("---")
-        st.markdown("<h3 style='color: #e0e0e0;'>📋 Quick Statistics</h3>", unsafe_allow_html=True)
+    col1, col2, col3, col4 = st.columns(4)
 
-        col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        faculty_pct = ((full_time_faculty + adjunct_faculty) / total_personnel * 100) if total_personnel > 0 else 0
+        st.metric("Faculty Composition", f"{faculty_pct:.1f}%",
+                  delta=f"{full_time_faculty + adjunct_faculty} total")
 
-        with col1:
-            cost_per_student = total_cost / students if students > 0 else 0
-            st.metric("Cost per Student", f"${cost_per_student:,.2f}")
+    with col2:
+        ft_ratio = (full_time_faculty / (full_time_faculty + adjunct_faculty) * 100) if (
+                                                                                                    full_time_faculty + adjunct_faculty) > 0 else 0
+        st.metric("Full-Time Ratio", f"{ft_ratio:.1f}%", delta="Of all faculty")
 
-        with col2:
-            revenue_per_student = total_revenue / students if students > 0 else 0
-            st.metric("Revenue per Student", f"${revenue_per_student:,.2f}")
+    with col3:
+        support_pct = ((
+                                   staff_members + ambassadors + graders + tutors) / total_personnel * 100) if total_personnel > 0 else 0
+        st.metric("Support Staff %", f"{support_pct:.1f}%",
+                  delta=f"{staff_members + ambassadors + graders + tutors} total")
 
-        with col3:
-            student_staff_ratio = students / total_personnel if total_personnel > 0 else 0
-            st.metric("Student:Staff Ratio", f"{student_staff_ratio:.1f}:1")
+    with col4:
+        avg_compensation = total_personnel_cost / total_personnel if total_personnel > 0 else 0
+        st.metric("Avg Compensation", f"${avg_compensation:,.0f}", delta="Per person")
 
-        with col4:
-            st.metric("Total Personnel", f"{total_personnel:,}")
+    st.markdown("---")
 
-    with tab2:
-        st.markdown("<h2 style='color: #e0e0e0;'>👥 Comprehensive Staffing Analysis</h2>", unsafe_allow_html=True)
+    # STAFFING OPTIMIZER
+    st.markdown("<h4>🧮 Staffing Optimizer</h4>", unsafe_allow_html=True)
+    st.caption("Finds the staffing ratios with the highest net position within the slider ranges, "
+               "subject to the constraints below.")
 
-        # STAFFING OVERVIEW
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        min_margin = kept(st.number_input, "Minimum Margin (%)", -100.0, 100.0, value=0.0, step=0.5,
+                          key='optimizer_min_margin')
+    with col2:
+        max_students_per_faculty = kept(st.number_input, "Max Students per Faculty Member", 1, 1000,
+                                        value=model.OPTIMIZER_MAX_STUDENTS_PER_FACULTY,
+                                        key='optimizer_max_students_per_faculty')
+    with col3:
+        budget = kept(st.number_input, "Expense Budget ($, 0 = no limit)", 0, None, value=0, step=1_000_000,
+                      key='optimizer_budget')
+
+    best, options = artifacts.staffing_optimum(params, min_margin, max_students_per_faculty, budget or None)
+    if best is None:
+        st.warning("No staffing mix meets these constraints. Relax the margin, faculty or budget limit.")
+    else:
+        optimum = artifacts.results(best)
         col1, col2, col3 = st.columns(3)
-
         with col1:
-            st.metric("Total Workforce", f"{total_personnel:,}",
-                      delta=f"{(total_personnel / students * 100):.1f}% of students")
+            st.metric("Optimal Net Position", MONEY_FORMAT.format(optimum['net_result']),
+                      delta=MONEY_FORMAT.format(optimum['net_result'] - results['net_result']))
         with col2:
-            st.metric("Faculty Members", f"{full_time_faculty + adjunct_faculty:,}",
-                      delta=f"{full_time_faculty} FT + {adjunct_faculty} Adj")
+            st.metric("Optimal Margin", f"{optimum['margin']:.2f}%",
+                      delta=f"{optimum['margin'] - results['margin']:.2f} pts")
         with col3:
-            st.metric("Support Staff", f"{staff_members + ambassadors + graders + tutors:,}",
-                      delta="Non-faculty personnel")
+            st.metric("Optimal Workforce", f"{optimum['total_personnel']:,}",
+                      delta=f"{optimum['total_personnel'] - total_personnel:,}", delta_color="off")
+
+        plan_df = tables.staffing_plan(params, results, best, optimum)
+        dataframe(plan_df, "Staffing Plan", column_config=number_columns(plan_df))
+
+    with st.expander(f"All {len(options):,} faculty mixes considered"):
+        dataframe(options, "Faculty Mixes", column_config=number_columns(options))
+
+
+@st.fragment
+@metrics.fragment("Financial Details")
+def financial_details_tab(params, show_detailed_breakdown):
+    results = st.session_state.recalculation.results()
+    students = params.students
+    tuition_per_student = params.tuition_per_student
+    other_revenue = params.other_revenue
+    operating_per_student = params.operating_per_student
+    contingency_fund = params.contingency_fund
+    full_time_faculty = results['full_time_faculty']
+    adjunct_faculty = results['adjunct_faculty']
+    staff_members = results['staff_members']
+    ambassadors = results['ambassadors']
+    graders = results['graders']
+    tutors = results['tutors']
+    faculty_cost = results['faculty_cost']
+    adjunct_cost = results['adjunct_cost']
+    staff_cost = results['staff_cost']
+    ambassador_cost = results['ambassador_cost']
+    grader_cost = results['grader_cost']
+    tutor_cost = results['tutor_cost']
+    operating_cost = results['operating_cost']
+    total_personnel_cost = results['total_personnel_cost']
+    total_cost = results['total_cost']
+    total_revenue = results['total_revenue']
+    margin = results['margin']
+
+    st.markdown("<h2>💰 Detailed Financial Analysis</h2>", unsafe_allow_html=True)
+
+    # REVENUE BREAKDOWN
+    st.markdown("<h4>📈 Revenue Sources</h4>", unsafe_allow_html=True)
+    col1, col2, col3, col4 = st.columns(4)
 
-        st.markdown("---")
+    with col1:
+        st.metric("Tuition Revenue", f"${students * tuition_per_student:,.0f}",
+                  delta=f"{students:,} students")
+    with col2:
+        st.metric("Other Revenue", f"${other_revenue:,.0f}",
+                  delta=f"{(other_revenue / total_revenue * 100):.1f}% of total" if total_revenue > 0 else "0%")
+    with col3:
+        st.metric("Total Revenue", f"${total_revenue:,.0f}")
+    with col4:
+        st.metric("Revenue/Student", f"${results['revenue_per_student']:,.0f}")
 
-        # DETAILED STAFFING BREAKDOWN
-        col1, col2 = st.columns(2)
+    st.markdown("---")
 
-        with col1:
-            st.markdown("<h4 style='color: #FF8200;'>📊 Staffing Requirements by Role</h4>", unsafe_allow_html=True)
-
-            staffing_df = pd.DataFrame({
-                'Position': ['Full-Time Faculty', 'Adjunct Faculty', 'Staff Members',
-                             'Student Ambassadors', 'Graders', 'Tutors'],
-                'Count': [full_time_faculty, adjunct_faculty, staff_members,
-                          ambassadors, graders, tutors],
-                'Ratio': [f'1:{faculty_ratio}', f'1:{adjunct_ratio}', f'1:{staff_ratio}',
-                          f'1:{ambassador_ratio}', f'1:{grader_ratio}', f'1:{tutor_ratio}'],
-                '% of Total': [
-                    f'{(full_time_faculty / total_personnel * 100):.1f}%' if total_personnel > 0 else '0%',
-                    f'{(adjunct_faculty / total_personnel * 100):.1f}%' if total_personnel > 0 else '0%',
-                    f'{(staff_members / total_personnel * 100):.1f}%' if total_personnel > 0 else '0%',
-                    f'{(ambassadors / total_personnel * 100):.1f}%' if total_personnel > 0 else '0%',
-                    f'{(graders / total_personnel * 100):.1f}%' if total_personnel > 0 else '0%',
-                    f'{(tutors / total_personnel * 100):.1f}%' if total_personnel > 0 else '0%'
-                ]
-            })
-
-            st.dataframe(staffing_df, use_container_width=True, hide_index=True)
+    # EXPENSE BREAKDOWN
+    st.markdown("<h4>💸 Expense Categories</h4>", unsafe_allow_html=True)
 
-        with col2:
-            st.markdown("<h4 style='color: #FF8200;'>💰 Compensation by Role</h4>", unsafe_allow_html=True)
-
-            comp_df = pd.DataFrame({
-                'Position': ['Full-Time Faculty', 'Adjunct Faculty', 'Staff Members',
-                             'Student Ambassadors', 'Graders', 'Tutors'],
-                'Total Annual Cost': [
-                    f'${faculty_cost:,.0f}',
-                    f'${adjunct_cost:,.0f}',
-                    f'${staff_cost:,.0f}',
-                    f'${ambassador_cost:,.0f}',
-                    f'${grader_cost:,.0f}',
-                    f'${tutor_cost:,.0f}'
-                ],
-                'Avg Salary': [
-                    f'${faculty_salary:,.0f}',
-                    f'${adjunct_salary:,.0f}',
-                    f'${staff_salary:,.0f}',
-                    f'${ambassador_pay:,.0f}',
-                    f'${grader_pay:,.0f}',
-                    f'${tutor_pay:,.0f}'
-                ],
-                '% of Personnel Budget': [
-                    f'{(faculty_cost / total_personnel_cost * 100):.1f}%' if total_personnel_cost > 0 else '0%',
-                    f'{(adjunct_cost / total_personnel_cost * 100):.1f}%' if total_personnel_cost > 0 else '0%',
-                    f'{(staff_cost / total_personnel_cost * 100):.1f}%' if total_personnel_cost > 0 else '0%',
-                    f'{(ambassador_cost / total_personnel_cost * 100):.1f}%' if total_personnel_cost > 0 else '0%',
-                    f'{(grader_cost / total_personnel_cost * 100):.1f}%' if total_personnel_cost > 0 else '0%',
-                    f'{(tutor_cost / total_personnel_cost * 100):.1f}%' if total_personnel_cost > 0 else '0%'
-                ]
-            })
-
-            st.dataframe(comp_df, use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
 
-        st.markdown("---")
+    with col1:
+        st.markdown("**Personnel Costs**")
+        st.metric("Full-Time Faculty", f"${faculty_cost:,.0f}",
+                  delta=f"{full_time_faculty} positions")
+        st.metric("Adjunct Faculty", f"${adjunct_cost:,.0f}",
+                  delta=f"{adjunct_faculty} positions")
+        st.metric("Staff Members", f"${staff_cost:,.0f}",
+                  delta=f"{staff_members} positions")
+        st.metric("Student Workers", f"${ambassador_cost + grader_cost + tutor_cost:,.0f}",
+                  delta=f"{ambassadors + graders + tutors} positions")
 
-        # STAFFING VISUALIZATIONS - DARK BACKGROUNDS
-        col1, col2 = st.columns(2)
+    with col2:
+        st.markdown("**Operational Analysis**")
+        st.metric("Operating Supplies", f"${operating_cost:,.0f}",
+                  delta=f"${operating_per_student:,} per student")
+        st.metric("Total Personnel Cost", f"${total_personnel_cost:,.0f}",
+                  delta=f"{(total_personnel_cost / total_cost * 100):.1f}% of budget")
+        st.metric("Total Expenses", f"${total_cost:,.0f}")
 
-        with col1:
-            st.markdown("<h4 style='color: #FF8200;'>📊 Headcount Distribution</h4>", unsafe_allow_html=True)
-
-            fig_staffing = px.bar(
-                staffing_df,
-                x='Position',
-                y='Count',
-                color='Count',
-                color_continuous_scale='Oranges',
-                text='Count'
-            )
+        contingency_amount = results['contingency_amount']
+        st.metric("Contingency Reserve", f"${contingency_amount:,.0f}",
+                  delta=f"{contingency_fund}% of expenses")
 
-            fig_staffing.update_traces(
-                textposition='outside',
-                textfont=dict(color='#e0e0e0', size=12)
-            )
-            fig_staffing.update_layout(
-                height=400,
-                showlegend=False,
-                xaxis_title='',
-                yaxis_title='Number of Personnel',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(44, 44, 44, 1)',
-                font=dict(family='Inter', color='#e0e0e0')
-            )
+    st.markdown("---")
 
-            st.plotly_chart(fig_staffing, use_container_width=True)
+    # FINANCIAL RATIOS
+    st.markdown("<h4>📊 Key Financial Ratios</h4>", unsafe_allow_html=True)
 
-        with col2:
-            st.markdown("<h4 style='color: #FF8200;'>💵 Cost Distribution</h4>", unsafe_allow_html=True)
-
-            cost_df = pd.DataFrame({
-                'Position': ['Full-Time Faculty', 'Adjunct Faculty', 'Staff Members',
-                             'Student Ambassadors', 'Graders', 'Tutors'],
-                'Total Cost': [faculty_cost, adjunct_cost, staff_cost,
-                               ambassador_cost, grader_cost, tutor_cost]
-            })
-
-            fig_cost = px.bar(
-                cost_df,
-                x='Position',
-                y='Total Cost',
-                color='Total Cost',
-                color_continuous_scale='Reds',
-                text='Total Cost'
-            )
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-            fig_cost.update_traces(
-                texttemplate='$%{text:,.0f}',
-                textposition='outside',
-                textfont=dict(color='#e0e0e0', size=12)
-            )
+    with col1:
+        st.metric("Expense Ratio", f"{results['expense_ratio']:.1f}%", delta="Of revenue")
 
-            fig_cost.update_layout(
-                height=400,
-                showlegend=False,
-                xaxis_title='',
-                yaxis_title='Total Annual Cost',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(44, 44, 44, 1)',
-                font=dict(family='Inter', color='#e0e0e0')
-            )
+    with col2:
+        personnel_ratio = results['personnel_ratio']
+        st.metric("Personnel %", f"{personnel_ratio:.1f}%", delta="Of expenses")
 
-            st.plotly_chart(fig_cost, use_container_width=True)
+    with col3:
+        st.metric("Operating %", f"{results['operating_ratio']:.1f}%", delta="Of expenses")
 
-        st.markdown("---")
+    with col4:
+        st.metric("Cost/Student", f"${results['cost_per_student']:,.0f}")
 
-        # WORKFORCE COMPOSITION
-        st.markdown("<h4 style='color: #FF8200;'>🎯 Workforce Composition Analysis</h4>", unsafe_allow_html=True)
+    with col5:
+        st.metric("Margin", f"{margin:.2f}%")
 
-        col1, col2, col3, col4 = st.columns(4)
+    st.markdown("---")
 
-        with col1:
-            faculty_pct = ((full_time_faculty + adjunct_faculty) / total_personnel * 100) if total_personnel > 0 else 0
-            st.metric("Faculty Composition", f"{faculty_pct:.1f}%",
-                      delta=f"{full_time_faculty + adjunct_faculty} total")
+    # DETAILED FINANCIAL STATEMENT
+    if show_detailed_breakdown:
+        st.markdown("<h4>📋 Complete Financial Statement</h4>", unsafe_allow_html=True)
 
-        with col2:
-            ft_ratio = (full_time_faculty / (full_time_faculty + adjunct_faculty) * 100) if (
-                                                                                                        full_time_faculty + adjunct_faculty) > 0 else 0
-            st.metric("Full-Time Ratio", f"{ft_ratio:.1f}%", delta="Of all faculty")
+        fin_df = artifacts.financial_statement(params)
+        # Section headers have no amount; Styler leaves those cells blank
+        dataframe(fin_df.style.format(MONEY_FORMAT, subset=['Amount'], na_rep=''), "Financial Statement",
+                  height=800)
 
-        with col3:
-            support_pct = ((
-                                       staff_members + ambassadors + graders + tutors) / total_personnel * 100) if total_personnel > 0 else 0
-            st.metric("Support Staff %", f"{support_pct:.1f}%",
-                      delta=f"{staff_members + ambassadors + graders + tutors} total")
 
-        with col4:
-            avg_compensation = total_personnel_cost / total_personnel if total_personnel > 0 else 0
-            st.metric("Avg Compensation", f"${avg_compensation:,.0f}", delta="Per person")
+@st.fragment
+@metrics.fragment("Advanced Analytics")
+def advanced_analytics_tab(params):
+    results = st.session_state.recalculation.results()
+    students = params.students
+    tuition_per_student = params.tuition_per_student
+    margin = results['margin']
+    personnel_ratio = results['personnel_ratio']
 
-    with tab3:
-        st.markdown("<h2 style='color: #e0e0e0;'>💰 Detailed Financial Analysis</h2>", unsafe_allow_html=True)
+    st.markdown("<h2>📈 Advanced Analytics & Projections</h2>", unsafe_allow_html=True)
 
-        # REVENUE BREAKDOWN
-        st.markdown("<h4 style='color: #FF8200;'>📈 Revenue Sources</h4>", unsafe_allow_html=True)
-        col1, col2, col3, col4 = st.columns(4)
+    # ENROLLMENT SCENARIOS
+    st.markdown("<h4>🔄 Enrollment Impact Analysis</h4>", unsafe_allow_html=True)
+
+    fig_scenarios = artifacts.scenario_figure(params, theme=st.session_state.theme)
+
+    plotly_chart(fig_scenarios, "Enrollment Scenarios")
+
+    # SCENARIO COMPARISON TABLE
+    st.markdown("<h4>📊 Scenario Comparison Matrix</h4>", unsafe_allow_html=True)
+
+    scenario_df = st.session_state.recalculation['enrollment_scenarios']
+
+    dataframe(scenario_df, "Enrollment Scenarios", column_config=number_columns(scenario_df))
+
+    # ENROLLMENT SWEEP
+    st.markdown("<h4>📉 Enrollment Sweep</h4>", unsafe_allow_html=True)
+
+    sweep_low, sweep_high = kept(
+        st.slider,
+        "Enrollment Range",
+        min_value=0,
+        max_value=model.SWEEP_MAX_STUDENTS,
+        value=(int(students * 0.5), min(int(students * 1.5), model.SWEEP_MAX_STUDENTS)),
+        step=1,
+        help="Every whole enrollment in the range is evaluated; the chart is downsampled for display",
+        key='sweep_range'
+    )
+
+    fig_sweep = artifacts.sweep_figure(params, sweep_low, sweep_high, theme=st.session_state.theme)
+
+    plotly_chart(fig_sweep, "Enrollment Sweep")
+    st.caption(f"{sweep_high - sweep_low + 1:,} enrollments evaluated")
+
+    st.markdown("---")
+
+    # BREAK-EVEN ANALYSIS
+    st.markdown("<h4>⚖️ Break-Even Analysis</h4>", unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    contribution_per_student = results['contribution_per_student']
+    breakeven_buffer = results['breakeven_buffer']
+    # NaN when tuition cannot cover the staffing each extra student brings with it
+    breakeven_reachable = pd.notna(results['breakeven_students'])
+    target_reachable = pd.notna(results['target_students'])
+
+    with col1:
+        if breakeven_reachable:
+            breakeven_students = int(results['breakeven_students'])
+            st.metric("Break-Even Enrollment", f"{breakeven_students:,} students")
+            st.metric("Current vs Break-Even",
+                      f"{breakeven_buffer:.1f}%" if breakeven_students > 0 else "N/A",
+                      delta="Above BE" if students > breakeven_students else "Below BE")
+        elif contribution_per_student > 0:
+            st.warning("⚠️ Break-even not reachable: staffing cost per student exceeds contribution")
+        else:
+            st.warning("⚠️ Negative contribution margin")
+
+    with col2:
+        if breakeven_reachable:
+            margin_of_safety = students - breakeven_students
+            margin_of_safety_pct = (margin_of_safety / students * 100) if students > 0 else 0
+
+            st.metric("Margin of Safety", f"{margin_of_safety:,} students")
+            st.metric("Safety %", f"{margin_of_safety_pct:.1f}%")
+        st.metric("Contribution Margin", f"${contribution_per_student:,.0f}",
+                  delta="Per student")
+
+    with col3:
+        if target_reachable:
+            target_students = int(results['target_students'])
+            st.metric("For $1M Surplus", f"{target_students:,} students",
+                      delta=f"{target_students - students:,} more needed")
+
+            revenue_needed = target_students * tuition_per_student
+            st.metric("Revenue Needed", f"${revenue_needed:,.0f}")
+        elif breakeven_reachable:
+            st.info("💡 A $1M surplus is out of reach at current pricing and staffing")
+
+    st.markdown("**Goal Seek**")
+
+    col1, col2, col3 = st.columns(3)
 
+    with col1:
+        goal_field = kept(st.selectbox, "Solve For", model.GOAL_FIELDS,
+                          index=model.GOAL_FIELDS.index('tuition_per_student'),
+                          format_func=model.INPUT_LABELS.get, key='goal_field')
+
+    with col2:
+        goal_metric = kept(st.selectbox, "Target Result", list(model.GOAL_METRICS),
+                           format_func=model.GOAL_METRICS.get, key='goal_metric')
+
+    with col3:
+        if goal_metric == 'margin':
+            goal_target = kept(st.number_input, "Target Margin (%)", -100.0, 99.0, value=10.0, step=0.5,
+                               key='goal_margin')
+        else:
+            goal_target = kept(st.number_input, "Target Net Position ($)", value=float(model.TARGET_PROFIT),
+                               step=100000.0, format="%.0f", key='goal_net_position')
+
+    goal_value = artifacts.goal_seek(params, goal_field, goal_target, goal_metric)
+    goal_label = model.INPUT_LABELS[goal_field]
+    current_value = getattr(params, goal_field)
+
+    if math.isnan(goal_value):
+        st.warning(f"⚠️ No value of {goal_label} reaches this target with the other inputs held")
+    else:
+        if goal_field in model.RATIO_FIELDS:
+            goal_value = int(goal_value)
+            shown, change = f"1:{goal_value}", f"{goal_value - current_value:+,}"
+        elif goal_field == 'students':
+            goal_value = int(goal_value)
+            shown, change = f"{goal_value:,} students", f"{goal_value - current_value:+,}"
+        else:
+            shown = MONEY_FORMAT.format(goal_value)
+            change = ('+' if goal_value >= current_value else '-') + MONEY_FORMAT.format(abs(goal_value - current_value))
+        achieved = artifacts.results(params._replace(**{goal_field: goal_value}))
+
+        col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Tuition Revenue", f"${students * tuition_per_student:,.0f}",
-                      delta=f"{students:,} students")
+            st.metric(f"Required {goal_label}", shown, delta=f"{change} vs current", delta_color="off")
         with col2:
-            st.metric("Other Revenue", f"${other_revenue:,.0f}",
-                      delta=f"{(other_revenue / total_revenue * 100):.1f}% of total" if total_revenue > 0 else "0%")
+            st.metric("Net Position There", MONEY_FORMAT.format(achieved['net_result']))
         with col3:
-            st.metric("Total Revenue", f"${total_revenue:,.0f}")
-        with col4:
-            rev_per_student = total_revenue / students if students > 0 else 0
-            st.metric("Revenue/Student", f"${rev_per_student:,.0f}")
+            st.metric("Margin There", f"{achieved['margin']:.2f}%")
+        if goal_field in model.INTEGER_FIELDS:
+            st.caption("Staffing moves in whole positions, so the result lands at or just above the target: "
+                       "the smallest enrollment from which it holds, or the smallest ratio (most staff) that "
+                       "still meets it.")
 
-        st.markdown("---")
+    st.markdown("---")
 
-        # EXPENSE BREAKDOWN
-        st.markdown("<h4 style='color: #FF8200;'>💸 Expense Categories</h4>", unsafe_allow_html=True)
+    # SENSITIVITY ANALYSIS
+    st.markdown("<h4>🎯 Sensitivity Analysis</h4>", unsafe_allow_html=True)
 
-        col1, col2 = st.columns(2)
+    col1, col2 = st.columns(2)
 
-        with col1:
-            st.markdown("**Personnel Costs**")
-            st.metric("Full-Time Faculty", f"${faculty_cost:,.0f}",
-                      delta=f"{full_time_faculty} positions")
-            st.metric("Adjunct Faculty", f"${adjunct_cost:,.0f}",
-                      delta=f"{adjunct_faculty} positions")
-            st.metric("Staff Members", f"${staff_cost:,.0f}",
-                      delta=f"{staff_members} positions")
-            st.metric("Student Workers", f"${ambassador_cost + grader_cost + tutor_cost:,.0f}",
-                      delta=f"{ambassadors + graders + tutors} positions")
+    with col1:
+        st.markdown("**Tuition Impact**")
+        fig_tuition = artifacts.tuition_figure(params, theme=st.session_state.theme)
 
-        with col2:
-            st.markdown("**Operational Analysis**")
-            st.metric("Operating Supplies", f"${operating_cost:,.0f}",
-                      delta=f"${operating_per_student:,} per student")
-            st.metric("Total Personnel Cost", f"${total_personnel_cost:,.0f}",
-                      delta=f"{(total_personnel_cost / total_cost * 100):.1f}% of budget")
-            st.metric("Total Expenses", f"${total_cost:,.0f}")
+        plotly_chart(fig_tuition, "Tuition Impact")
 
-            contingency_amount = total_cost * (contingency_fund / 100)
-            st.metric("Contingency Reserve", f"${contingency_amount:,.0f}",
-                      delta=f"{contingency_fund}% of expenses")
+    with col2:
+        st.markdown("**Cost Reduction Impact**")
+        fig_cost_reduction = artifacts.cost_reduction_figure(params, theme=st.session_state.theme)
 
-        st.markdown("---")
+        plotly_chart(fig_cost_reduction, "Cost Reduction Impact")
+
+    st.markdown("**What Matters Most**")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        tornado_change = kept(st.slider, "Change Each Input by (±%)", 1, 50, value=int(model.TORNADO_CHANGE * 100),
+                              step=1, key='tornado_change')
+
+    with col2:
+        tornado_year = kept(st.selectbox, "Net Position In", list(range(1, model.PROJECTION_YEARS + 1)),
+                            format_func=lambda y: "Year 1 (current budget)" if y == 1 else f"Year {y}",
+                            help="Inflation only affects costs and tuition from Year 2 onward", key='tornado_year')
+
+    fig_tornado = artifacts.tornado_figure(params, tornado_change / 100, tornado_year,
+                                           theme=st.session_state.theme)
+
+    plotly_chart(fig_tornado, "Tornado")
+
+    st.markdown("**Two-Way Sensitivity**")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        grid_x = kept(st.selectbox, "Horizontal Axis", model.GRID_FIELDS,
+                      index=model.GRID_FIELDS.index('tuition_per_student'),
+                      format_func=model.INPUT_LABELS.get, key='grid_x')
+        grid_y = kept(st.selectbox, "Vertical Axis", model.GRID_FIELDS,
+                      index=model.GRID_FIELDS.index('students'),
+                      format_func=model.INPUT_LABELS.get, key='grid_y')
+
+    with col2:
+        grid_metric = kept(st.selectbox, "Result", list(model.GRID_METRICS), format_func=model.GRID_METRICS.get,
+                           key='grid_metric')
+        grid_spread = kept(st.slider, "Range Around Current (±%)", 10, 90, value=30, step=5, key='grid_spread')
+
+    with col3:
+        grid_points = kept(st.select_slider, "Grid Resolution", options=[25, 50, 100, 200, 500], value=100,
+                           help="Points per axis; whole-number inputs may have fewer", key='grid_points')
 
-        # FINANCIAL RATIOS
-        st.markdown("<h4 style='color: #FF8200;'>📊 Key Financial Ratios</h4>", unsafe_allow_html=True)
+    if grid_x == grid_y:
+        st.warning("⚠️ Choose two different inputs for the axes")
+    else:
+        fig_grid = artifacts.sensitivity_figure(params, grid_x, grid_y, grid_spread / 100, grid_points,
+                                                grid_metric, theme=st.session_state.theme)
+
+        plotly_chart(fig_grid, "Two-Way Sensitivity")
+
+    st.markdown("---")
+
+    # MULTI-YEAR PROJECTIONS
+    st.markdown("<h4>📅 Multi-Year Financial Projections</h4>", unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        projection_years = kept(st.slider, "Projection Horizon (Years)", 1, model.PROJECTION_MAX_YEARS,
+                                value=model.PROJECTION_YEARS, key='projection_years')
+        enrollment_model = kept(st.radio, "Enrollment Model", model.ENROLLMENT_MODELS, format_func=str.title,
+                                horizontal=True, key='enrollment_model',
+                                help="Cohort grows the entering class and ages it through a four-year "
+                                     "program with attrition; compound grows total enrollment directly")
+
+    with col2:
+        growth_text = kept(st.text_input, "Annual Growth (%)", value=f"{model.PROJECTION_GROWTH_RATE * 100:g}",
+                           key='projection_growth',
+                           help="One rate, or comma-separated rates for Year 2, Year 3, ...; "
+                                "the last rate continues to the end of the horizon")
+        try:
+            growth = growth_schedule(growth_text)
+        except ValueError:
+            st.error("❌ Enter growth as percentages above -100 separated by commas, e.g. 5, 4, 3")
+            growth = model.PROJECTION_GROWTH_RATE
+
+    with col3:
+        escalations = (None, None, None)
+        if kept(st.checkbox, "Separate Escalation Rates", key='separate_escalation',
+                help="Otherwise tuition, salaries and operating costs all rise with the inflation rate"):
+            escalations = tuple(
+                kept(st.slider, f"{label} Escalation (%)", 0.0, 10.0, value=float(params.inflation_rate), step=0.1,
+                     key=f'{label.lower().replace(" ", "_")}_escalation')
+                for label in ("Tuition", "Salary", "Operating Cost"))
 
-        col1, col2, col3, col4, col5 = st.columns(5)
+    assumptions = model.Projection(projection_years, growth, enrollment_model, *escalations)
+
+    fig_projection = artifacts.projection_figure(params, assumptions, theme=st.session_state.theme)
+
+    plotly_chart(fig_projection, "Projection")
+
+    # PROJECTION TABLE
+    st.session_state.recalculation.set(model.PROJECTION_INPUT, assumptions)
+    projection_df = st.session_state.recalculation['projection']
+
+    dataframe(projection_df, "Projection", column_config=number_columns(projection_df))
+
+    st.markdown("---")
+
+    # RISK ANALYSIS
+    st.markdown("<h4>⚠️ Risk Assessment Dashboard</h4>", unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        enrollment_risk = model.risk_label(results['enrollment_risk'])
+        st.markdown(f"<h4 class='cecs-risk-{enrollment_risk.lower()}'>Enrollment Risk: {enrollment_risk}</h4>",
+                    unsafe_allow_html=True)
+        st.metric("Buffer", f"{breakeven_buffer:.1f}%" if pd.notna(breakeven_buffer) else "N/A")
+
+    with col2:
+        margin_risk = model.risk_label(results['margin_risk'])
+        st.markdown(f"<h4 class='cecs-risk-{margin_risk.lower()}'>Margin Risk: {margin_risk}</h4>",
+                    unsafe_allow_html=True)
+        st.metric("Current Margin", f"{margin:.2f}%")
+
+    with col3:
+        dependency_risk = model.risk_label(results['dependency_risk'])
+        st.markdown(f"<h4 class='cecs-risk-{dependency_risk.lower()}'>Revenue Dependency: {dependency_risk}</h4>",
+                    unsafe_allow_html=True)
+        st.metric("Tuition %", f"{results['tuition_share'] * 100:.1f}%")
+
+    with col4:
+        personnel_risk = model.risk_label(results['personnel_risk'])
+        st.markdown(f"<h4 class='cecs-risk-{personnel_risk.lower()}'>Personnel Cost Risk: {personnel_risk}</h4>",
+                    unsafe_allow_html=True)
+        st.metric("Personnel %", f"{personnel_ratio:.1f}%")
+
+    # MONTE CARLO SIMULATION
+    if kept(st.toggle, "🎲 Monte Carlo Mode", key="monte_carlo_mode",
+            help="Sample enrollment, tuition, inflation and salaries instead of single-point thresholds"):
+        with st.expander("🎛️ Simulation Assumptions"):
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                draws = kept(st.select_slider, "Draws", options=[10000, 50000, 100000, 250000, 500000],
+                             value=risk.DEFAULT_DRAWS, key='monte_carlo_draws')
+                enrollment_sd = kept(st.slider, "Enrollment Volatility (%)", 0, 30,
+                                     value=int(risk.DEFAULT_ENROLLMENT_SD * 100), step=1,
+                                     key='enrollment_volatility') / 100
+
+            with col2:
+                tuition_sd = kept(st.slider, "Tuition Volatility (%)", 0, 20,
+                                  value=int(risk.DEFAULT_TUITION_SD * 100), step=1,
+                                  key='tuition_volatility') / 100
+                inflation_sd = kept(st.slider, "Inflation Volatility (pts)", 0.0, 5.0,
+                                    value=risk.DEFAULT_INFLATION_SD, step=0.1, key='inflation_volatility')
+
+            with col3:
+                salary_sd = kept(st.slider, "Salary Volatility (%)", 0, 20,
+                                 value=int(risk.DEFAULT_SALARY_SD * 100), step=1,
+                                 key='salary_volatility') / 100
+
+        summary, _, _ = artifacts.monte_carlo(params, draws, enrollment_sd, tuition_sd, inflation_sd, salary_sd)
+        confidence_label = f"{summary['confidence'] * 100:.0f}%"
+
+        col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            expense_ratio = (total_cost / total_revenue * 100) if total_revenue > 0 else 0
-            st.metric("Expense Ratio", f"{expense_ratio:.1f}%", delta="Of revenue")
+            deficit_risk = model.risk_label(summary['deficit_risk'])
+            st.markdown(f"<h4 class='cecs-risk-{deficit_risk.lower()}'>Deficit Risk: {deficit_risk}</h4>",
+                        unsafe_allow_html=True)
+            st.metric("Probability of Deficit", f"{summary['p_deficit'] * 100:.1f}%")
 
         with col2:
-            personnel_ratio = (total_personnel_cost / total_cost * 100) if total_cost > 0 else 0
-            st.metric("Personnel %", f"{personnel_ratio:.1f}%", delta="Of expenses")
+            st.metric(f"VaR ({confidence_label})", f"${summary['var']:,.0f}",
+                      delta=f"Net position at the {100 - summary['confidence'] * 100:.0f}th percentile",
+                      delta_color="off")
 
         with col3:
-            operating_ratio = (operating_cost / total_cost * 100) if total_cost > 0 else 0
-            st.metric("Operating %", f"{operating_ratio:.1f}%", delta="Of expenses")
+            st.metric(f"CVaR ({confidence_label})", f"${summary['cvar']:,.0f}",
+                      delta="Average of the worst outcomes", delta_color="off")
 
         with col4:
-            cost_per_student = total_cost / students if students > 0 else 0
-            st.metric("Cost/Student", f"${cost_per_student:,.0f}")
+            st.metric("Expected Net Position", f"${summary['mean']:,.0f}",
+                      delta=f"±${summary['std']:,.0f} std dev", delta_color="off")
 
-        with col5:
-            margin = (net_result / total_revenue * 100) if total_revenue > 0 else 0
-            st.metric("Margin", f"{margin:.2f}%")
+        plotly_chart(artifacts.monte_carlo_figure(params, draws, enrollment_sd, tuition_sd, inflation_sd, salary_sd,
+                                                  theme=st.session_state.theme), "Monte Carlo")
 
-        st.markdown("---")
+        percentile_df = pd.DataFrame({
+            'Percentile': [f'P{p}' for p in summary['percentiles']],
+            'Net Position': list(summary['percentiles'].values())
+        })
+        dataframe(percentile_df, "Monte Carlo Percentiles", column_config=number_columns(percentile_df))
 
-        # DETAILED FINANCIAL STATEMENT
-        if show_detailed_breakdown:
-            st.markdown("<h4 style='color: #FF8200;'>📋 Complete Financial Statement</h4>", unsafe_allow_html=True)
-
-            financial_data = {
-                'Line Item': [
-                    '═══ REVENUE ═══',
-                    'Tuition Revenue',
-                    'Other Revenue Sources',
-                    'Total Revenue',
-                    '',
-                    '═══ EXPENSES ═══',
-                    '--- Personnel ---',
-                    'Full-Time Faculty Salaries',
-                    'Adjunct Faculty Salaries',
-                    'Staff Salaries',
-                    'Student Ambassador Pay',
-                    'Grader Compensation',
-                    'Tutor Compensation',
-                    'Total Personnel Cost',
-                    '',
-                    '--- Operations ---',
-                    'Operating Supplies',
-                    'Total Operating Cost',
-                    '',
-                    'TOTAL EXPENSES',
-                    '',
-                    '═══ SUMMARY ═══',
-                    'Net Position',
-                    'Contingency Fund',
-                    'Effective Net Position'
-                ],
-                'Amount': [
-                    '',
-                    f'${students * tuition_per_student:,.0f}',
-                    f'${other_revenue:,.0f}',
-                    f'${total_revenue:,.0f}',
-                    '',
-                    '',
-                    '',
-                    f'${faculty_cost:,.0f}',
-                    f'${adjunct_cost:,.0f}',
-                    f'${staff_cost:,.0f}',
-                    f'${ambassador_cost:,.0f}',
-                    f'${grader_cost:,.0f}',
-                    f'${tutor_cost:,.0f}',
-                    f'${total_personnel_cost:,.0f}',
-                    '',
-                    '',
-                    f'${operating_cost:,.0f}',
-                    f'${operating_cost:,.0f}',
-                    '',
-                    f'${total_cost:,.0f}',
-                    '',
-                    '',
-                    f'${net_result:,.0f}',
-                    f'${contingency_amount:,.0f}',
-                    f'${net_result - contingency_amount:,.0f}'
-                ],
-                'Details': [
-                    '',
-                    f'{students:,} students × ${tuition_per_student:,}/student',
-                    'Grants, donations, auxiliary services',
-                    f'{(total_revenue):,.0f}',
-                    '',
-                    '',
-                    '',
-                    f'{full_time_faculty} positions × ${faculty_salary:,}/year',
-                    f'{adjunct_faculty} positions × ${adjunct_salary:,}/year',
-                    f'{staff_members} positions × ${staff_salary:,}/year',
-                    f'{ambassadors} positions × ${ambassador_pay:,}/year',
-                    f'{graders} positions × ${grader_pay:,}/year',
-                    f'{tutors} positions × ${tutor_pay:,}/year',
-                    f'{total_personnel} total positions',
-                    '',
-                    '',
-                    f'{students:,} students × ${operating_per_student}/student',
-                    'Books, supplies, technology',
-                    '',
-                    f'{(total_cost / total_revenue * 100):.1f}% of revenue',
-                    '',
-                    '',
-                    'Surplus' if net_result >= 0 else 'Deficit',
-                    f'{contingency_fund}% reserve',
-                    'After contingency'
-                ]
-            }
-
-            fin_df = pd.DataFrame(financial_data)
-            st.dataframe(fin_df, use_container_width=True, hide_index=True, height=800)
-
-    with tab4:
-        st.markdown("<h2 style='color: #e0e0e0;'>📈 Advanced Analytics & Projections</h2>", unsafe_allow_html=True)
-
-        # ENROLLMENT SCENARIOS
-        st.markdown("<h4 style='color: #FF8200;'>🔄 Enrollment Impact Analysis</h4>", unsafe_allow_html=True)
-
-        scenarios = [0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3]
-        scenario_labels = ['-30%', '-20%', '-10%', 'Current', '+10%', '+20%', '+30%']
-        scenario_students = [int(students * s) for s in scenarios]
-        scenario_revenues = [s * tuition_per_student + other_revenue for s in scenario_students]
-
-        scenario_costs = []
-        scenario_personnel = []
-        for s_students in scenario_students:
-            s_faculty = max(1, int(s_students / faculty_ratio)) * faculty_salary
-            s_adjunct = max(1, int(s_students / adjunct_ratio)) * adjunct_salary
-            s_staff = max(1, int(s_students / staff_ratio)) * staff_salary
-            s_support = (int(s_students / ambassador_ratio) * ambassador_pay +
-                         int(s_students / grader_ratio) * grader_pay +
-                         int(s_students / tutor_ratio) * tutor_pay)
-            s_ops = s_students * operating_per_student
-            scenario_costs.append(s_faculty + s_adjunct + s_staff + s_support + s_ops)
-
-            s_personnel = (max(1, int(s_students / faculty_ratio)) +
-                           max(1, int(s_students / adjunct_ratio)) +
-                           max(1, int(s_students / staff_ratio)) +
-                           int(s_students / ambassador_ratio) +
-                           int(s_students / grader_ratio) +
-                           int(s_students / tutor_ratio))
-            scenario_personnel.append(s_personnel)
-
-        scenario_net = [r - c for r, c in zip(scenario_revenues, scenario_costs)]
-
-        # SCENARIO CHART - DARK BACKGROUND
-        fig_scenarios = go.Figure()
-
-        fig_scenarios.add_trace(go.Scatter(
-            x=scenario_labels,
-            y=scenario_revenues,
-            mode='lines+markers',
-            name='Revenue',
-            line=dict(color='#28a745', width=3),
-            marker=dict(size=10),
-            text=[f'${r:,.0f}' for r in scenario_revenues],
-            textposition='top center',
-            textfont=dict(color='#e0e0e0')
-        ))
-
-        fig_scenarios.add_trace(go.Scatter(
-            x=scenario_labels,
-            y=scenario_costs,
-            mode='lines+markers',
-            name='Expenses',
-            line=dict(color='#dc3545', width=3),
-            marker=dict(size=10),
-            text=[f'${c:,.0f}' for c in scenario_costs],
-            textposition='bottom center',
-            textfont=dict(color='#e0e0e0')
-        ))
-
-        fig_scenarios.add_trace(go.Scatter(
-            x=scenario_labels,
-            y=scenario_net,
-            mode='lines+markers',
-            name='Net Position',
-            line=dict(color='#FF8200', width=3, dash='dash'),
-            marker=dict(size=10),
-            text=[f'${n:,.0f}' for n in scenario_net],
-            textposition='middle right',
-            textfont=dict(color='#e0e0e0')
-        ))
-
-        fig_scenarios.update_layout(
-            title='Financial Impact of Enrollment Changes',
-            xaxis_title='Enrollment Scenario',
-            yaxis_title='Amount ($)',
-            height=500,
-            hovermode='x unified',
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(44, 44, 44, 1)',
-            font=dict(family='Inter', color='#e0e0e0'),
-            legend=dict(font=dict(color='#e0e0e0'))
+    st.markdown("---")
+
+    # EXPORT OPTIONS
+    st.markdown("<h4>📥 Export & Reporting</h4>", unsafe_allow_html=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        # The workbook is generated on its own thread when clicked, so nothing here may touch session state
+        store, user = scenario_store(), current_user()
+        st.download_button(
+            "📊 Export to Excel",
+            data=lambda: artifacts.excel_export(params, tuple(store.list(user=user, limit=store.count(user=user))),
+                                                assumptions),
+            file_name=f"cecs_analysis_{datetime.now():%Y%m%d}.xlsx",
+            mime=export.XLSX_MIME,
+            on_click="ignore",
+            width="stretch"
         )
 
-        st.plotly_chart(fig_scenarios, use_container_width=True)
+    with col2:
+        st.download_button(
+            "📄 Generate PDF",
+            data=lambda: artifacts.pdf_export(params, assumptions),
+            file_name=f"cecs_report_{datetime.now():%Y%m%d}.pdf",
+            mime=report.PDF_MIME,
+            on_click="ignore",
+            width="stretch"
+        )
 
-        # SCENARIO COMPARISON TABLE
-        st.markdown("<h4 style='color: #FF8200;'>📊 Scenario Comparison Matrix</h4>", unsafe_allow_html=True)
+    with col3:
+        if st.button("📧 Email Report", width="stretch"):
+            st.info("📧 Email feature - Coming soon!")
 
-        scenario_df = pd.DataFrame({
-            'Scenario': scenario_labels,
-            'Students': [f'{s:,}' for s in scenario_students],
-            'Personnel': scenario_personnel,
-            'Revenue': [f'${r:,.0f}' for r in scenario_revenues],
-            'Expenses': [f'${c:,.0f}' for c in scenario_costs],
-            'Net Position': [f'${n:,.0f}' for n in scenario_net],
-            'Margin %': [f'{(n / r * 100):.2f}%' if r > 0 else '0%' for n, r in zip(scenario_net, scenario_revenues)]
-        })
+    with col4:
+        if st.button("💾 Save Analysis", width="stretch"):
+            save_scenario(f"Analysis {datetime.now():%Y-%m-%d %H:%M}", params)
+            st.success("✅ Analysis saved to scenarios!")
 
-        st.dataframe(scenario_df, use_container_width=True, hide_index=True)
 
-        st.markdown("---")
+# ========== SCENARIO STORE ==========
+@st.cache_resource
+def scenario_store():
+    # One store shared by every session; each session reads through its own bounded cache
+    return scenarios.open_store()
 
-        # BREAK-EVEN ANALYSIS
-        st.markdown("<h4 style='color: #FF8200;'>⚖️ Break-Even Analysis</h4>", unsafe_allow_html=True)
 
-        col1, col2, col3 = st.columns(3)
+def session_scenarios():
+    if 'scenario_store' not in st.session_state:
+        st.session_state.scenario_store = scenarios.CachedStore(scenario_store())
+    metrics.track_session()
+    return st.session_state.scenario_store
 
-        with col1:
-            fixed_costs = total_personnel_cost
-            variable_cost_per_student = operating_per_student
-            contribution_per_student = tuition_per_student - variable_cost_per_student
-
-            if contribution_per_student > 0:
-                breakeven_students = int(fixed_costs / contribution_per_student)
-                st.metric("Break-Even Enrollment", f"{breakeven_students:,} students")
-                st.metric("Current vs Break-Even", f"{((students / breakeven_students - 1) * 100):.1f}%",
-                          delta="Above BE" if students > breakeven_students else "Below BE")
-            else:
-                st.warning("⚠️ Negative contribution margin")
 
-        with col2:
-            if contribution_per_student > 0:
-                margin_of_safety = students - breakeven_students
-                margin_of_safety_pct = (margin_of_safety / students * 100) if students > 0 else 0
+# Most recent saved scenarios offered in the comparison picker
+COMPARISON_CHOICES = 50
 
-                st.metric("Margin of Safety", f"{margin_of_safety:,} students")
-                st.metric("Safety %", f"{margin_of_safety_pct:.1f}%")
-                st.metric("Contribution Margin", f"${contribution_per_student:,.0f}",
-                          delta="Per student")
 
-        with col3:
-            if contribution_per_student > 0:
-                target_profit = 1000000
-                target_students = int((fixed_costs + target_profit) / contribution_per_student)
-                st.metric("For $1M Surplus", f"{target_students:,} students",
-                          delta=f"{target_students - students:,} more needed")
+def current_user():
+    return st.session_state.username or 'anonymous'
 
-                revenue_needed = target_students * tuition_per_student
-                st.metric("Revenue Needed", f"${revenue_needed:,.0f}")
 
-        st.markdown("---")
+def save_scenario(name, params):
+    session_scenarios().save(name, current_user(), params, artifacts.results(params))
+    st.session_state.scenario_page = 0
 
-        # SENSITIVITY ANALYSIS
-        st.markdown("<h4 style='color: #FF8200;'>🎯 Sensitivity Analysis</h4>", unsafe_allow_html=True)
 
-        col1, col2 = st.columns(2)
+@st.fragment
+@metrics.fragment("Scenario Management")
+def scenario_management(params):
+    store = session_scenarios()
+    user = current_user()
 
-        with col1:
-            st.markdown("**Tuition Impact**")
-            tuition_variations = [0.9, 0.95, 1.0, 1.05, 1.1]
-            tuition_labels = ['-10%', '-5%', 'Current', '+5%', '+10%']
-            tuition_net = [(students * tuition_per_student * t + other_revenue) - total_cost for t in
-                           tuition_variations]
-
-            fig_tuition = go.Figure(data=[
-                go.Bar(
-                    x=tuition_labels,
-                    y=tuition_net,
-                    marker_color=['#dc3545' if n < 0 else '#28a745' for n in tuition_net],
-                    text=[f'${n:,.0f}' for n in tuition_net],
-                    textposition='outside',
-                    textfont=dict(color='#e0e0e0')
-                )
-            ])
-
-            fig_tuition.update_layout(
-                title='Impact of Tuition Changes on Net Position',
-                xaxis_title='Tuition Adjustment',
-                yaxis_title='Net Position ($)',
-                height=350,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(44, 44, 44, 1)',
-                font=dict(family='Inter', color='#e0e0e0')
-            )
+    with st.sidebar:
+        st.markdown("### 💾 Scenario Management")
+        scenario_name = st.text_input("Scenario Name", placeholder="e.g., Conservative 2025")
+        if st.button("💾 Save Current Scenario", width="stretch"):
+            save_scenario(scenario_name if scenario_name else f"Scenario {store.count(user=user) + 1}", params)
+            st.success("✅ Scenario saved!")
 
-            st.plotly_chart(fig_tuition, use_container_width=True)
+        if store.count(user=user):
+            st.markdown("**Saved Scenarios:**")
+            search = st.text_input("Search Scenarios", key="scenario_search", placeholder="Search by name...",
+                                   label_visibility="collapsed")
+            total = store.count(user=user, name=search)
+            pages = max(math.ceil(total / scenarios.PAGE_SIZE), 1)
+            page = min(st.session_state.get('scenario_page', 0), pages - 1)
+            offset = page * scenarios.PAGE_SIZE
+
+            for idx, scenario in enumerate(store.list(user=user, name=search, offset=offset), start=offset):
+                st.markdown(
+                    f"<p class='cecs-muted'>{idx + 1}. {html.escape(scenario.name)} "
+                    f"({scenario.params.students:,} students · {scenario.created_at[:16]})</p>",
+                    unsafe_allow_html=True)
 
-        with col2:
-            st.markdown("**Cost Reduction Impact**")
-            cost_reductions = [0, 5, 10, 15, 20]
-            cost_labels = ['0%', '5%', '10%', '15%', '20%']
-            cost_net = [total_revenue - (total_cost * (1 - r / 100)) for r in cost_reductions]
-
-            fig_cost_reduction = go.Figure(data=[
-                go.Bar(
-                    x=cost_labels,
-                    y=cost_net,
-                    marker_color='#FF8200',
-                    text=[f'${n:,.0f}' for n in cost_net],
-                    textposition='outside',
-                    textfont=dict(color='#e0e0e0')
-                )
-            ])
-
-            fig_cost_reduction.update_layout(
-                title='Impact of Cost Reduction on Net Position',
-                xaxis_title='Cost Reduction',
-                yaxis_title='Net Position ($)',
-                height=350,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(44, 44, 44, 1)',
-                font=dict(family='Inter', color='#e0e0e0')
-            )
+            if pages > 1:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    st.button("◀", key="scenario_prev", disabled=page == 0,
+                              on_click=lambda: st.session_state.update(scenario_page=page - 1))
+                with col2:
+                    st.caption(f"Page {page + 1} of {pages}")
+                with col3:
+                    st.button("▶", key="scenario_next", disabled=page == pages - 1,
+                              on_click=lambda: st.session_state.update(scenario_page=page + 1))
 
-            st.plotly_chart(fig_cost_reduction, use_container_width=True)
 
-        st.markdown("---")
+@st.fragment
+@metrics.fragment("Scenario Comparison")
+def scenario_comparison_tab(params):
+    st.markdown("<h2>⚖️ Scenario Comparison</h2>", unsafe_allow_html=True)
 
-        # MULTI-YEAR PROJECTIONS
-        st.markdown("<h4 style='color: #FF8200;'>📅 5-Year Financial Projections</h4>", unsafe_allow_html=True)
-
-        years = ['Year 1', 'Year 2', 'Year 3', 'Year 4', 'Year 5']
-        growth_rate = 0.03  # 3% annual growth
-
-        projected_students = [int(students * ((1 + growth_rate) ** i)) for i in range(5)]
-        projected_revenues = [s * tuition_per_student * ((1 + inflation_rate / 100) ** i) + other_revenue for i, s in
-                              enumerate(projected_students)]
-        projected_costs = []
-
-        for i, s_students in enumerate(projected_students):
-            inflation_factor = (1 + inflation_rate / 100) ** i
-            s_faculty = max(1, int(s_students / faculty_ratio)) * faculty_salary * inflation_factor
-            s_adjunct = max(1, int(s_students / adjunct_ratio)) * adjunct_salary * inflation_factor
-            s_staff = max(1, int(s_students / staff_ratio)) * staff_salary * inflation_factor
-            s_support = ((int(s_students / ambassador_ratio) * ambassador_pay +
-                          int(s_students / grader_ratio) * grader_pay +
-                          int(s_students / tutor_ratio) * tutor_pay) * inflation_factor)
-            s_ops = s_students * operating_per_student * inflation_factor
-            projected_costs.append(s_faculty + s_adjunct + s_staff + s_support + s_ops)
-
-        projected_net = [r - c for r, c in zip(projected_revenues, projected_costs)]
-
-        fig_projection = go.Figure()
-
-        fig_projection.add_trace(go.Scatter(
-            x=years,
-            y=projected_revenues,
-            mode='lines+markers',
-            name='Projected Revenue',
-            line=dict(color='#28a745', width=3),
-            marker=dict(size=12),
-            fill='tonexty'
-        ))
-
-        fig_projection.add_trace(go.Scatter(
-            x=years,
-            y=projected_costs,
-            mode='lines+markers',
-            name='Projected Expenses',
-            line=dict(color='#dc3545', width=3),
-            marker=dict(size=12),
-            fill='tozeroy'
-        ))
-
-        fig_projection.update_layout(
-            title=f'5-Year Financial Forecast ({growth_rate * 100:.0f}% Growth, {inflation_rate:.1f}% Inflation)',
-            xaxis_title='Year',
-            yaxis_title='Amount ($)',
-            height=450,
-            hovermode='x unified',
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(44, 44, 44, 1)',
-            font=dict(family='Inter', color='#e0e0e0'),
-            legend=dict(font=dict(color='#e0e0e0'))
+    saved = session_scenarios().list(user=current_user(), limit=COMPARISON_CHOICES)
+    if not saved:
+        st.info("💡 Save scenarios from the sidebar to compare them here")
+        return
+
+    choices = {scenario.id: scenario for scenario in saved}
+    col1, col2 = st.columns([4, 1])
+
+    with col1:
+        selected = kept(
+            st.multiselect,
+            "Scenarios to Compare",
+            list(choices),
+            default=list(choices)[:3],
+            format_func=lambda i: f"{choices[i].name} ({choices[i].created_at[:16]})",
+            key='compared_scenarios'
         )
 
-        st.plotly_chart(fig_projection, use_container_width=True)
+    with col2:
+        include_current = kept(st.checkbox, "Include Current Inputs", value=True, key='include_current')
 
-        # 5-YEAR SUMMARY TABLE
-        projection_df = pd.DataFrame({
-            'Year': years,
-            'Students': [f'{s:,}' for s in projected_students],
-            'Revenue': [f'${r:,.0f}' for r in projected_revenues],
-            'Expenses': [f'${c:,.0f}' for c in projected_costs],
-            'Net Position': [f'${n:,.0f}' for n in projected_net],
-            'Margin %': [f'{(n / r * 100):.2f}%' if r > 0 else '0%' for n, r in zip(projected_net, projected_revenues)]
-        })
+    scenario_params = [choices[i].params for i in selected]
+    known = [choices[i].results for i in selected]
+    names = [choices[i].name for i in selected]
+    # Saved names need not be unique; the charts key their categories on them
+    labels = [f"{name} #{i}" if names.count(name) > 1 else name for name, i in zip(names, selected)]
+    if include_current:
+        scenario_params.insert(0, params)
+        known.insert(0, st.session_state.recalculation.results())
+        labels.insert(0, "Current Inputs")
 
-        st.dataframe(projection_df, use_container_width=True, hide_index=True)
+    if not scenario_params:
+        st.warning("⚠️ Select at least one scenario")
+        return
 
-        st.markdown("---")
+    scenario_params, labels, known = tuple(scenario_params), tuple(labels), tuple(known)
 
-        # RISK ANALYSIS
-        st.markdown("<h4 style='color: #FF8200;'>⚠️ Risk Assessment Dashboard</h4>", unsafe_allow_html=True)
+    st.markdown("<h4>📋 Side-by-Side Results</h4>", unsafe_allow_html=True)
+
+    comparison_df = artifacts.comparison_data(scenario_params, labels, known)
+
+    dataframe(comparison_df, "Side-by-Side", column_config=number_columns(comparison_df))
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_net = artifacts.comparison_net_figure(scenario_params, labels, known, theme=st.session_state.theme)
+
+        plotly_chart(fig_net, "Comparison Net Position")
+
+    with col2:
+        fig_headcount = artifacts.comparison_headcount_figure(scenario_params, labels, known,
+                                                              theme=st.session_state.theme)
+
+        plotly_chart(fig_headcount, "Comparison Headcount")
 
-        col1, col2, col3, col4 = st.columns(4)
+
+def main_dashboard():
+    load_css()
+
+    # HEADER
+    with profiling.section("header"):
+        col1, col2, col3 = st.columns([1, 6, 1])
 
         with col1:
-            enrollment_risk = "LOW" if students > breakeven_students * 1.2 else (
-                "MEDIUM" if students > breakeven_students else "HIGH")
-            risk_color = "#28a745" if enrollment_risk == "LOW" else (
-                "#ffc107" if enrollment_risk == "MEDIUM" else "#dc3545")
-            st.markdown(f"<h4 style='color: {risk_color};'>Enrollment Risk: {enrollment_risk}</h4>",
-                        unsafe_allow_html=True)
-            st.metric("Buffer",
-                      f"{((students / breakeven_students - 1) * 100):.1f}%" if contribution_per_student > 0 else "N/A")
+            st.markdown("<div style='font-size: 3rem;'>🍊</div>", unsafe_allow_html=True)
 
         with col2:
-            margin_risk = "LOW" if margin > 15 else ("MEDIUM" if margin > 5 else "HIGH")
-            risk_color = "#28a745" if margin_risk == "LOW" else ("#ffc107" if margin_risk == "MEDIUM" else "#dc3545")
-            st.markdown(f"<h4 style='color: {risk_color};'>Margin Risk: {margin_risk}</h4>", unsafe_allow_html=True)
-            st.metric("Current Margin", f"{margin:.2f}%")
+            st.markdown("<h1>UNIVERSITY OF TENNESSEE</h1>", unsafe_allow_html=True)
+            st.markdown(
+                "<h3>College of Emerging & Collaborative Studies | Financial Analytics Platform</h3>",
+                unsafe_allow_html=True)
 
         with col3:
-            dependency_risk = "HIGH" if (tuition_per_student * students / total_revenue) > 0.9 else (
-                "MEDIUM" if (tuition_per_student * students / total_revenue) > 0.7 else "LOW")
-            risk_color = "#dc3545" if dependency_risk == "HIGH" else (
-                "#ffc107" if dependency_risk == "MEDIUM" else "#28a745")
-            st.markdown(f"<h4 style='color: {risk_color};'>Revenue Dependency: {dependency_risk}</h4>",
-                        unsafe_allow_html=True)
-            st.metric("Tuition %", f"{(tuition_per_student * students / total_revenue * 100):.1f}%")
+            if st.button("🚪 Logout", key="logout"):
+                st.session_state.logged_in = False
+                st.rerun()
 
-        with col4:
-            personnel_risk = "HIGH" if personnel_ratio > 80 else ("MEDIUM" if personnel_ratio > 70 else "LOW")
-            risk_color = "#dc3545" if personnel_risk == "HIGH" else (
-                "#ffc107" if personnel_risk == "MEDIUM" else "#28a745")
-            st.markdown(f"<h4 style='color: {risk_color};'>Personnel Cost Risk: {personnel_risk}</h4>",
-                        unsafe_allow_html=True)
-            st.metric("Personnel %", f"{personnel_ratio:.1f}%")
+        st.markdown("---")
 
+    # SIDEBAR
+    with st.sidebar, profiling.section("sidebar"):
+        st.markdown("## ⚙️ SCENARIO CONFIGURATION")
         st.markdown("---")
 
-        # EXPORT OPTIONS
-        st.markdown("<h4 style='color: #FF8200;'>📥 Export & Reporting</h4>", unsafe_allow_html=True)
+        # Inputs are keyed by model field, so each stays the same widget in and out of a form
+        with input_group("scenario_inputs"):
+            st.markdown("### 📊 Enrollment Data")
+            students = st.number_input(
+                "Total Students Enrolled",
+                min_value=0,
+                max_value=50000,
+                value=6000,
+                step=100,
+                help="Projected student enrollment",
+                key='students'
+            )
 
-        col1, col2, col3, col4 = st.columns(4)
+            st.markdown("### 💰 Revenue Parameters")
+            tuition_per_student = st.number_input(
+                "Average Tuition per Student",
+                min_value=0,
+                max_value=100000,
+                value=12000,
+                step=500,
+                help="Annual tuition revenue per student",
+                key='tuition_per_student'
+            )
+
+            other_revenue = st.number_input(
+                "Other Revenue Sources",
+                min_value=0,
+                value=0,
+                step=10000,
+                help="Grants, donations, auxiliary revenue",
+                key='other_revenue'
+            )
+
+            st.markdown("---")
+
+            with st.expander("🔧 Advanced Settings"):
+                inflation_rate = st.slider("Inflation Rate (%)", 0.0, 10.0, 3.0, 0.1, key='inflation_rate')
+                contingency_fund = st.slider("Contingency Fund (%)", 0, 20, 5, 1, key='contingency_fund')
+                show_detailed_breakdown = st.checkbox("Show Detailed Breakdown", value=True,
+                                                      key='show_detailed_breakdown')
+
+        st.markdown("---")
+        # Switches the stylesheet's palette through the page's theme marker class
+        st.radio("🎨 Theme", ('dark', 'light'), key='theme', format_func=str.title, horizontal=True)
+        st.radio("⚡ Input Mode", ('instant', 'apply'), key='input_mode', format_func=str.title, horizontal=True,
+                 help="Apply holds changes to the scenario inputs and staffing configuration until "
+                      "Apply Changes is pressed, so each adjustment reruns the dashboard once")
+        st.markdown("---")
+
+    # HERO BANNER
+    st.markdown(f"""
+        <div class="hero-banner fade-in">
+            <h1 style="margin: 0; font-size: 2.5rem;">FINANCIAL SCENARIO ANALYSIS</h1>
+            <p style="font-size: 1.5rem; margin: 0.5rem 0 0 0; font-weight: 600;">
+                {students:,} Students | Academic Year 2025-2026
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    # STAFFING CONFIGURATION
+    with (st.expander("⚙️ Configure Staffing Ratios & Compensation"), profiling.section("staffing configuration"),
+          input_group("staffing_inputs")):
+        st.markdown("### Staffing Ratios")
+        col1, col2, col3 = st.columns(3)
 
         with col1:
-            if st.button("📊 Export to Excel", use_container_width=True):
-                st.info("📊 Excel export - Coming soon!")
+            st.markdown("**👨‍🏫 Faculty**")
+            faculty_ratio = st.slider("Students per FT Faculty", *model.RATIO_BOUNDS['faculty_ratio'], 50,
+                                      key='faculty_ratio')
+            adjunct_ratio = st.slider("Students per Adjunct", *model.RATIO_BOUNDS['adjunct_ratio'], 100,
+                                      key='adjunct_ratio')
 
         with col2:
-            if st.button("📄 Generate PDF", use_container_width=True):
-                st.info("📄 PDF export - Coming soon!")
+            st.markdown("**👔 Staff & Support**")
+            staff_ratio = st.slider("Students per Staff", *model.RATIO_BOUNDS['staff_ratio'], 200,
+                                    key='staff_ratio')
+            ambassador_ratio = st.slider("Students per Ambassador", *model.RATIO_BOUNDS['ambassador_ratio'], 300,
+                                         key='ambassador_ratio')
 
         with col3:
-            if st.button("📧 Email Report", use_container_width=True):
-                st.info("📧 Email feature - Coming soon!")
+            st.markdown("**🎓 Academic Support**")
+            grader_ratio = st.slider("Students per Grader", *model.RATIO_BOUNDS['grader_ratio'], 150,
+                                     key='grader_ratio')
+            tutor_ratio = st.slider("Students per Tutor", *model.RATIO_BOUNDS['tutor_ratio'], 200,
+                                    key='tutor_ratio')
 
-        with col4:
-            if st.button("💾 Save Analysis", use_container_width=True):
-                st.success("✅ Analysis saved to scenarios!")
+        st.markdown("---")
+        st.markdown("### Annual Compensation")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            faculty_salary = st.number_input("FT Faculty Salary", value=75000, step=5000, key='faculty_salary')
+            adjunct_salary = st.number_input("Adjunct Salary", value=40000, step=2000, key='adjunct_salary')
+
+        with col2:
+            staff_salary = st.number_input("Staff Salary", value=50000, step=2000, key='staff_salary')
+            ambassador_pay = st.number_input("Ambassador Pay", value=15000, step=1000, key='ambassador_pay')
+
+        with col3:
+            grader_pay = st.number_input("Grader Pay", value=10000, step=500, key='grader_pay')
+            tutor_pay = st.number_input("Tutor Pay", value=12000, step=500, key='tutor_pay')
+
+        operating_per_student = st.number_input(
+            "Operating Cost per Student",
+            value=500,
+            step=50,
+            key='operating_per_student'
+        )
+
+    # CALCULATIONS
+    inputs = {
+        'students': students,
+        'tuition_per_student': tuition_per_student,
+        'other_revenue': other_revenue,
+        'faculty_ratio': faculty_ratio,
+        'adjunct_ratio': adjunct_ratio,
+        'staff_ratio': staff_ratio,
+        'ambassador_ratio': ambassador_ratio,
+        'grader_ratio': grader_ratio,
+        'tutor_ratio': tutor_ratio,
+        'faculty_salary': faculty_salary,
+        'adjunct_salary': adjunct_salary,
+        'staff_salary': staff_salary,
+        'ambassador_pay': ambassador_pay,
+        'grader_pay': grader_pay,
+        'tutor_pay': tutor_pay,
+        'operating_per_student': operating_per_student,
+        'inflation_rate': inflation_rate,
+        'contingency_fund': contingency_fund,
+    }
+    params = model.Parameters(**inputs)
+    recalculation = st.session_state.recalculation.update(params)
+
+    with profiling.section("scenario management"):
+        scenario_management(params)
+
+    # TABS - only the open tab runs; each tab is a fragment so its own widgets rerun just that tab
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📊 Executive Dashboard",
+        "👥 Staffing Analysis",
+        "💰 Financial Details",
+        "📈 Advanced Analytics",
+        "⚖️ Scenario Comparison"
+    ], key="active_tab", on_change="rerun")
+
+    if tab1.open:
+        with tab1, profiling.section("tab: Executive Dashboard"):
+            executive_dashboard_tab(params)
+
+    if tab2.open:
+        with tab2, profiling.section("tab: Staffing Analysis"):
+            staffing_analysis_tab(params)
+
+    if tab3.open:
+        with tab3, profiling.section("tab: Financial Details"):
+            financial_details_tab(params, show_detailed_breakdown)
+
+    if tab4.open:
+        with tab4, profiling.section("tab: Advanced Analytics"):
+            advanced_analytics_tab(params)
+
+    if tab5.open:
+        with tab5, profiling.section("tab: Scenario Comparison"):
+            scenario_comparison_tab(params)
+
+    # RECALCULATION - which model values this run had to recompute, and how long each took; the rest was reused
+    with st.sidebar.expander("🔁 Recalculation"):
+        recomputed = recalculation.recomputed
+        st.caption(f"{len(recomputed)} of {len(model.NODES)} model values recomputed on the last run "
+                   f"in {sum(recomputed.values()) * 1000:.2f} ms")
+        st.markdown(", ".join(f"`{name}` {seconds * 1000:.2f} ms" for name, seconds in recomputed.items())
+                    or "Nothing changed; every value was reused")
 
     # FOOTER
     st.markdown("---")
     st.markdown("""
-        <div style='text-align: center; color: #b0b0b0; padding: 2rem 0;'>
+        <div class='cecs-muted' style='text-align: center; padding: 2rem 0;'>
             <p style='font-size: 1rem; font-weight: 600; margin-bottom: 0.5rem; color: #FF8200;'>
                 🍊 University of Tennessee, Knoxville
             </p>
-            <p style='font-size: 0.875rem; margin-bottom: 0.5rem; color: #b0b0b0;'>
+            <p class='cecs-muted' style='font-size: 0.875rem; margin-bottom: 0.5rem;'>
                 College of Emerging & Collaborative Studies | Financial Analytics Platform
             </p>
             <p style='font-size: 0.75rem; color: #808080;'>
@@ -1471,8 +1255,46 @@ def main_dashboard():
     """, unsafe_allow_html=True)
 
 
+def timing_panel(timer, history):
+    # Opened with ?timing=1; reruns of a single fragment (a tab's own widgets) are not timed
+    with st.sidebar.expander("⏱️ Timing", expanded=True):
+        summary = pd.DataFrame(history.summary(timer),
+                               columns=['Section', 'This Run (ms)', 'p50 (ms)', 'p95 (ms)', 'Runs'])
+        st.dataframe(summary, width="stretch", hide_index=True,
+                     column_config={**{column: st.column_config.NumberColumn(format='%.1f')
+                                       for column in ('This Run (ms)', 'p50 (ms)', 'p95 (ms)')},
+                                    'Runs': st.column_config.NumberColumn(format='%d')})
+        st.caption(f"p50/p95 over the last {history.runs} full reruns of this session")
+
+        st.checkbox("Profile each rerun (cProfile)", key='profile_rerun')
+        if timer.profile is not None:
+            st.code(profiling.profile_report(timer.profile), language=None)
+            st.download_button("📥 Download Profile (.prof)", profiling.profile_dump(timer.profile),
+                               file_name=f"cecs_rerun_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof",
+                               mime="application/octet-stream")
+
+
+@st.cache_resource
+def metrics_exporter():
+    # One per server process; serves or writes the metrics only when the environment asks for it
+    return metrics.start_exporter()
+
+
 # APPLICATION ENTRY POINT
+metrics_exporter()
 if not st.session_state.logged_in:
     login_page()
+    prewarm_analytics()
 else:
-    main_dashboard()
\ No newline at end of file
+    with metrics.rerun() as rerun:
+        if st.query_params.get('timing') == '1':
+            if 'timing_history' not in st.session_state:
+                st.session_state.timing_history = profiling.History()
+            with profiling.timing(st.session_state.timing_history,
+                                  profile=st.session_state.get('profile_rerun', False)) as timer:
+                main_dashboard()
+            timing_panel(timer, st.session_state.timing_history)
+        else:
+            main_dashboard()
+        # Tab labels without their icon, e.g. "Executive Dashboard"
+        rerun.tab = st.session_state.active_tab.split(' ', 1)[-1]
\ No newline at end of file
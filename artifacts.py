@@ -0,0 +1,244 @@
+"""Memoized derived artifacts for the CECS dashboard.
+
+Every table and figure the dashboard shows is built here from a
+``model.Parameters`` bundle and cached process-wide, so reruns that do not
+change a model input (toggling a checkbox, switching tabs, another user on
+the same scenario) are served from cache instead of being rebuilt.
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import charts
+import export
+import metrics
+import model
+import profiling
+import report
+import risk
+import tables
+
+# Bounded per artifact; least-recently-used entries are evicted first
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 3600
+
+
+def _instrumented(cache, kind):
+    # Each artifact is its own section in the timing panel and counts its own cache hits and misses
+    def decorate(function):
+        return profiling.timed(f'{kind}: {function.__name__}')(metrics.counted(cache, kind)(function))
+    return decorate
+
+
+cache_data = _instrumented(
+    st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False), 'data')
+# Figures are never mutated after they are built, so they are shared rather than copied per hit
+_cache_resource = _instrumented(
+    st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False), 'figure')
+
+
+def cache_figure(function):
+    # Every figure takes a ``theme`` keyword that is part of its cache key, so the light copy
+    # charts.themed serializes is made once per figure rather than on every rerun
+    @functools.wraps(function)
+    def build(*args, theme='dark', **kwargs):
+        return charts.themed(function(*args, **kwargs), theme)
+    return _cache_resource(build)
+
+
+# ========== CORE RESULTS ==========
+@cache_data
+def results(params):
+    return model.scalars(model.evaluate(params))
+
+
+@cache_data
+def monte_carlo(params, draws, enrollment_sd, tuition_sd, inflation_sd, salary_sd, bins=60):
+    # Only the summary and histogram are cached, never the raw draws
+    summary, net = risk.simulate(params, draws=draws, enrollment_sd=enrollment_sd, tuition_sd=tuition_sd,
+                                 inflation_sd=inflation_sd, salary_sd=salary_sd)
+    counts, bin_edges = np.histogram(net, bins=bins)
+    return summary, counts, bin_edges
+
+
+@cache_data
+def scenario_data(params):
+    return model.enrollment_scenarios(params)
+
+
+@cache_data
+def projection_data(params, assumptions=model.Projection()):
+    return model.project(params, **assumptions._asdict())
+
+
+@cache_data
+def tornado_data(params, change, year):
+    return model.tornado(params, change, year=year)
+
+
+@cache_data
+def sensitivity_grid(params, x_field, y_field, spread, points, metric):
+    x = model.grid_axis(getattr(params, x_field), spread, points, x_field)
+    y = model.grid_axis(getattr(params, y_field), spread, points, y_field)
+    # Rows follow the y axis, as the heatmap expects; float32 halves the chart payload
+    z = model.sensitivity_grid(params, {y_field: y, x_field: x}, metric).astype(np.float32)
+    return x, y, z
+
+
+@cache_data
+def goal_seek(params, field, target, metric):
+    return float(model.goal_seek(params, field, target, metric))
+
+
+@cache_data
+def staffing_optimum(params, min_margin, max_students_per_faculty, budget):
+    return model.optimize_staffing(params, min_margin, max_students_per_faculty, budget)
+
+
+@cache_data
+def staffing_step_index(ratios):
+    # Keyed on the ratios alone, so pay, price and range changes reuse it
+    return model.staffing_step_index(dict(zip(model.RATIO_FIELDS, ratios)))
+
+
+@cache_data
+def sweep_data(params, low, high):
+    step_index = staffing_step_index(tuple(getattr(params, r) for r in model.RATIO_FIELDS))
+    return model.enrollment_sweep(params, low, high, step_index)
+
+
+@cache_data
+def comparison_data(scenario_params, labels, known=()):
+    # known[i] is the results scenario i was saved with, or None; only the others are evaluated,
+    # together as one batch, so the usual comparison of saved scenarios evaluates nothing
+    known = list(known) or [None] * len(scenario_params)
+    missing = [i for i, r in enumerate(known) if r is None or not set(model.RESULT_NODES) <= r.keys()]
+    if missing:
+        out = model.evaluate(pd.DataFrame([scenario_params[i]._asdict() for i in missing]))
+        for row, i in enumerate(missing):
+            known[i] = model.scalars({k: v[row] for k, v in out.items()})
+    return tables.comparison(scenario_params, known, labels)
+
+
+# ========== TABLES ==========
+# Numeric frames; the dashboard and exports apply tables.COLUMN_FORMATS at display time
+@cache_data
+def expense_table(params):
+    return tables.expenses(params, results(params))
+
+
+@cache_data
+def staffing_table(params):
+    return tables.staffing(params, results(params))
+
+
+@cache_data
+def compensation_table(params):
+    return tables.compensation(params, results(params))
+
+
+@cache_data
+def cost_table(params):
+    return tables.cost(params, results(params))
+
+
+@cache_data
+def financial_statement(params):
+    return tables.financial_statement(params, results(params))
+
+
+# ========== EXPORTS ==========
+@cache_data
+def excel_export(params, saved=(), assumptions=model.Projection()):
+    # Built only when a download is requested, then served from cache for the same inputs
+    return export.excel_workbook(params, results(params), saved, assumptions)
+
+
+@cache_data
+def pdf_export(params, assumptions=model.Projection()):
+    # Chart images are also memoized on disk by report.chart_image, across processes and restarts
+    return report.pdf_report(params, results(params), assumptions=assumptions)
+
+
+# ========== FIGURES ==========
+@cache_figure
+def revenue_expense_figure(params):
+    r = results(params)
+    return charts.revenue_vs_expenses(r['total_revenue'], r['total_cost'])
+
+
+@cache_figure
+def expense_figure(params):
+    return charts.expense_distribution(expense_table(params))
+
+
+@cache_figure
+def headcount_figure(params):
+    return charts.headcount_distribution(staffing_table(params))
+
+
+@cache_figure
+def cost_figure(params):
+    return charts.cost_distribution(cost_table(params))
+
+
+@cache_figure
+def scenario_figure(params):
+    return charts.enrollment_impact(scenario_data(params))
+
+
+@cache_figure
+def sweep_figure(params, low, high):
+    r = results(params)
+    breakeven = r['breakeven_students'] if pd.notna(r['breakeven_students']) else None
+    return charts.enrollment_sweep(sweep_data(params, low, high), params.students, breakeven)
+
+
+@cache_figure
+def tuition_figure(params):
+    return charts.tuition_impact(list(model.TUITION_LABELS),
+                                 model.tuition_sensitivity(params).tolist())
+
+
+@cache_figure
+def cost_reduction_figure(params):
+    return charts.cost_reduction_impact(list(model.COST_LABELS),
+                                        model.cost_reduction_sensitivity(params).tolist())
+
+
+@cache_figure
+def tornado_figure(params, change, year):
+    return charts.tornado(tornado_data(params, change, year), change)
+
+
+@cache_figure
+def sensitivity_figure(params, x_field, y_field, spread, points, metric):
+    x, y, z = sensitivity_grid(params, x_field, y_field, spread, points, metric)
+    return charts.sensitivity_heatmap(x, y, z, model.INPUT_LABELS[x_field], model.INPUT_LABELS[y_field],
+                                      model.GRID_METRICS[metric],
+                                      current=(getattr(params, x_field), getattr(params, y_field)))
+
+
+@cache_figure
+def projection_figure(params, assumptions=model.Projection()):
+    return charts.projection_forecast(projection_data(params, assumptions),
+                                      model.projection_label(assumptions, params.inflation_rate))
+
+
+@cache_figure
+def monte_carlo_figure(params, draws, enrollment_sd, tuition_sd, inflation_sd, salary_sd):
+    summary, counts, bin_edges = monte_carlo(params, draws, enrollment_sd, tuition_sd, inflation_sd, salary_sd)
+    return charts.net_distribution(bin_edges, counts, summary)
+
+
+@cache_figure
+def comparison_net_figure(scenario_params, labels, known=()):
+    return charts.scenario_net_comparison(comparison_data(scenario_params, labels, known))
+
+
+@cache_figure
+def comparison_headcount_figure(scenario_params, labels, known=()):
+    return charts.scenario_headcount_comparison(comparison_data(scenario_params, labels, known), list(model.ROLE_LABELS))
@@ -0,0 +1,141 @@
+"""Headless batch evaluation of CECS scenarios.
+
+Reads a CSV or Parquet file whose columns are any of ``model.INPUT_FIELDS``
+(missing columns and blank cells fall back to the dashboard defaults), evaluates every row with
+the same engine as the dashboard and streams the results out chunk by chunk,
+so memory stays bounded no matter how many rows the sweep has.
+
+    python batch.py sweep.csv -o results.csv
+    python batch.py sweep.parquet -o results.parquet --chunksize 250000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import model
+
+DEFAULT_CHUNKSIZE = 100000
+
+OUTPUT_FIELDS = (
+    *model.HEADCOUNT_FIELDS,
+    'total_personnel',
+    'total_revenue',
+    'total_cost',
+    'net_result',
+    'margin',
+    'breakeven_students',
+    'target_students',
+)
+RISK_FIELDS = ('enrollment_risk', 'margin_risk', 'dependency_risk', 'personnel_risk')
+
+_RISK_LABELS = np.array(model.RISK_LEVELS)
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the input file as DataFrames of at most ``chunksize`` rows."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def evaluate_chunk(chunk):
+    """Evaluate one chunk of parameter rows; non-model columns are passed through."""
+    # Blank cells fall back to the dashboard defaults, like missing columns
+    inputs = {f: chunk[f].fillna(model.DEFAULTS[f]).to_numpy(dtype=float)
+              for f in model.INPUT_FIELDS if f in chunk}
+    if not inputs:
+        raise ValueError(f"no model input columns found; expected any of: {', '.join(model.INPUT_FIELDS)}")
+    inputs = model.resolve_inputs(inputs)
+    out = model.evaluate(inputs)
+
+    result = chunk.reset_index(drop=True)
+    for f in model.INPUT_FIELDS:
+        result[f] = inputs[f]
+    for f in OUTPUT_FIELDS:
+        result[f] = out[f]
+    for f in RISK_FIELDS:
+        result[f] = _RISK_LABELS[out[f]]
+    return result
+
+
+class _Writer:
+    """Appends result chunks to a CSV (file or stdout) or Parquet output."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path != '-' and _is_parquet(path)
+        self._writer = None
+        self._schema = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is not None:
+            # Later chunks may infer narrower dtypes (e.g. ints without NaN); keep the first schema
+            table = table.cast(self._schema)
+        else:
+            self._schema = table.schema
+            if self.parquet:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                sink = sys.stdout.buffer if self.path == '-' else self.path
+                self._writer = pa_csv.CSVWriter(sink, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Evaluate every row of ``input_path`` into ``output_path``; returns the row count."""
+    writer = _Writer(output_path)
+    rows = 0
+    try:
+        for chunk in read_chunks(input_path, chunksize):
+            writer.write(evaluate_chunk(chunk))
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate CECS financial scenarios in bulk.")
+    parser.add_argument("input", help="CSV or Parquet file of parameter rows")
+    parser.add_argument("-o", "--output", default="-",
+                        help="CSV or Parquet output file (default: CSV to stdout)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"rows evaluated per chunk (default: {DEFAULT_CHUNKSIZE:,})")
+    args = parser.parse_args(argv)
+
+    if args.chunksize <= 0:
+        parser.error("--chunksize must be positive")
+
+    start = time.perf_counter()
+    try:
+        rows = run(args.input, args.output, args.chunksize)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {rows:,} scenarios in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""Performance benchmarks for the CECS model and the dashboard rerun path.
+
+Times the model calculations (a single evaluation, the enrollment scenarios,
+projections, batch sweeps of 1k/100k/1M rows) and full headless dashboard
+reruns driven through Streamlit's AppTest harness, and cold start: the import
+of the analytics stack and the first paint of the login screen and the
+dashboard, each in a fresh interpreter. Each benchmark reports wall time over
+several repeats plus the memory one call allocates, as traced by tracemalloc,
+and the results are written as JSON so runs can be compared:
+
+    python bench.py -o bench.json
+    python bench.py -o after.json --compare bench.json
+    python bench.py --select model batch.1k --repeat 10
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import batch
+import model
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Calc.py')
+DEFAULT_REPEAT = 5
+# Calls per repeat grow until one repeat takes at least this long, as timeit does
+MIN_REPEAT_SECONDS = 0.2
+BATCH_SIZES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+SEED = 20240101
+
+# ``prepare`` does the untimed setup and returns the callable to time;
+# ``repeat`` overrides DEFAULT_REPEAT for slow benchmarks. A ``self_timed``
+# callable does its work in a subprocess and returns the seconds the timed part took.
+Benchmark = namedtuple('Benchmark', ('name', 'prepare', 'repeat', 'self_timed'), defaults=(None, False))
+
+
+# ========== MODEL ==========
+def _single_evaluation():
+    params = model.Parameters()
+    return lambda: model.evaluate(params)
+
+
+def _recalculation():
+    # Alternating one pay input, as a user dragging a single slider does
+    recalculation = model.Recalculation().update()
+    pays = itertools.cycle([12000, 12500])
+    return lambda: recalculation.update({'tutor_pay': next(pays)}).results()
+
+
+def _enrollment_scenarios():
+    params = model.Parameters()
+    return lambda: model.enrollment_scenarios(params)
+
+
+def _projection(**assumptions):
+    def prepare():
+        params = model.Parameters()
+        return lambda: model.project(params, **assumptions)
+    return prepare
+
+
+def _staffing_optimizer():
+    params = model.Parameters()
+    return lambda: model.optimize_staffing(params)
+
+
+def sweep_frame(rows, seed=SEED):
+    """``rows`` random parameter rows around the dashboard defaults, as a batch.py input chunk."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({f: model.DEFAULTS[f] * rng.uniform(0.5, 1.5, rows) for f in model.INPUT_FIELDS})
+    for f in model.INTEGER_FIELDS:
+        frame[f] = frame[f].round()
+    return frame
+
+
+def _batch(rows):
+    def prepare():
+        chunk = sweep_frame(rows)
+        return lambda: batch.evaluate_chunk(chunk)
+    return prepare
+
+
+# ========== DASHBOARD ==========
+def _quiet_streamlit():
+    # Bare-mode, config and deprecation warnings would interleave with the results. Parsing
+    # the config resets the log level to the configured one, so it is set on both sides.
+    from streamlit import config, logger
+
+    logger.set_log_level('error')
+    config.get_config_options()
+    config.set_option('logger.level', 'error')
+    logger.set_log_level('error')
+
+
+def _app():
+    # The logged-in dashboard under AppTest, before its first run
+    from streamlit.testing.v1 import AppTest
+
+    _quiet_streamlit()
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    app.session_state['logged_in'] = True
+    return app
+
+
+def _dashboard(tab=None, change_input=True):
+    """A full script rerun of the dashboard, with the tab at index ``tab`` open."""
+    def prepare():
+        app = _app()
+        app.run()
+        if tab is not None:
+            app.session_state['active_tab'] = app.tabs[tab].label
+            app.run()
+        enrollment = next(w for w in app.number_input if w.label == model.INPUT_LABELS['students'])
+        students = iter(range(model.DEFAULTS['students'] + 10, 10 ** 9, 10))
+
+        def rerun():
+            if change_input:
+                # A new value every call, so each rerun misses the caches as a real edit would
+                enrollment.set_value(next(students))
+            app.run()
+            if app.exception:
+                raise RuntimeError(app.exception[0].value)
+        return rerun
+    return prepare
+
+
+def _dashboard_first_run():
+    import streamlit as st
+
+    def first_run():
+        # A fresh session on empty caches
+        app = _app()
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        app.run()
+    return first_run
+
+
+# ========== STARTUP ==========
+# Run in a fresh interpreter, as in a new server process. The server has loaded Streamlit
+# before the app script first runs, so it is imported outside the timed part.
+_STARTUP_SCRIPT = """
+import sys, time
+sys.path.insert(0, {directory!r})
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=120)
+{setup}
+start = time.perf_counter()
+{timed}
+print(time.perf_counter() - start)
+"""
+STARTUP_PROBES = {
+    # Everything the dashboard needs past the login screen
+    'import_analytics': ('', 'import artifacts'),
+    'login_first_paint': ('', 'app.run()'),
+    'dashboard_first_paint': ("app.session_state['logged_in'] = True", 'app.run()'),
+    # Logging in once the login screen has been up long enough for any background preloading
+    'dashboard_after_login': ("app.run()\n"
+                              "import threading\n"
+                              "[t.join() for t in threading.enumerate() if t.name == 'cecs-prewarm']\n"
+                              "app.session_state['logged_in'] = True", 'app.run()'),
+}
+
+
+def _startup(probe):
+    def prepare():
+        setup, timed = STARTUP_PROBES[probe]
+        script = _STARTUP_SCRIPT.format(directory=os.path.dirname(APP_PATH), app=APP_PATH, setup=setup, timed=timed)
+
+        def cold_start():
+            # Streamlit's bare-mode warnings go to stderr; only the timing is read back
+            completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+            return float(completed.stdout.split()[-1])
+        return cold_start
+    return prepare
+
+
+BENCHMARKS = (
+    Benchmark('model.evaluate', _single_evaluation),
+    Benchmark('model.recalculation', _recalculation),
+    Benchmark('model.enrollment_scenarios', _enrollment_scenarios),
+    Benchmark('model.project.5y', _projection()),
+    Benchmark('model.project.50y_cohort', _projection(years=50, enrollment='cohort')),
+    Benchmark('model.optimize_staffing', _staffing_optimizer),
+    *(Benchmark(f'batch.{label}', _batch(rows), 3 if rows >= 1000000 else None)
+      for label, rows in BATCH_SIZES.items()),
+    Benchmark('dashboard.first_run', _dashboard_first_run, 3),
+    Benchmark('dashboard.rerun_unchanged', _dashboard(change_input=False)),
+    Benchmark('dashboard.rerun.executive', _dashboard(0)),
+    Benchmark('dashboard.rerun.staffing', _dashboard(1)),
+    Benchmark('dashboard.rerun.financial', _dashboard(2)),
+    Benchmark('dashboard.rerun.analytics', _dashboard(3)),
+    Benchmark('dashboard.rerun.comparison', _dashboard(4)),
+    *(Benchmark(f'startup.{probe}', _startup(probe), 3, True) for probe in STARTUP_PROBES),
+)
+
+
+# ========== MEASUREMENT ==========
+def measure_self_timed(function, repeat=DEFAULT_REPEAT):
+    """The seconds ``function`` reports over ``repeat`` calls; its memory is not in this process."""
+    times = [function() for _ in range(repeat)]
+    return {
+        'calls_per_repeat': 1,
+        'repeats': repeat,
+        'wall_ms': {
+            'min': min(times) * 1e3,
+            'median': statistics.median(times) * 1e3,
+            'mean': statistics.fmean(times) * 1e3,
+            'stdev': statistics.stdev(times) * 1e3 if len(times) > 1 else 0.0,
+        },
+        'peak_bytes': None,
+        'retained_bytes': None,
+        'retained_blocks': None,
+    }
+
+
+def measure(function, repeat=DEFAULT_REPEAT):
+    """Wall time per call over ``repeat`` repeats, then one traced call for memory."""
+    function()  # warm-up: imports, caches and lazy setup are not what is being timed
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_SECONDS or number >= 10 ** 6:
+            break
+        number *= 10
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number)
+
+    # Memory is traced on a separate call; tracing slows allocation-heavy code several fold
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    baseline, _ = tracemalloc.get_traced_memory()
+    function()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(s.count_diff for s in after.compare_to(before, 'filename'))
+
+    return {
+        'calls_per_repeat': number,
+        'repeats': repeat,
+        'wall_ms': {
+            'min': min(times) * 1e3,
+            'median': statistics.median(times) * 1e3,
+            'mean': statistics.fmean(times) * 1e3,
+            'stdev': statistics.stdev(times) * 1e3 if len(times) > 1 else 0.0,
+        },
+        'peak_bytes': peak - baseline,
+        'retained_bytes': current - baseline,
+        'retained_blocks': retained_blocks,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP_PATH), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import plotly
+    import streamlit
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'streamlit': streamlit.__version__,
+    }
+
+
+def run(select=None, repeat=DEFAULT_REPEAT, log=sys.stderr):
+    """Run the benchmarks whose names start with any of ``select`` (all when empty)."""
+    chosen = [b for b in BENCHMARKS if not select or any(b.name.startswith(s) for s in select)]
+    if not chosen:
+        raise ValueError(f"no benchmark matches {', '.join(select)}")
+    results = {}
+    for benchmark in chosen:
+        function = benchmark.prepare()
+        result = (measure_self_timed if benchmark.self_timed else measure)(function, benchmark.repeat or repeat)
+        results[benchmark.name] = result
+        peak = f"  peak {result['peak_bytes'] / 2 ** 20:9.2f} MiB" if result['peak_bytes'] is not None else ''
+        print(f"{benchmark.name:32} {result['wall_ms']['median']:12.3f} ms{peak}", file=log)
+    return {
+        'environment': environment(),
+        'benchmarks': results,
+        # Whole process, including everything measured above
+        'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def compare(current, baseline, log=sys.stderr):
+    """Print the median wall time and peak memory of ``current`` relative to ``baseline``."""
+    print(f"{'benchmark':32} {'median ms':>12} {'vs base':>8} {'peak MiB':>10} {'vs base':>8}", file=log)
+    for name, result in current['benchmarks'].items():
+        base = baseline['benchmarks'].get(name)
+        median, peak = result['wall_ms']['median'], result['peak_bytes']
+        time_change = f"{median / base['wall_ms']['median']:7.2f}x" if base else '       -'
+        peak_change = f"{peak / base['peak_bytes']:7.2f}x" if peak is not None and base and base['peak_bytes'] else '       -'
+        peak_mib = f"{peak / 2 ** 20:10.2f}" if peak is not None else '         -'
+        print(f"{name:32} {median:12.3f} {time_change} {peak_mib} {peak_change}", file=log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CECS model and dashboard.")
+    parser.add_argument("-o", "--output", default=None, help="JSON file to write the results to")
+    parser.add_argument("--select", nargs="+", default=None, metavar="PREFIX",
+                        help="only benchmarks whose names start with these, e.g. model batch.1k")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"timed repeats per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--compare", default=None, metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(b.name for b in BENCHMARKS))
+        return
+    if args.repeat <= 0:
+        parser.error("--repeat must be positive")
+
+    try:
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        results = run(args.select, args.repeat)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
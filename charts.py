@@ -0,0 +1,509 @@
+"""Plotly figure builders for the CECS dashboard.
+
+Each function turns already-computed model data into a figure; none of them
+touch Streamlit, so they can be cached or rendered outside the app.
+
+Shared styling lives in the registered ``cecs`` template, and ``themed``
+redraws a figure in the light ``cecs_light`` one. Each figure's
+skeleton (traces and layout with all styling, no data) is built and validated
+once per process by ``FIGURES``; a builder only patches the data into a copy
+of it. Pass ``theme=None`` to ``st.plotly_chart`` so Streamlit's own theme
+does not restyle the template.
+"""
+
+import itertools
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Points sent to the browser for long curves such as the enrollment sweep
+MAX_PLOT_POINTS = 1500
+
+TEMPLATE = 'cecs'
+LIGHT_TEMPLATE = 'cecs_light'
+TEXT_COLOR = '#e0e0e0'
+GRID_COLOR = '#4a4a4a'
+# Reference lines drawn over the plot area, readable on either template
+REFERENCE_COLOR = '#888888'
+
+
+def _template(paper_color, text_color, grid_color):
+    return go.layout.Template(
+        layout=dict(
+            paper_bgcolor=paper_color,
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Inter', color=text_color),
+            legend=dict(font=dict(color=text_color)),
+            colorway=['#FF8200', '#28a745', '#dc3545', '#ffc107', '#17a2b8', '#6f42c1'],
+            xaxis=dict(gridcolor=grid_color, zerolinecolor=grid_color, automargin=True),
+            yaxis=dict(gridcolor=grid_color, zerolinecolor=grid_color, automargin=True),
+        ),
+        data=dict(
+            bar=[go.Bar(textfont=dict(color=text_color))],
+            scatter=[go.Scatter(textfont=dict(color=text_color))],
+        ),
+    )
+
+
+# Twins of the dark and light palettes in static/cecs.css
+pio.templates[TEMPLATE] = _template('rgba(44, 44, 44, 1)', TEXT_COLOR, GRID_COLOR)
+pio.templates[LIGHT_TEMPLATE] = _template('#ffffff', '#262626', '#d0d0d0')
+THEME_TEMPLATES = {'dark': TEMPLATE, 'light': LIGHT_TEMPLATE}
+
+
+def _patched(base, patch):
+    # Copy of ``base`` with ``patch`` merged in; nested dicts merge, anything else is replaced
+    if not patch:
+        return base
+    merged = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            value = _patched(base[key], value)
+        merged[key] = value
+    return merged
+
+
+class FigureFactory:
+    """Figure skeletons built once per process and patched with data per call.
+
+    Constructing a Plotly figure validates every property, which costs far
+    more than the data; a skeleton is validated once and each figure after
+    that is a shallow copy with the data merged in, wrapped without
+    revalidation. ``key`` identifies a skeleton and must include anything
+    that changes its structure, such as the number of traces.
+    """
+
+    def __init__(self):
+        self._skeletons = {}
+
+    def figure(self, key, skeleton, traces=(), layout=None):
+        """``skeleton()`` builds the styled, data-free figure; ``traces`` are per-trace patches in order."""
+        base = self._skeletons.get(key)
+        if base is None:
+            base = self._skeletons[key] = skeleton().update_layout(template=TEMPLATE).to_plotly_json()
+        data = [_patched(trace, patch) for trace, patch in itertools.zip_longest(base['data'], traces)]
+        return go.Figure({'data': data, 'layout': _patched(base['layout'], layout)}, _validate=False)
+
+
+FIGURES = FigureFactory()
+
+
+def themed(figure, theme):
+    """``figure`` in the template of the dashboard ``theme``, 'dark' or 'light'.
+
+    Figures are built with the dark template; the light view is a copy with the
+    template swapped, cached by artifacts.cache_figure per figure and theme.
+    """
+    template = THEME_TEMPLATES[theme]
+    if template == TEMPLATE:
+        return figure
+    plotly_json = figure.to_dict()
+    layout = dict(plotly_json['layout'], template=pio.templates[template].to_plotly_json())
+    return go.Figure({'data': plotly_json['data'], 'layout': layout}, _validate=False)
+
+
+def _vline(x, color, width, dash=None, label=None):
+    # Vertical reference line across the plot, as a (shape, annotations) pair for a layout patch
+    shape = dict(type='line', xref='x', yref='paper', x0=x, x1=x, y0=0, y1=1,
+                 line=dict(color=color, width=width, dash=dash))
+    annotations = [dict(x=x, xref='x', y=1, yref='paper', text=label, showarrow=False, xanchor='left',
+                        yanchor='top')] if label else []
+    return shape, annotations
+
+
+def _money_labels(values):
+    return [f'${v:,.0f}' for v in values]
+
+
+def lttb_indices(x, y, threshold=MAX_PLOT_POINTS):
+    """Indices of a Largest-Triangle-Three-Buckets downsample of (x, y).
+
+    Keeps the first and last points plus, per bucket, the point spanning the
+    largest triangle with its neighbours, so steps and peaks survive.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < edges.size else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+# ========== EXECUTIVE DASHBOARD ==========
+def revenue_vs_expenses(total_revenue, total_cost):
+    def skeleton():
+        fig_comparison = go.Figure()
+        for name, color in (('Revenue', '#28a745'), ('Expenses', '#dc3545')):
+            fig_comparison.add_trace(go.Bar(
+                name=name,
+                x=['Financial Overview'],
+                marker_color=color,
+                textposition='outside',
+                textfont=dict(size=14)
+            ))
+        fig_comparison.update_layout(
+            barmode='group',
+            height=400,
+            showlegend=True,
+            font=dict(size=12),
+            margin=dict(t=20, b=20, l=20, r=20)
+        )
+        return fig_comparison
+
+    return FIGURES.figure('revenue_vs_expenses', skeleton, [
+        dict(y=[total_revenue], text=_money_labels([total_revenue])),
+        dict(y=[total_cost], text=_money_labels([total_cost])),
+    ])
+
+
+def expense_distribution(expense_data):
+    def skeleton():
+        fig_pie = go.Figure(go.Pie(
+            hole=0.4,
+            textposition='inside',
+            textinfo='percent+label',
+            textfont=dict(size=11, color='white'),
+            hovertemplate='%{label}<br>$%{value:,.0f}<extra></extra>'
+        ))
+        fig_pie.update_layout(
+            height=400,
+            showlegend=False,
+            piecolorway=px.colors.sequential.Oranges_r,
+            margin=dict(t=20, b=20, l=20, r=20)
+        )
+        return fig_pie
+
+    return FIGURES.figure('expense_distribution', skeleton, [
+        dict(labels=expense_data['Category'].tolist(), values=expense_data['Amount'].to_numpy()),
+    ])
+
+
+# ========== STAFFING ANALYSIS ==========
+def _ranked_bar(value_column, colorscale, yaxis_title, text_template):
+    def skeleton():
+        fig_bar = go.Figure(go.Bar(
+            marker=dict(colorscale=colorscale, showscale=True, colorbar=dict(title=dict(text=value_column))),
+            texttemplate=text_template,
+            textposition='outside',
+            textfont=dict(size=12),
+            hovertemplate='%{x}<br>' + value_column + ': ' + text_template.replace('text', 'y') + '<extra></extra>'
+        ))
+        fig_bar.update_layout(
+            height=400,
+            showlegend=False,
+            xaxis_title='',
+            yaxis_title=yaxis_title
+        )
+        return fig_bar
+    return skeleton
+
+
+def headcount_distribution(staffing_df):
+    counts = staffing_df['Count'].to_numpy()
+    return FIGURES.figure('headcount_distribution',
+                          _ranked_bar('Count', 'Oranges', 'Number of Personnel', '%{text:,}'),
+                          [dict(x=staffing_df['Position'].tolist(), y=counts, text=counts, marker=dict(color=counts))])
+
+
+def cost_distribution(cost_df):
+    costs = cost_df['Total Cost'].to_numpy()
+    return FIGURES.figure('cost_distribution',
+                          _ranked_bar('Total Cost', 'Reds', 'Total Annual Cost', '$%{text:,.0f}'),
+                          [dict(x=cost_df['Position'].tolist(), y=costs, text=costs, marker=dict(color=costs))])
+
+
+# ========== ADVANCED ANALYTICS ==========
+def enrollment_impact(scenario_data):
+    series = (('Revenue', 'Revenue', '#28a745', None, 'top center'),
+              ('Expenses', 'Expenses', '#dc3545', None, 'bottom center'),
+              ('Net Position', 'Net Position', '#FF8200', 'dash', 'middle right'))
+
+    def skeleton():
+        fig_scenarios = go.Figure()
+        for _, name, color, dash, text_position in series:
+            fig_scenarios.add_trace(go.Scatter(
+                mode='lines+markers',
+                name=name,
+                line=dict(color=color, width=3, dash=dash),
+                marker=dict(size=10),
+                textposition=text_position
+            ))
+        fig_scenarios.update_layout(
+            title='Financial Impact of Enrollment Changes',
+            xaxis_title='Enrollment Scenario',
+            yaxis_title='Amount ($)',
+            height=500,
+            hovermode='x unified'
+        )
+        return fig_scenarios
+
+    labels = scenario_data['Scenario'].tolist()
+    return FIGURES.figure('enrollment_impact', skeleton, [
+        dict(x=labels, y=scenario_data[column].to_numpy(), text=_money_labels(scenario_data[column]))
+        for column, *_ in series
+    ])
+
+
+def enrollment_sweep(sweep_data, students, breakeven_students, max_points=MAX_PLOT_POINTS):
+    series = (('Revenue', '#28a745', None), ('Expenses', '#dc3545', None), ('Net Position', '#FF8200', 'dash'))
+
+    def skeleton():
+        fig_sweep = go.Figure()
+        for name, color, dash in series:
+            fig_sweep.add_trace(go.Scatter(
+                mode='lines',
+                name=name,
+                line=dict(color=color, width=2, dash=dash),
+                hovertemplate='%{x:,} students<br>$%{y:,.0f}<extra>' + name + '</extra>'
+            ))
+        fig_sweep.update_layout(
+            xaxis_title='Enrollment',
+            yaxis_title='Amount ($)',
+            height=450,
+            hovermode='x unified'
+        )
+        return fig_sweep
+
+    # Downsample on the sawtooth net curve and reuse the same points for every trace
+    keep = lttb_indices(sweep_data['Students'], sweep_data['Net Position'], max_points)
+    sampled = sweep_data.iloc[keep]
+    x = sampled['Students'].to_numpy()
+
+    shapes = [dict(type='line', xref='paper', yref='y', x0=0, x1=1, y0=0, y1=0,
+                   line=dict(color='#888888', width=1))]
+    annotations = []
+    low, high = sweep_data['Students'].iloc[0], sweep_data['Students'].iloc[-1]
+    markers = [(students, REFERENCE_COLOR, 1, 'dot', 'Current'), (breakeven_students, '#ffc107', 2, 'dash', 'Break-even')]
+    for value, color, width, dash, label in markers:
+        if value is not None and low <= value <= high:
+            shape, notes = _vline(value, color, width, dash, label)
+            shapes.append(shape)
+            annotations += notes
+
+    return FIGURES.figure('enrollment_sweep', skeleton, [
+        dict(x=x, y=sampled[name].to_numpy()) for name, *_ in series
+    ], layout=dict(title=dict(text=f'Financial Position from {low:,} to {high:,} Students'),
+                   shapes=shapes, annotations=annotations))
+
+
+def _net_bars(title, x_title):
+    def skeleton():
+        fig_bars = go.Figure(go.Bar(textposition='outside'))
+        fig_bars.update_layout(
+            title=title,
+            xaxis_title=x_title,
+            yaxis_title='Net Position ($)',
+            height=350
+        )
+        return fig_bars
+    return skeleton
+
+
+def tuition_impact(tuition_labels, tuition_net):
+    return FIGURES.figure('tuition_impact',
+                          _net_bars('Impact of Tuition Changes on Net Position', 'Tuition Adjustment'),
+                          [dict(x=list(tuition_labels), y=list(tuition_net), text=_money_labels(tuition_net),
+                                marker=dict(color=['#dc3545' if n < 0 else '#28a745' for n in tuition_net]))])
+
+
+def cost_reduction_impact(cost_labels, cost_net):
+    return FIGURES.figure('cost_reduction_impact',
+                          _net_bars('Impact of Cost Reduction on Net Position', 'Cost Reduction'),
+                          [dict(x=list(cost_labels), y=list(cost_net), text=_money_labels(cost_net),
+                                marker=dict(color='#FF8200'))])
+
+
+def tornado(tornado_data, change):
+    def skeleton():
+        fig_tornado = go.Figure()
+        for color in ('#dc3545', '#28a745'):
+            fig_tornado.add_trace(go.Bar(orientation='h', marker_color=color))
+        fig_tornado.update_layout(
+            title='What Moves Net Position Most',
+            xaxis_title='Net Position ($)',
+            barmode='overlay',
+            legend=dict(orientation='h', y=-0.1)
+        )
+        return fig_tornado
+
+    # Largest swing on top
+    data = tornado_data.iloc[::-1]
+    labels = data['Input'].tolist()
+    base = float(data['Base Net'].iloc[0])
+
+    traces = []
+    for column, name in (('Net at Low', f'-{change * 100:.0f}%'), ('Net at High', f'+{change * 100:.0f}%')):
+        delta = data[column].to_numpy() - base
+        traces.append(dict(
+            y=labels,
+            x=delta,
+            base=base,
+            name=f'Input {name}',
+            customdata=delta,
+            hovertemplate='%{y}<br>Net: $%{x:,.0f}<br>Change: $%{customdata:+,.0f}<extra>' + name + '</extra>'
+        ))
+
+    shape, _ = _vline(base, REFERENCE_COLOR, 1)
+    return FIGURES.figure('tornado', skeleton, traces,
+                          layout=dict(height=max(400, 28 * len(labels)), shapes=[shape]))
+
+
+def sensitivity_heatmap(x_values, y_values, z, x_label, y_label, metric_label, current=None):
+    z = np.asarray(z)
+    in_dollars = '$' in metric_label
+    value_format = '$%{z:,.0f}' if in_dollars else '%{z:,.2f}'
+    crosses_zero = bool(z.min() < 0 < z.max())
+
+    def skeleton():
+        fig_heatmap = go.Figure(go.Heatmap(
+            colorscale='RdYlGn'
+        ))
+        if crosses_zero:
+            # Break-even frontier
+            fig_heatmap.add_trace(go.Contour(
+                contours=dict(start=0, end=0, size=1, coloring='none'),
+                line=dict(color=TEXT_COLOR, width=2, dash='dash'),
+                showscale=False,
+                hoverinfo='skip'
+            ))
+        if current is not None:
+            fig_heatmap.add_trace(go.Scatter(
+                mode='markers',
+                marker=dict(color='#FF8200', size=12, symbol='x', line=dict(color='white', width=1)),
+                name='Current',
+                hovertemplate='Current<extra></extra>'
+            ))
+        fig_heatmap.update_layout(
+            height=500,
+            showlegend=False
+        )
+        return fig_heatmap
+
+    grid = dict(x=np.asarray(x_values), y=np.asarray(y_values), z=z)
+    traces = [dict(grid, zmid=0 if crosses_zero else None, colorbar=dict(title=dict(text=metric_label)),
+                   hovertemplate=f'{x_label}: %{{x:,}}<br>{y_label}: %{{y:,}}<br>{metric_label}: {value_format}'
+                                 '<extra></extra>')]
+    if crosses_zero:
+        traces.append(grid)
+    if current is not None:
+        traces.append(dict(x=[current[0]], y=[current[1]]))
+
+    return FIGURES.figure(('sensitivity_heatmap', crosses_zero, current is not None), skeleton, traces,
+                          layout=dict(title=dict(text=f'{metric_label} by {x_label} and {y_label}'),
+                                      xaxis=dict(title=dict(text=x_label)), yaxis=dict(title=dict(text=y_label))))
+
+
+def projection_forecast(projection_data, description):
+    def skeleton():
+        fig_projection = go.Figure()
+        for name, color, fill in (('Projected Revenue', '#28a745', 'tonexty'),
+                                  ('Projected Expenses', '#dc3545', 'tozeroy')):
+            fig_projection.add_trace(go.Scatter(
+                mode='lines+markers',
+                name=name,
+                line=dict(color=color, width=3),
+                marker=dict(size=12),
+                fill=fill
+            ))
+        fig_projection.update_layout(
+            xaxis_title='Year',
+            yaxis_title='Amount ($)',
+            height=450,
+            hovermode='x unified'
+        )
+        return fig_projection
+
+    years = projection_data['Year'].tolist()
+    title = f'{len(years)}-Year Financial Forecast ({description})'
+    return FIGURES.figure('projection_forecast', skeleton, [
+        dict(x=years, y=projection_data['Revenue'].to_numpy()),
+        dict(x=years, y=projection_data['Expenses'].to_numpy()),
+    ], layout=dict(title=dict(text=title)))
+
+
+def net_distribution(bin_edges, counts, summary):
+    def skeleton():
+        fig_distribution = go.Figure(go.Bar(hovertemplate='Net: $%{x:,.0f}<br>Draws: %{y:,}<extra></extra>'))
+        fig_distribution.update_layout(
+            xaxis_title='Net Position ($)',
+            yaxis_title='Draws',
+            height=400,
+            bargap=0,
+            showlegend=False
+        )
+        return fig_distribution
+
+    centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    var_line, var_note = _vline(summary['var'], '#ffc107', 2, 'dash', f"VaR {summary['confidence'] * 100:.0f}%")
+    zero_line, _ = _vline(0, '#dc3545', 2)
+    return FIGURES.figure('net_distribution', skeleton, [
+        dict(x=centers, y=np.asarray(counts), marker=dict(color=['#dc3545' if c < 0 else '#28a745' for c in centers]))
+    ], layout=dict(title=dict(text=f"Simulated Net Position ({summary['draws']:,} draws)"),
+                   shapes=[var_line, zero_line], annotations=var_note))
+
+
+# ========== SCENARIO COMPARISON ==========
+def scenario_net_comparison(comparison_data):
+    def skeleton():
+        fig_comparison = go.Figure()
+        fig_comparison.add_trace(go.Bar(name='Net Position', textposition='outside'))
+        fig_comparison.add_trace(go.Scatter(
+            mode='lines+markers',
+            name='Margin %',
+            yaxis='y2',
+            line=dict(color='#FF8200', width=3),
+            marker=dict(size=10),
+            hovertemplate='%{x}<br>Margin: %{y:.2f}%<extra></extra>'
+        ))
+        fig_comparison.update_layout(
+            title='Net Position and Margin by Scenario',
+            yaxis=dict(title='Net Position ($)'),
+            yaxis2=dict(title='Margin (%)', overlaying='y', side='right', showgrid=False),
+            height=450,
+            hovermode='x unified',
+            legend=dict(orientation='h', y=-0.15)
+        )
+        return fig_comparison
+
+    labels = comparison_data['Scenario'].tolist()
+    net = comparison_data['Net Position'].to_numpy()
+    return FIGURES.figure('scenario_net_comparison', skeleton, [
+        dict(x=labels, y=net, text=_money_labels(net),
+             marker=dict(color=['#dc3545' if n < 0 else '#28a745' for n in net])),
+        dict(x=labels, y=comparison_data['Margin %'].to_numpy()),
+    ])
+
+
+def scenario_headcount_comparison(comparison_data, role_labels):
+    def skeleton():
+        colors = px.colors.sequential.Oranges_r
+        fig_headcount = go.Figure()
+        for i, role in enumerate(role_labels):
+            fig_headcount.add_trace(go.Bar(name=role, marker_color=colors[i % len(colors)]))
+        fig_headcount.update_layout(
+            title='Headcount by Scenario',
+            barmode='stack',
+            yaxis_title='Number of Personnel',
+            height=450
+        )
+        return fig_headcount
+
+    labels = comparison_data['Scenario'].tolist()
+    return FIGURES.figure(('scenario_headcount_comparison', *role_labels), skeleton, [
+        dict(x=labels, y=comparison_data[role].to_numpy()) for role in role_labels
+    ])
@@ -0,0 +1,77 @@
+"""Excel export of the dashboard tables.
+
+The workbook is written with XlsxWriter in constant_memory mode, which
+flushes each row to disk as soon as the next one starts, so memory stays flat
+however many saved scenarios go in. Numbers are written as numeric cells with
+an Excel display format, never as preformatted strings.
+"""
+
+import io
+
+import pandas as pd
+import xlsxwriter
+
+import model
+import tables
+
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Excel equivalents of the dashboard's display formats; percentages are stored
+# in percent units (12.5 = 12.5%)
+EXCEL_FORMATS = {
+    tables.MONEY: '$#,##0',
+    tables.COUNT: '#,##0',
+    tables.RATIO: '"1:"0',
+    tables.PERCENT: '0.0"%"',
+    tables.MARGIN: '0.00"%"',
+    tables.DECIMAL: '0.0',
+}
+
+
+def _write_sheet(workbook, name, frame, formats, header_format):
+    sheet = workbook.add_worksheet(name)
+    kinds = [tables.COLUMN_FORMATS.get(c) for c in frame.columns]
+    for col, column in enumerate(frame.columns):
+        width = max(len(str(column)), 12) + 2
+        sheet.set_column(col, col, width, formats[kinds[col]] if kinds[col] else None)
+
+    # constant_memory requires rows to be written top to bottom
+    sheet.write_row(0, 0, list(frame.columns), header_format)
+    for row, values in enumerate(frame.itertuples(index=False, name=None), start=1):
+        for col, value in enumerate(values):
+            if value is None or (isinstance(value, float) and value != value):
+                continue
+            if kinds[col] and not isinstance(value, str):
+                sheet.write_number(row, col, value, formats[kinds[col]])
+            else:
+                sheet.write(row, col, value)
+    sheet.freeze_panes(1, 0)
+
+
+def excel_workbook(params, results=None, saved=(), assumptions=model.Projection()):
+    """Return an .xlsx workbook (bytes) of every dashboard table for ``params``.
+
+    ``saved`` is an iterable of ``scenarios.Scenario`` to add on their own sheet;
+    ``assumptions`` is the ``model.Projection`` behind the Projections sheet.
+    """
+    results = results or model.scalars(model.evaluate(params))
+    sheets = {
+        'Inputs': tables.inputs(params),
+        'Financial Statement': tables.financial_statement(params, results),
+        'Staffing': tables.staffing(params, results),
+        'Compensation': tables.compensation(params, results),
+        'Enrollment Scenarios': model.enrollment_scenarios(params),
+        'Projections': model.project(params, **assumptions._asdict()),
+    }
+    saved = list(saved)
+    if saved:
+        sheets['Saved Scenarios'] = tables.saved_scenarios(saved)
+
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {'constant_memory': True})
+    formats = {kind: workbook.add_format({'num_format': fmt}) for kind, fmt in EXCEL_FORMATS.items()}
+    header_format = workbook.add_format({'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#FF8200'})
+    for name, frame in sheets.items():
+        _write_sheet(workbook, name, pd.DataFrame(frame), formats, header_format)
+    workbook.close()
+    return buffer.getvalue()
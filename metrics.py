@@ -0,0 +1,280 @@
+"""Operational metrics for the CECS dashboard, in the Prometheus text format.
+
+Collected per server process, across every session: rerun latency as a
+histogram per tab, hits and misses of each cached artifact, and the live
+sessions holding a scenario store with the memory their session state uses.
+Collection is always on and costs a few counter updates per rerun. Nothing is
+exported unless configured from the environment:
+
+    CECS_METRICS_PORT=9464      serve http://127.0.0.1:9464/metrics
+    CECS_METRICS_FILE=cecs.prom write the metrics to this file ...
+    CECS_METRICS_INTERVAL=15    ... every this many seconds
+"""
+
+import functools
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORT_ENV = 'CECS_METRICS_PORT'
+FILE_ENV = 'CECS_METRICS_FILE'
+INTERVAL_ENV = 'CECS_METRICS_INTERVAL'
+DEFAULT_INTERVAL_SECONDS = 15
+HOST = '127.0.0.1'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds in seconds; a rerun slower than the last lands only in +Inf
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for v in values)
+    return '{' + ','.join(f'{n}="{v}"' for n, v in zip(names, escaped)) + '}'
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield self.name, _labels(self.labels, labels), value
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self.values = {}
+
+    def observe(self, value, *labels):
+        with _lock:
+            counts, total = self.values.get(labels, ([0] * (len(self.buckets) + 1), 0.0))
+            # Index of the first bucket the value fits in; the last slot is +Inf
+            counts[next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))] += 1
+            self.values[labels] = counts, total + value
+
+    def samples(self):
+        names = (*self.labels, 'le')
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', _labels(names, (*labels, bound)), cumulative
+            yield f'{self.name}_sum', _labels(self.labels, labels), total
+            yield f'{self.name}_count', _labels(self.labels, labels), cumulative
+
+
+RERUN_SECONDS = Histogram('cecs_rerun_duration_seconds',
+                          "Dashboard rerun latency by open tab; scope is 'app' for a full script "
+                          "rerun, 'fragment' for a rerun of that tab alone",
+                          ('tab', 'scope'))
+CACHE_LOOKUPS = Counter('cecs_artifact_cache_lookups_total', 'Calls of a cached table or figure',
+                        ('kind', 'artifact'))
+CACHE_MISSES = Counter('cecs_artifact_cache_misses_total', 'Calls of a cached table or figure that built it',
+                       ('kind', 'artifact'))
+
+
+# ========== RERUNS ==========
+class Rerun:
+    tab = None
+
+
+@contextmanager
+def rerun(scope='app'):
+    """Observe the block as one rerun under the ``tab`` set on the yielded object.
+
+    A rerun cut short (st.rerun, st.stop) or without a tab is not observed.
+    """
+    run = Rerun()
+    start = time.perf_counter()
+    yield run
+    if run.tab is not None:
+        RERUN_SECONDS.observe(time.perf_counter() - start, run.tab, scope)
+
+
+def fragment(tab):
+    """Decorator, under ``@st.fragment``: observe reruns of the fragment on its own under ``tab``.
+
+    When the fragment runs as part of a full rerun it is left to ``rerun()``.
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            if ctx is None or not ctx.fragment_ids_this_run:
+                return function(*args, **kwargs)
+            with rerun('fragment') as run:
+                run.tab = tab
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ========== ARTIFACT CACHES ==========
+def counted(cache, kind):
+    """``cache`` (an st.cache_data or st.cache_resource decorator) counting lookups and misses per function."""
+    def decorate(function):
+        name = function.__name__
+
+        @functools.wraps(function)
+        def build(*args, **kwargs):
+            # Only runs when the cache has no entry for these arguments
+            CACHE_MISSES.inc(kind, name)
+            return function(*args, **kwargs)
+
+        cached = cache(build)
+
+        @functools.wraps(function)
+        def lookup(*args, **kwargs):
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                CACHE_LOOKUPS.inc(kind, name)
+        return lookup
+    return decorate
+
+
+# ========== SESSIONS ==========
+# Session id -> that session's state. SessionState takes no weak references, so a session is
+# dropped once the runtime reports it closed, checked on every rerun and every scrape
+_sessions = {}
+
+
+def _prune():
+    from streamlit.runtime import Runtime
+
+    if Runtime.exists():
+        runtime = Runtime.instance()
+        for session_id in [s for s in _sessions if not runtime.is_active_session(s)]:
+            del _sessions[session_id]
+
+
+def track_session():
+    """Count the current session among those holding a scenario store; call it on every rerun."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        # ctx.session_state is a wrapper each script runner builds anew, and a runner lasts one
+        # rerun; the SessionState it wraps is the one the session keeps for its whole life
+        with _lock:
+            _prune()
+            _sessions[ctx.session_id] = ctx.session_state._state
+
+
+def _live_sessions():
+    with _lock:
+        _prune()
+        return list(_sessions.values())
+
+
+def _session_samples():
+    from streamlit.runtime.stats import safe_sizeof
+
+    sessions = _live_sessions()
+    # Sized outside the lock; deep-sizing session state takes milliseconds per session
+    memory = sum(safe_sizeof(state.filtered_state) for state in sessions)
+    return [
+        ('cecs_scenario_sessions', 'gauge', 'Live sessions holding a scenario store', [('', len(sessions))]),
+        ('cecs_scenario_session_memory_bytes', 'gauge',
+         'Deep size of the session state of the live sessions holding a scenario store', [('', memory)]),
+    ]
+
+
+# ========== EXPOSITION ==========
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def exposition():
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in (RERUN_SECONDS, CACHE_LOOKUPS, CACHE_MISSES):
+        lines += [f'# HELP {metric.name} {metric.documentation}', f'# TYPE {metric.name} {metric.type}']
+        with _lock:
+            samples = list(metric.samples())
+        lines += [f'{name}{labels} {_format(value)}' for name, labels, value in samples]
+    for name, kind, documentation, samples in _session_samples():
+        lines += [f'# HELP {name} {documentation}', f'# TYPE {name} {kind}']
+        lines += [f'{name}{labels} {_format(value)}' for labels, value in samples]
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = exposition().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host=HOST):
+    """Serve ``/metrics`` on ``host:port`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='cecs-metrics-http', daemon=True).start()
+    return server
+
+
+def write(path):
+    """Write the metrics to ``path`` atomically, so a reader never sees a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+        f.write(exposition())
+    os.replace(f.name, path)
+
+
+def _write_every(path, interval):
+    while True:
+        try:
+            write(path)
+        except OSError:
+            pass  # an unwritable path is retried on the next tick rather than ending the thread
+        time.sleep(interval)
+
+
+def start_exporter():
+    """Start whatever the environment configures; returns the HTTP server, if any."""
+    server = None
+    if os.environ.get(PORT_ENV):
+        server = serve(int(os.environ[PORT_ENV]))
+    if os.environ.get(FILE_ENV):
+        interval = float(os.environ.get(INTERVAL_ENV, DEFAULT_INTERVAL_SECONDS))
+        threading.Thread(target=_write_every, args=(os.environ[FILE_ENV], interval),
+                         name='cecs-metrics-file', daemon=True).start()
+    return server
@@ -0,0 +1,957 @@
+"""Financial model engine for the CECS dashboard.
+
+Every formula behind the dashboard lives here, free of any Streamlit code.
+Inputs may be scalars or NumPy/pandas arrays; they are broadcast together
+and every derived line item is computed for all rows in one batched pass.
+"""
+
+import functools
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# ========== MODEL INPUTS ==========
+ROLE_LABELS = ('Full-Time Faculty', 'Adjunct Faculty', 'Staff Members',
+               'Student Ambassadors', 'Graders', 'Tutors')
+RATIO_FIELDS = ('faculty_ratio', 'adjunct_ratio', 'staff_ratio',
+                'ambassador_ratio', 'grader_ratio', 'tutor_ratio')
+PAY_FIELDS = ('faculty_salary', 'adjunct_salary', 'staff_salary',
+              'ambassador_pay', 'grader_pay', 'tutor_pay')
+HEADCOUNT_FIELDS = ('full_time_faculty', 'adjunct_faculty', 'staff_members',
+                    'ambassadors', 'graders', 'tutors')
+COST_FIELDS = ('faculty_cost', 'adjunct_cost', 'staff_cost',
+               'ambassador_cost', 'grader_cost', 'tutor_cost')
+# Faculty, adjuncts and staff are always staffed with at least one position
+MINIMUM_ONE = (True, True, True, False, False, False)
+
+INPUT_FIELDS = ('students', 'tuition_per_student', 'other_revenue',
+                *RATIO_FIELDS, *PAY_FIELDS,
+                'operating_per_student', 'inflation_rate', 'contingency_fund')
+
+DEFAULTS = {
+    'students': 6000,
+    'tuition_per_student': 12000,
+    'other_revenue': 0,
+    'faculty_ratio': 50,
+    'adjunct_ratio': 100,
+    'staff_ratio': 200,
+    'ambassador_ratio': 300,
+    'grader_ratio': 150,
+    'tutor_ratio': 200,
+    'faculty_salary': 75000,
+    'adjunct_salary': 40000,
+    'staff_salary': 50000,
+    'ambassador_pay': 15000,
+    'grader_pay': 10000,
+    'tutor_pay': 12000,
+    'operating_per_student': 500,
+    'inflation_rate': 3.0,
+    'contingency_fund': 5,
+}
+
+INPUT_LABELS = {
+    'students': 'Total Students Enrolled',
+    'tuition_per_student': 'Average Tuition per Student',
+    'other_revenue': 'Other Revenue Sources',
+    'faculty_ratio': 'Students per FT Faculty',
+    'adjunct_ratio': 'Students per Adjunct',
+    'staff_ratio': 'Students per Staff',
+    'ambassador_ratio': 'Students per Ambassador',
+    'grader_ratio': 'Students per Grader',
+    'tutor_ratio': 'Students per Tutor',
+    'faculty_salary': 'FT Faculty Salary',
+    'adjunct_salary': 'Adjunct Salary',
+    'staff_salary': 'Staff Salary',
+    'ambassador_pay': 'Ambassador Pay',
+    'grader_pay': 'Grader Pay',
+    'tutor_pay': 'Tutor Pay',
+    'operating_per_student': 'Operating Cost per Student',
+    'inflation_rate': 'Inflation Rate (%)',
+    'contingency_fund': 'Contingency Fund (%)',
+}
+# Inputs entered as whole numbers in the dashboard
+INTEGER_FIELDS = ('students', *RATIO_FIELDS)
+# Range of each staffing ratio (students per position) offered by the dashboard and searched by the optimizer
+RATIO_BOUNDS = {
+    'faculty_ratio': (10, 100),
+    'adjunct_ratio': (20, 200),
+    'staff_ratio': (50, 500),
+    'ambassador_ratio': (100, 1000),
+    'grader_ratio': (50, 300),
+    'tutor_ratio': (50, 300),
+}
+
+# Hashable bundle of every model input, used as the cache key for derived artifacts
+Parameters = namedtuple('Parameters', INPUT_FIELDS, defaults=[DEFAULTS[f] for f in INPUT_FIELDS])
+
+TARGET_PROFIT = 1000000
+RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+
+SCENARIO_MULTIPLIERS = (0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3)
+SCENARIO_LABELS = ('-30%', '-20%', '-10%', 'Current', '+10%', '+20%', '+30%')
+
+PROJECTION_YEARS = 5
+PROJECTION_GROWTH_RATE = 0.03  # 3% annual growth
+PROJECTION_MAX_YEARS = 50
+# 'compound' grows enrollment itself; 'cohort' grows the entering class and ages it through the program
+ENROLLMENT_MODELS = ('compound', 'cohort')
+# Share of each class that continues into its 2nd, 3rd and 4th year of study
+COHORT_RETENTION = (0.85, 0.90, 0.95)
+
+TUITION_VARIATIONS = (0.9, 0.95, 1.0, 1.05, 1.1)
+TUITION_LABELS = ('-10%', '-5%', 'Current', '+5%', '+10%')
+COST_REDUCTIONS = (0, 5, 10, 15, 20)
+COST_LABELS = ('0%', '5%', '10%', '15%', '20%')
+
+# Inputs perturbed one at a time by the tornado analysis
+TORNADO_FIELDS = ('students', 'tuition_per_student', 'other_revenue', *RATIO_FIELDS, *PAY_FIELDS,
+                  'operating_per_student', 'inflation_rate')
+TORNADO_CHANGE = 0.10
+
+# Inputs that can be put on a sensitivity grid axis, and the results it can show
+GRID_FIELDS = ('students', 'tuition_per_student', *RATIO_FIELDS, *PAY_FIELDS,
+               'operating_per_student', 'contingency_fund')
+GRID_METRICS = {
+    'net_result': 'Net Position ($)',
+    'effective_net': 'Effective Net Position ($)',
+    'margin': 'Profit Margin (%)',
+    'total_cost': 'Total Expenses ($)',
+    'total_personnel': 'Total Personnel',
+}
+
+
+# ========== HELPERS ==========
+def _divide(numerator, denominator, scale=1.0):
+    # Mirrors the dashboard's "x / y if y > 0 else 0" guards, elementwise
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float),
+                                                 np.asarray(denominator, dtype=float))
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out * scale
+
+
+def _levels(value, medium, high):
+    # 0 = LOW, 1 = MEDIUM, 2 = HIGH for a metric where larger is riskier
+    return np.where(value > high, 2, np.where(value > medium, 1, 0)).astype(np.int8)
+
+
+def resolve_inputs(inputs=None, broadcast=True):
+    """Return every model input as a float array, filling gaps from DEFAULTS."""
+    inputs = {} if inputs is None else inputs
+    if isinstance(inputs, Parameters):
+        inputs = inputs._asdict()
+    values = [np.asarray(inputs[f] if f in inputs else DEFAULTS[f], dtype=float)
+              for f in INPUT_FIELDS]
+    if broadcast:
+        values = np.broadcast_arrays(*values)
+    return dict(zip(INPUT_FIELDS, values))
+
+
+def headcount(students, ratio, minimum_one=False):
+    """Positions needed for a role: int(students / ratio), floored at one if required."""
+    students = np.asarray(students, dtype=float)
+    ratio = np.asarray(ratio, dtype=float)
+    staffed = ratio > 0
+    count = np.floor(students / np.where(staffed, ratio, 1.0))
+    if minimum_one:
+        count = np.maximum(count, 1)
+    return np.where(staffed, count, 0).astype(np.int64)
+
+
+# ========== BREAK-EVEN ==========
+def _net_at(p, students):
+    personnel_cost = sum(headcount(students, p[r], m) * p[pay]
+                         for r, pay, m in zip(RATIO_FIELDS, PAY_FIELDS, MINIMUM_ONE))
+    return (students * (p['tuition_per_student'] - p['operating_per_student'])
+            + p['other_revenue'] - personnel_cost)
+
+
+def _segment_start(p, students):
+    # First enrollment at which every role still has the same headcount as at ``students``
+    start = np.zeros(np.shape(students))
+    for r in RATIO_FIELDS:
+        staffed = p[r] > 0
+        ratio = np.where(staffed, p[r], 1.0)
+        steps = np.floor(students / ratio)
+        boundary = np.ceil(steps * ratio)
+        boundary = np.where(np.floor(boundary / ratio) < steps, boundary + 1, boundary)
+        start = np.maximum(start, np.where(staffed, boundary, 0))
+    return start
+
+
+# Segments walked for all rows at once; once few rows remain (or the walk runs out),
+# they are scanned one by one instead
+BREAKEVEN_WALK_STEPS = 256
+_WALK_MIN_ROWS = 64
+# Break-even is searched up to 20x the dashboard's enrollment limit; beyond it, NaN
+BREAKEVEN_MAX_ENROLLMENT = 1000000
+_SCAN_WINDOW_BREAKPOINTS = 4096
+
+
+def _scan_breakeven(q, goal, rate, low, high):
+    # Walk [low, high] top-down in windows of breakpoints, solving every segment of a window at once
+    density = sum(1 / q[r] for r in RATIO_FIELDS if q[r] > 0)
+    width = max(np.floor(_SCAN_WINDOW_BREAKPOINTS / density), 1) if density else high - low + 1
+    while high >= low:
+        window_low = max(low, high - width + 1)
+        points = [np.array([window_low])]
+        for r in RATIO_FIELDS:
+            if q[r] > 0:
+                steps = np.arange(np.ceil(window_low / q[r]), np.floor(high / q[r]) + 1)
+                points.append(np.ceil(steps * q[r]))
+        starts = np.unique(np.clip(np.concatenate(points), window_low, high))
+        ends = np.append(starts[1:] - 1, high)
+
+        net_start = _net_at(q, starts)
+        failing = net_start < goal
+        if failing.any():
+            last_failing = np.minimum(starts + np.ceil((goal - net_start) / rate) - 1, ends)
+            answer = last_failing[failing].max() + 1
+            if _net_at(q, answer) < goal:
+                answer += 1
+            elif answer - 1 >= window_low and _net_at(q, answer - 1) >= goal:
+                answer -= 1
+            return answer
+        high = window_low - 1
+    return low
+
+
+def breakeven_enrollment(inputs=None, target=0.0):
+    """Smallest enrollment from which net position stays at or above ``target``.
+
+    Personnel cost steps up through the integer headcount rules, so net position is
+    a sawtooth: linear between staffing breakpoints, dropping at each new hire. The
+    solver starts from an analytic bound past which the target always holds and walks
+    down one staffing segment at a time, solving each segment in closed form. Almost
+    every row finishes within a few segments of the bound, vectorized across rows;
+    the few that do not are scanned breakpoint-window by breakpoint-window from the
+    top, so the cost is O(k) in the breakpoints crossed. Rows whose tuition cannot
+    cover the marginal staffing cost per student, or whose break-even lies beyond
+    BREAKEVEN_MAX_ENROLLMENT, return NaN.
+    """
+    resolved = resolve_inputs(inputs)
+    shape = np.shape(resolved['students'])
+    p = {k: np.ravel(v) for k, v in resolved.items()}
+    target = np.broadcast_to(np.asarray(target, dtype=float), shape).ravel()
+
+    slope = p['tuition_per_student'] - p['operating_per_student']
+    staffing_rate = 0.0
+    total_pay = 0.0
+    rounding_slack = 0.0
+    for r, pay, minimum_one in zip(RATIO_FIELDS, PAY_FIELDS, MINIMUM_ONE):
+        staffed = p[r] > 0
+        staffing_rate = staffing_rate + np.where(staffed, p[pay] / np.where(staffed, p[r], 1.0), 0)
+        total_pay = total_pay + np.where(staffed, p[pay], 0)
+        if minimum_one:
+            rounding_slack = rounding_slack + np.where(staffed, p[pay], 0)
+    effective = slope - staffing_rate
+
+    # Above ``upper`` even the worst-case rounding of every headcount keeps net >= target;
+    # at or below ``lower`` even the best case falls short
+    solvable = effective > 0
+    safe_effective = np.where(solvable, effective, 1.0)
+    upper = np.maximum(np.ceil((target - p['other_revenue'] + rounding_slack) / safe_effective), 0)
+    lower = np.maximum(np.floor((target - p['other_revenue'] - total_pay) / safe_effective) - 1, 0)
+    solvable &= lower < BREAKEVEN_MAX_ENROLLMENT
+    current = np.minimum(upper - 1, BREAKEVEN_MAX_ENROLLMENT)
+
+    result = np.full(slope.shape, np.nan)
+    result[solvable & (current < 0)] = 0
+    active = np.flatnonzero(solvable & (current >= 0))
+
+    for _ in range(BREAKEVEN_WALK_STEPS):
+        if active.size <= _WALK_MIN_ROWS:
+            break
+        q = {k: v[active] for k, v in p.items()}
+        s, goal, rate = current[active], target[active], slope[active]
+
+        # Invariant: every enrollment above ``s`` already meets the target
+        net_s = _net_at(q, s)
+        start = _segment_start(q, s)
+        net_start = _net_at(q, start)
+        falls_short = net_s < goal
+        crosses = ~falls_short & (net_start < goal)
+
+        crossing = np.clip(start + np.ceil((goal - net_start) / rate), start, s)
+        crossing = np.where(_net_at(q, crossing) < goal, crossing + 1, crossing)
+        earlier = np.maximum(crossing - 1, start)
+        crossing = np.where((earlier < crossing) & (_net_at(q, earlier) >= goal), earlier, crossing)
+
+        finished = falls_short | crosses
+        result[active[finished]] = np.where(falls_short, s + 1, crossing)[finished]
+
+        # The whole segment meets the target; continue with the one below it
+        remaining = active[~finished]
+        current[remaining] = start[~finished] - 1
+        exhausted = current[remaining] < 0
+        result[remaining[exhausted]] = 0
+        active = remaining[~exhausted]
+
+    for i in active:
+        q = {k: v[i] for k, v in p.items()}
+        result[i] = _scan_breakeven(q, target[i], slope[i], min(lower[i], current[i]), current[i])
+
+    result[result > BREAKEVEN_MAX_ENROLLMENT] = np.nan
+    return result.reshape(shape)
+
+
+# ========== DEPENDENCY GRAPH ==========
+# Every derived quantity is a node computed from the inputs and nodes it depends on:
+# inputs -> headcounts -> role costs -> totals -> ratios/risks -> scenario/projection series.
+# evaluate() runs the part of the graph the requested results need, over whole batches;
+# Recalculation reruns only the part downstream of the inputs that changed.
+Node = namedtuple('Node', ('depends', 'compute'))
+
+# Inputs the break-even solve reads: all but enrollment itself, inflation and contingency
+PRICING_FIELDS = tuple(f for f in INPUT_FIELDS if f not in ('students', 'inflation_rate', 'contingency_fund'))
+# Inputs the projection reads, and the graph input holding its assumptions (a Projection)
+PROJECTION_FIELDS = tuple(f for f in INPUT_FIELDS if f != 'contingency_fund')
+PROJECTION_INPUT = 'projection_assumptions'
+
+
+def _from_inputs(fields, function):
+    # Node over raw inputs for a function that takes an inputs mapping
+    return Node(fields, lambda *values: function(dict(zip(fields, values))))
+
+
+def _role_nodes():
+    for count, cost, ratio, pay, minimum_one in zip(
+            HEADCOUNT_FIELDS, COST_FIELDS, RATIO_FIELDS, PAY_FIELDS, MINIMUM_ONE):
+        yield count, Node(('students', ratio), lambda students, ratio, m=minimum_one: headcount(students, ratio, m))
+        yield cost, Node((count, pay), np.multiply)
+
+
+def _total(*values):
+    return sum(values)
+
+
+def _breakeven_buffer(students, breakeven_students):
+    reached = breakeven_students > 0
+    return np.where(reached, (students / np.where(reached, breakeven_students, 1.0) - 1) * 100, np.nan)
+
+
+def _enrollment_risk(students, breakeven_students):
+    breakeven_students = np.where(np.isnan(breakeven_students), np.inf, breakeven_students)
+    return np.where(students > breakeven_students * 1.2, 0,
+                    np.where(students > breakeven_students, 1, 2)).astype(np.int8)
+
+
+def _projection_series(*values):
+    *inputs, assumptions = values
+    return project(dict(zip(PROJECTION_FIELDS, inputs)), **assumptions._asdict())
+
+
+NODES = {
+    **dict(_role_nodes()),
+    'operating_cost': Node(('students', 'operating_per_student'), np.multiply),
+    'total_personnel': Node(HEADCOUNT_FIELDS, _total),
+    'total_personnel_cost': Node(COST_FIELDS, _total),
+    'total_cost': Node(('total_personnel_cost', 'operating_cost'), np.add),
+
+    'tuition_revenue': Node(('students', 'tuition_per_student'), np.multiply),
+    'total_revenue': Node(('tuition_revenue', 'other_revenue'), np.add),
+    'net_result': Node(('total_revenue', 'total_cost'), np.subtract),
+    'margin': Node(('net_result', 'total_revenue'), lambda net, revenue: _divide(net, revenue, 100)),
+
+    'contingency_amount': Node(('total_cost', 'contingency_fund'), lambda cost, fund: cost * (fund / 100)),
+    'effective_net': Node(('net_result', 'contingency_amount'), np.subtract),
+
+    # Ratios
+    'expense_ratio': Node(('total_cost', 'total_revenue'), lambda cost, revenue: _divide(cost, revenue, 100)),
+    'personnel_ratio': Node(('total_personnel_cost', 'total_cost'),
+                            lambda personnel, cost: _divide(personnel, cost, 100)),
+    'operating_ratio': Node(('operating_cost', 'total_cost'), lambda operating, cost: _divide(operating, cost, 100)),
+    'cost_per_student': Node(('total_cost', 'students'), _divide),
+    'revenue_per_student': Node(('total_revenue', 'students'), _divide),
+    'tuition_share': Node(('tuition_revenue', 'total_revenue'), _divide),
+
+    # Break-even, with personnel costs stepping through the headcount rules; it does not depend
+    # on enrollment, so a batch solves it once per distinct price/staffing row
+    'contribution_per_student': Node(('tuition_per_student', 'operating_per_student'), np.subtract),
+    'breakeven_students': _from_inputs(PRICING_FIELDS, breakeven_enrollment),
+    'target_students': _from_inputs(PRICING_FIELDS, lambda p: breakeven_enrollment(p, TARGET_PROFIT)),
+    'breakeven_buffer': Node(('students', 'breakeven_students'), _breakeven_buffer),
+
+    # Risk levels (codes into RISK_LEVELS)
+    'enrollment_risk': Node(('students', 'breakeven_students'), _enrollment_risk),
+    'margin_risk': Node(('margin',), lambda margin: np.where(
+        margin > 15, 0, np.where(margin > 5, 1, 2)).astype(np.int8)),
+    'dependency_risk': Node(('tuition_share',), lambda share: _levels(share, 0.7, 0.9)),
+    'personnel_risk': Node(('personnel_ratio',), lambda ratio: _levels(ratio, 70, 80)),
+
+    # Series, for one scenario at a time (Recalculation); evaluate() leaves them out
+    'enrollment_scenarios': _from_inputs(PRICING_FIELDS + ('students',), lambda p: enrollment_scenarios(p)),
+    'projection': Node((*PROJECTION_FIELDS, PROJECTION_INPUT), _projection_series),
+}
+SERIES_NODES = ('enrollment_scenarios', 'projection')
+BREAKEVEN_NODES = ('breakeven_students', 'target_students', 'breakeven_buffer', 'enrollment_risk')
+RESULT_NODES = tuple(n for n in NODES if n not in SERIES_NODES)
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(names):
+    # The nodes ``names`` need, each after the nodes it depends on
+    order = []
+    stack = [(name, False) for name in reversed(names)]
+    while stack:
+        name, expanded = stack.pop()
+        if name not in NODES or name in order:
+            continue
+        if expanded:
+            order.append(name)
+        else:
+            stack.append((name, True))
+            stack.extend((d, False) for d in reversed(NODES[name].depends))
+    return tuple(order)
+
+
+def _run_graph(values, names):
+    # Compute ``names`` and whatever they depend on into ``values`` (inputs pre-filled). A plain
+    # loop over a precomputed order: a recursive closure would be a reference cycle holding
+    # every intermediate array until the cyclic garbage collector runs.
+    for name in _plan(tuple(names)):
+        if name not in values:
+            node = NODES[name]
+            values[name] = node.compute(*(values[d] for d in node.depends))
+    return values
+
+
+@functools.lru_cache(maxsize=None)
+def _readers(name):
+    # The nodes that read input or node ``name`` directly
+    return frozenset(n for n, node in NODES.items() if name in node.depends)
+
+
+# ========== CORE EVALUATION ==========
+def evaluate(inputs=None, breakeven=True):
+    """Compute every derived line item for one or many parameter rows.
+
+    ``inputs`` is any mapping (dict, DataFrame, ...) of INPUT_FIELDS to scalars
+    or arrays. Returns a dict of NumPy arrays sharing the broadcast shape.
+    ``breakeven=False`` skips the break-even solve and the enrollment risk built
+    on it, for callers that only need the financial line items.
+    """
+    # Nodes are computed at the shape of their own inputs and broadcast at the end, so a
+    # batch that varies only some inputs never repeats the work that does not depend on them
+    p = resolve_inputs(inputs, broadcast=False)
+    shape = np.broadcast_shapes(*(v.shape for v in p.values()))
+    names = RESULT_NODES if breakeven else tuple(n for n in RESULT_NODES if n not in BREAKEVEN_NODES)
+    values = _run_graph(p, names)
+    return {name: values[name] if np.shape(values[name]) == shape else np.broadcast_to(values[name], shape)
+            for name in names}
+
+
+def evaluate_frame(inputs=None):
+    """Evaluate many parameter rows and return inputs plus results as one DataFrame."""
+    p = resolve_inputs(inputs)
+    out = evaluate(p)
+    return pd.DataFrame({k: np.ravel(v) for k, v in {**p, **out}.items()})
+
+
+def scalars(result):
+    """Unwrap a single-row evaluation into plain Python numbers."""
+    return {k: np.asarray(v).item() for k, v in result.items()}
+
+
+def risk_label(code):
+    return RISK_LEVELS[int(code)]
+
+
+# ========== INCREMENTAL RECALCULATION ==========
+def _same(a, b):
+    if isinstance(a, pd.DataFrame) or isinstance(b, pd.DataFrame):
+        return isinstance(a, pd.DataFrame) and isinstance(b, pd.DataFrame) and a.equals(b)
+    if isinstance(a, (np.ndarray, np.generic)) or isinstance(b, (np.ndarray, np.generic)):
+        return np.array_equal(a, b, equal_nan=True)
+    return type(a) is type(b) and a == b
+
+
+class Recalculation:
+    """The dependency graph evaluated incrementally, for one scenario at a time.
+
+    ``update`` sets the inputs and marks the nodes that read a changed one
+    dirty. Reading nodes (``recalculation['net_result']``) walks their ``_plan``
+    and recomputes only the dirty ones, reusing every other stored value. A
+    recomputed node dirties its readers only when its value changed, so a pay
+    change never recomputes a headcount and one more student recomputes only
+    the roles that actually gain a position. ``recomputed`` maps each node
+    computed since the last ``update``, in order, to the seconds it took.
+    """
+
+    def __init__(self):
+        self.recomputed = {}
+        self._values = {PROJECTION_INPUT: Projection()}
+        self._dirty = set(NODES)
+
+    def update(self, inputs=None):
+        """Set every model input (missing ones from DEFAULTS) and start a new ``recomputed`` log."""
+        self.recomputed = {}
+        for field, value in resolve_inputs(inputs).items():
+            self.set(field, value)
+        return self
+
+    def set(self, name, value):
+        """Set one graph input, e.g. PROJECTION_INPUT, keeping the ``recomputed`` log."""
+        if name not in self._values or not _same(self._values[name], value):
+            self._values[name] = value
+            self._dirty |= _readers(name)
+
+    def values(self, names):
+        """The current value of each node in ``names``, recomputing the dirty ones they need."""
+        for name in _plan(tuple(names)):
+            if name in self._dirty:
+                node = NODES[name]
+                start = time.perf_counter()
+                value = node.compute(*(self._values[d] for d in node.depends))
+                self.recomputed[name] = time.perf_counter() - start
+                self._dirty.discard(name)
+                if name not in self._values or not _same(self._values[name], value):
+                    self._values[name] = value
+                    self._dirty |= _readers(name)
+        return {name: self._values[name] for name in names}
+
+    def __getitem__(self, name):
+        return self.values((name,))[name]
+
+    def results(self):
+        """Every scalar result, as ``scalars(evaluate(inputs))`` returns them."""
+        return scalars(self.values(RESULT_NODES))
+
+
+# ========== SCENARIOS & PROJECTIONS ==========
+def enrollment_scenarios(inputs=None, multipliers=SCENARIO_MULTIPLIERS, labels=SCENARIO_LABELS):
+    """Evaluate the enrollment impact scenarios as one batch."""
+    p = resolve_inputs(inputs)
+    scenario_students = np.floor(p['students'] * np.asarray(multipliers, dtype=float))
+    out = evaluate({**p, 'students': scenario_students})
+
+    return pd.DataFrame({
+        'Scenario': list(labels),
+        'Students': scenario_students.astype(np.int64),
+        'Personnel': out['total_personnel'],
+        'Revenue': out['total_revenue'],
+        'Expenses': out['total_cost'],
+        'Net Position': out['net_result'],
+        'Margin %': out['margin'],
+    })
+
+
+# Projection assumptions; escalation rates are % per year and None means the row's inflation_rate
+Projection = namedtuple('Projection', ('years', 'growth', 'enrollment', 'tuition_escalation',
+                                       'salary_escalation', 'operating_escalation'),
+                        defaults=(PROJECTION_YEARS, PROJECTION_GROWTH_RATE, 'compound', None, None, None))
+
+
+def growth_path(growth, years):
+    """Cumulative growth multiplier for each projection year, 1.0 in year 1.
+
+    ``growth`` is one annual rate (0.03 = 3%) or a schedule of rates for years
+    2, 3, ...; a schedule shorter than the horizon keeps its last rate. A 2-D
+    array holds one schedule per row, giving a (rows, years) result.
+    """
+    rates = np.atleast_1d(np.asarray(growth, dtype=float))
+    steps = np.minimum(np.arange(years - 1), rates.shape[-1] - 1)
+    factors = np.cumprod(1 + rates[..., steps], axis=-1)
+    return np.concatenate([np.ones(factors.shape[:-1] + (1,)), factors], axis=-1)
+
+
+def cohort_enrollment(students, growth, years, retention=COHORT_RETENTION):
+    """Enrollment per year when the entering class grows and earlier classes age out.
+
+    Year 1 is in steady state: the classes already enrolled entered at the
+    year-1 intake and ``students`` is their sum after ``retention``.
+    """
+    survival = np.cumprod([1.0, *retention])
+    intake = np.asarray(students, dtype=float)[..., None] / survival.sum() * growth_path(growth, years)
+    lag = survival.size - 1
+    history = np.concatenate([np.repeat(intake[..., :1], lag, axis=-1), intake], axis=-1)
+    enrolled = sum(share * history[..., lag - k:lag - k + years] for k, share in enumerate(survival))
+    # Rounded first so float error cannot floor year 1 below the current enrollment
+    return np.floor(np.round(enrolled, 6))
+
+
+def projection(inputs=None, years=PROJECTION_YEARS, growth=PROJECTION_GROWTH_RATE, enrollment='compound',
+               tuition_escalation=None, salary_escalation=None, operating_escalation=None,
+               retention=COHORT_RETENTION):
+    """Project every parameter row over ``years`` in one batched evaluation.
+
+    Returns a dict of (rows, years) arrays: students, revenue, personnel cost,
+    operating cost, expenses, net position and margin. Tuition, salaries and
+    operating costs escalate at their own rates (% per year, defaulting to
+    each row's inflation_rate); other revenue is held flat. Growth and the
+    escalation rates may also be given per row.
+    """
+    if enrollment not in ENROLLMENT_MODELS:
+        raise ValueError(f"unknown enrollment model '{enrollment}'; expected one of: {', '.join(ENROLLMENT_MODELS)}")
+    if not 1 <= years <= PROJECTION_MAX_YEARS:
+        raise ValueError(f'years must be between 1 and {PROJECTION_MAX_YEARS}')
+
+    p = {k: v[..., None] for k, v in resolve_inputs(inputs).items()}
+    if enrollment == 'cohort':
+        students = cohort_enrollment(p['students'][..., 0], growth, years, retention)
+    else:
+        students = np.floor(p['students'] * growth_path(growth, years))
+    out = evaluate({**p, 'students': students}, breakeven=False)
+
+    periods = np.arange(years)
+
+    def escalation(rate):
+        rate = p['inflation_rate'] if rate is None else np.asarray(rate, dtype=float)[..., None]
+        return (1 + rate / 100) ** periods
+
+    revenue = out['tuition_revenue'] * escalation(tuition_escalation) + p['other_revenue']
+    personnel_cost = out['total_personnel_cost'] * escalation(salary_escalation)
+    operating_cost = out['operating_cost'] * escalation(operating_escalation)
+    expenses = personnel_cost + operating_cost
+    net = revenue - expenses
+    return {
+        'students': students,
+        'revenue': revenue,
+        'personnel_cost': personnel_cost,
+        'operating_cost': operating_cost,
+        'expenses': expenses,
+        'net': net,
+        'margin': _divide(net, revenue, 100),
+    }
+
+
+def project(inputs=None, years=PROJECTION_YEARS, growth=PROJECTION_GROWTH_RATE, enrollment='compound',
+            tuition_escalation=None, salary_escalation=None, operating_escalation=None):
+    """Year-by-year projection table for a single scenario; see ``projection``."""
+    out = projection(inputs, years, growth, enrollment, tuition_escalation, salary_escalation,
+                     operating_escalation)
+    out = {k: np.reshape(v, -1) for k, v in out.items()}
+
+    return pd.DataFrame({
+        'Year': [f'Year {i + 1}' for i in range(years)],
+        'Students': out['students'].astype(np.int64),
+        'Revenue': out['revenue'],
+        'Expenses': out['expenses'],
+        'Net Position': out['net'],
+        'Margin %': out['margin'],
+    })
+
+
+def projection_label(assumptions, inflation_rate):
+    """Short description of a Projection's growth and escalation, for chart titles."""
+    rates = np.atleast_1d(assumptions.growth)
+    growth = f'{rates[0] * 100:.0f}% Growth' if np.all(rates == rates[0]) else 'Scheduled Growth'
+    if assumptions.enrollment == 'cohort':
+        growth += ' in New Students'
+    escalations = [inflation_rate if r is None else r for r in assumptions[3:]]
+    if len(set(escalations)) == 1:
+        return f'{growth}, {escalations[0]:.1f}% Inflation'
+    tuition, salary, operating = escalations
+    return f'{growth}; Tuition {tuition:.1f}%, Salaries {salary:.1f}%, Operating {operating:.1f}%'
+
+
+# ========== ENROLLMENT SWEEP ==========
+# Upper end of the sweep, matching the students input's max_value
+SWEEP_MAX_STUDENTS = 50000
+
+
+def staffing_step_index(inputs=None, max_students=SWEEP_MAX_STUDENTS):
+    """Enrollments at which each role adds a position, up to ``max_students``.
+
+    Returns one sorted array per RATIO_FIELDS entry: the smallest enrollment at
+    which floor(students / ratio) reaches 1, 2, 3, ... (empty when the role is
+    unstaffed). Only the ratios of ``inputs`` are used.
+    """
+    p = resolve_inputs(inputs)
+    index = {}
+    for r in RATIO_FIELDS:
+        ratio = p[r].item()
+        if ratio <= 0:
+            index[r] = np.empty(0)
+            continue
+        steps = np.arange(1, np.floor(max_students / ratio) + 1)
+        boundary = np.ceil(steps * ratio)
+        # Guard against ceil() landing one short of the floor rule under rounding
+        index[r] = np.where(np.floor(boundary / ratio) < steps, boundary + 1, boundary)
+    return index
+
+
+def enrollment_sweep(inputs=None, low=0, high=SWEEP_MAX_STUDENTS, step_index=None):
+    """Evaluate every integer enrollment in [low, high] for one parameter set.
+
+    Headcounts are built from ``staffing_step_index`` (pass a precomputed one
+    covering ``high`` to reuse it) by counting the step boundaries that fall in
+    the range and taking a cumulative sum, so no point recomputes its headcounts.
+    """
+    p = {k: v.item() for k, v in resolve_inputs(inputs).items()}
+    low, high = int(low), int(high)
+    if step_index is None:
+        step_index = staffing_step_index(p, high)
+    students = np.arange(low, high + 1, dtype=float)
+
+    personnel = np.zeros(students.size, dtype=np.int64)
+    personnel_cost = np.zeros(students.size)
+    for r, pay, minimum_one in zip(RATIO_FIELDS, PAY_FIELDS, MINIMUM_ONE):
+        if p[r] <= 0:
+            continue
+        boundaries = step_index[r]
+        inside = boundaries[(boundaries > low) & (boundaries <= high)]
+        count = headcount(low, p[r]) + np.cumsum(
+            np.bincount((inside - low).astype(np.int64), minlength=students.size))
+        if minimum_one:
+            count = np.maximum(count, 1)
+        personnel += count
+        personnel_cost += count * p[pay]
+
+    revenue = students * p['tuition_per_student'] + p['other_revenue']
+    expenses = personnel_cost + students * p['operating_per_student']
+    net = revenue - expenses
+
+    return pd.DataFrame({
+        'Students': students.astype(np.int64),
+        'Personnel': personnel,
+        'Revenue': revenue,
+        'Expenses': expenses,
+        'Net Position': net,
+        'Margin %': _divide(net, revenue, 100),
+    })
+
+
+# ========== SENSITIVITY ==========
+def grid_axis(value, spread, points, field=None):
+    """``points`` values from value * (1 - spread) to value * (1 + spread).
+
+    Fields in INTEGER_FIELDS are rounded to whole numbers and ratios are kept
+    at 1 or more; duplicate values are dropped, so the axis may come out shorter.
+    """
+    values = np.maximum(np.linspace(value * (1 - spread), value * (1 + spread), points), 0)
+    if field in INTEGER_FIELDS:
+        values = np.round(values)
+    if field in RATIO_FIELDS:
+        values = np.maximum(values, 1)
+    return np.unique(values)
+
+
+def sensitivity_grid(inputs=None, axes=None, metric='net_result'):
+    """Evaluate ``metric`` over the full grid spanned by ``axes``.
+
+    ``axes`` maps input fields to 1-D value arrays; every other input stays at
+    ``inputs``. The grid is built by broadcasting (one NumPy axis per field, in
+    order), so any number of axes is one model call and the result has shape
+    ``tuple(len(v) for v in axes.values())``.
+    """
+    p = {k: v.item() for k, v in resolve_inputs(inputs).items()}
+    axes = axes or {}
+    for position, (field, values) in enumerate(axes.items()):
+        shape = [1] * len(axes)
+        shape[position] = -1
+        p[field] = np.asarray(values, dtype=float).reshape(shape)
+    return np.broadcast_to(evaluate(p, breakeven=False)[metric],
+                           tuple(len(v) for v in axes.values()))
+
+
+def tornado(inputs=None, change=TORNADO_CHANGE, fields=TORNADO_FIELDS, year=1, growth_rate=PROJECTION_GROWTH_RATE):
+    """Swing in net position when each input alone moves by -change and +change.
+
+    All 2 x len(fields) perturbed parameter sets (plus the base case) are
+    stacked into one batch and evaluated in a single model call. ``year`` picks
+    the projection year whose net position is compared (1 = current budget,
+    where inflation has no effect yet). Returns one row per field, largest
+    swing first.
+    """
+    p = {k: v.item() for k, v in resolve_inputs(inputs).items()}
+    fields = list(fields)
+    count = len(fields)
+
+    # Row 0 is the base case, then every field at -change, then every field at +change
+    batch = {k: np.full(2 * count + 1, v) for k, v in p.items()}
+    for i, field in enumerate(fields):
+        batch[field][1 + i] = p[field] * (1 - change)
+        batch[field][1 + count + i] = p[field] * (1 + change)
+        if field in INTEGER_FIELDS:
+            batch[field] = np.round(batch[field])
+    net = projection(batch, year, growth_rate)['net'][:, -1]
+
+    base = net[0]
+    low, high = net[1:count + 1], net[count + 1:]
+    return pd.DataFrame({
+        'Input': [INPUT_LABELS[f] for f in fields],
+        'Field': fields,
+        'Low Value': [batch[f][1 + i] for i, f in enumerate(fields)],
+        'High Value': [batch[f][1 + count + i] for i, f in enumerate(fields)],
+        'Net at Low': low,
+        'Net at High': high,
+        'Base Net': base,
+        'Swing': np.abs(high - low),
+    }).sort_values('Swing', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def tuition_sensitivity(inputs=None, variations=TUITION_VARIATIONS):
+    """Net position when tuition alone is scaled by each variation."""
+    p = resolve_inputs(inputs)
+    out = evaluate(p)
+    variations = np.asarray(variations, dtype=float)
+    return (out['tuition_revenue'] * variations + p['other_revenue']) - out['total_cost']
+
+
+def cost_reduction_sensitivity(inputs=None, reductions=COST_REDUCTIONS):
+    """Net position when total cost is cut by each percentage."""
+    out = evaluate(inputs)
+    reductions = np.asarray(reductions, dtype=float)
+    return out['total_revenue'] - out['total_cost'] * (1 - reductions / 100)
+
+
+# ========== GOAL SEEK ==========
+# Inputs goal_seek can solve for, and the results it can aim at
+GOAL_FIELDS = ('students', 'tuition_per_student', 'other_revenue', *RATIO_FIELDS, *PAY_FIELDS,
+               'operating_per_student')
+GOAL_METRICS = {
+    'net_result': 'Net Position ($)',
+    'margin': 'Profit Margin (%)',
+}
+
+
+def _goal_gap(p, metric, target):
+    # >= 0 exactly where ``metric`` meets ``target``; a margin target is a net-position target
+    # net - m% * revenue >= 0, so both are linear in revenue and cost
+    out = evaluate(p, breakeven=False)
+    if metric == 'margin':
+        return out['net_result'] - target / 100 * out['total_revenue']
+    return out['net_result'] - target
+
+
+def goal_seek(inputs=None, field='tuition_per_student', target=TARGET_PROFIT, metric='net_result',
+              bounds=RATIO_BOUNDS):
+    """Value of ``field`` at which ``metric`` reaches ``target``, every other input held.
+
+    ``metric`` is 'net_result' ($) or 'margin' (%). Inputs and target broadcast
+    like ``evaluate``; returns a float array of the broadcast shape, NaN where
+    the target is out of reach.
+
+    - Prices, costs and pay move the result linearly, so they are solved in
+      closed form: the exact value, which may be fractional. A revenue input
+      that meets the target even at zero returns 0.
+    - Enrollment moves it along the staffing sawtooth; the answer is the
+      smallest enrollment from which the target holds (as breakeven_enrollment).
+    - A staffing ratio moves it in steps; the answer is the smallest whole
+      ratio within ``bounds[field]`` that meets the target, i.e. the most staff
+      the target affords, found by bisection over the steps.
+    """
+    if field not in GOAL_FIELDS:
+        raise ValueError(f"cannot goal-seek {field!r}; choose one of {', '.join(GOAL_FIELDS)}")
+    if metric not in GOAL_METRICS:
+        raise ValueError(f"unknown metric {metric!r}; choose one of {', '.join(GOAL_METRICS)}")
+    p = resolve_inputs(inputs)
+    target = np.asarray(target, dtype=float)
+    shape = np.broadcast_shapes(p['students'].shape, target.shape)
+    p = {k: np.broadcast_to(v, shape) for k, v in p.items()}
+    target = np.broadcast_to(target, shape)
+
+    if field == 'students':
+        if metric == 'margin':
+            # net - m% * revenue >= 0 is a break-even at tuition and other revenue scaled by (1 - m%)
+            keep = 1 - target / 100
+            p = {**p, 'tuition_per_student': p['tuition_per_student'] * keep,
+                 'other_revenue': p['other_revenue'] * keep}
+            target = 0.0
+        return breakeven_enrollment(p, target)
+
+    if field in RATIO_FIELDS:
+        # Fewer students per position never costs less, so the gap only rises with the ratio
+        low, high = bounds[field]
+        lo = np.full(target.shape, float(low))
+        hi = np.full(target.shape, float(high))
+        met_low = _goal_gap({**p, field: lo}, metric, target) >= 0
+        reachable = _goal_gap({**p, field: hi}, metric, target) >= 0
+        # Invariant: the target fails at ``lo`` and holds at ``hi``
+        while (hi - lo > 1).any():
+            mid = np.floor((lo + hi) / 2)
+            holds = _goal_gap({**p, field: mid}, metric, target) >= 0
+            hi = np.where(holds, mid, hi)
+            lo = np.where(holds, lo, mid)
+        return np.where(met_low, low, np.where(reachable, hi, np.nan))
+
+    # Linear inputs: two evaluations give the slope, one step solves it
+    current = p[field]
+    gap = _goal_gap(p, metric, target)
+    slope = _goal_gap({**p, field: current + 1}, metric, target) - gap
+    moves = slope != 0
+    value = np.where(moves, current - gap / np.where(moves, slope, 1.0), np.where(gap == 0, current, np.nan))
+    # Below zero: a revenue input meets the target even at nothing, a cost input cannot reach it
+    return np.where(value >= 0, value, np.where(slope > 0, 0.0, np.nan))
+
+
+# ========== STAFFING OPTIMIZER ==========
+# Default quality limit: students per faculty member, full-time and adjunct combined
+OPTIMIZER_MAX_STUDENTS_PER_FACULTY = 35
+
+
+def headcount_options(students, field, low, high):
+    """Every distinct headcount a ratio in [low, high] gives for ``students``.
+
+    Returns (headcounts, ratios), headcounts descending, each paired with the
+    largest ratio that produces it. A role needs at most ~2*sqrt(students)
+    distinct headcounts however wide the ratio range is.
+    """
+    ratios = np.arange(low, high + 1)
+    counts = headcount(students, ratios, MINIMUM_ONE[RATIO_FIELDS.index(field)])
+    # Headcount never rises with the ratio; keep the last ratio of each run
+    last = np.append(counts[1:] != counts[:-1], True)
+    return counts[last], ratios[last]
+
+
+def optimize_staffing(inputs=None, min_margin=0.0, max_students_per_faculty=OPTIMIZER_MAX_STUDENTS_PER_FACULTY,
+                      budget=None, bounds=RATIO_BOUNDS):
+    """Staffing ratios with the highest net position that meet the quality and budget constraints.
+
+    Constraints: profit margin of at least ``min_margin`` %, no more than
+    ``max_students_per_faculty`` students per faculty member (full-time and
+    adjunct together; None for no limit) and total expenses within ``budget``
+    (None for no limit). Each ratio stays within its ``bounds``.
+
+    Personnel cost is separable by role and never rises with a ratio, so every
+    role outside the faculty limit is cheapest at its largest ratio. For the
+    faculty pair only distinct headcounts matter: each full-time headcount is
+    paired with the cheapest adjunct headcount that still meets the limit, so
+    the search covers ~2*sqrt(students) faculty mixes instead of every ratio
+    combination. Margin and budget only rule out costlier mixes, so they are
+    checked on the results.
+
+    Returns (best, options): ``best`` is the Parameters with the optimal ratios,
+    or None when nothing is feasible; ``options`` has one row per faculty mix,
+    best first.
+    """
+    p = {k: v.item() for k, v in resolve_inputs(inputs).items()}
+    students = p['students']
+    ratios = {field: bounds[field][1] for field in RATIO_FIELDS}
+
+    faculty, faculty_ratios = headcount_options(students, 'faculty_ratio', *bounds['faculty_ratio'])
+    adjuncts, adjunct_ratios = headcount_options(students, 'adjunct_ratio', *bounds['adjunct_ratio'])
+    adjuncts, adjunct_ratios = adjuncts[::-1], adjunct_ratios[::-1]
+    needed = np.ceil(students / max_students_per_faculty) if max_students_per_faculty else 0
+    pick = np.searchsorted(adjuncts, needed - faculty)
+    meets_limit = pick < adjuncts.size
+    pick = np.minimum(pick, adjuncts.size - 1)
+
+    batch = {**p, **ratios, 'faculty_ratio': faculty_ratios, 'adjunct_ratio': adjunct_ratios[pick]}
+    out = evaluate(batch, breakeven=False)
+    feasible = meets_limit & (out['margin'] >= min_margin)
+    if budget is not None:
+        feasible &= out['total_cost'] <= budget
+
+    faculty_total = out['full_time_faculty'] + out['adjunct_faculty']
+    options = pd.DataFrame({
+        'Students per FT Faculty': faculty_ratios,
+        'Students per Adjunct': adjunct_ratios[pick],
+        'Full-Time Faculty': out['full_time_faculty'],
+        'Adjunct Faculty': out['adjunct_faculty'],
+        'Students per Faculty': _divide(students, faculty_total),
+        'Expenses': out['total_cost'],
+        'Net Position': out['net_result'],
+        'Margin %': out['margin'],
+        'Feasible': feasible,
+    }).sort_values(['Feasible', 'Net Position'], ascending=False, kind='stable').reset_index(drop=True)
+
+    if not feasible.any():
+        return None, options
+    best = options.iloc[0]
+    ratios.update(faculty_ratio=int(best['Students per FT Faculty']), adjunct_ratio=int(best['Students per Adjunct']))
+    best = {**p, **ratios}
+    return Parameters(**{k: int(v) if k in INTEGER_FIELDS else v for k, v in best.items()}), options
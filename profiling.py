@@ -0,0 +1,152 @@
+"""Opt-in timing of dashboard reruns.
+
+A rerun runs inside ``timing()``; while it does, every ``section()`` block
+and ``timed`` function in the same thread records its wall time under a
+path of the sections it is nested in ("tab: Advanced Analytics / figure:
+sweep_figure"). Outside ``timing()`` both are a single context-variable
+lookup, so the hooks stay in place for every user at no real cost.
+``History`` keeps the last runs of each section for rolling percentiles,
+and ``timing(profile=True)`` also runs cProfile over the whole rerun.
+"""
+
+import contextvars
+import cProfile
+import functools
+import io
+import marshal
+import pstats
+import statistics
+import time
+from collections import deque
+from contextlib import contextmanager
+
+SEPARATOR = ' / '
+HISTORY_RUNS = 100
+PROFILE_LINES = 40
+
+_timer = contextvars.ContextVar('timer', default=None)
+
+
+class Timer:
+    """Wall time per section path for one rerun, in the order sections finished."""
+
+    def __init__(self):
+        self.sections = {}
+        self.total = None
+        self.profile = None
+        self._path = []
+
+    @contextmanager
+    def section(self, name):
+        self._path.append(name)
+        path = SEPARATOR.join(self._path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # A section entered twice in one rerun (a figure drawn twice) adds up
+            self.sections[path] = self.sections.get(path, 0.0) + time.perf_counter() - start
+            self._path.pop()
+
+
+@contextmanager
+def section(name):
+    """Time the block as ``name`` when the current rerun is being timed."""
+    timer = _timer.get()
+    if timer is None:
+        yield
+    else:
+        with timer.section(name):
+            yield
+
+
+def timed(name):
+    """Decorator form of ``section``."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            timer = _timer.get()
+            if timer is None:
+                return function(*args, **kwargs)
+            with timer.section(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def timing(history=None, profile=False):
+    """Time everything inside as one rerun; recorded into ``history`` if it completes.
+
+    With ``profile``, the rerun also runs under cProfile and the timer's
+    ``profile`` holds the resulting ``pstats.Stats``.
+    """
+    timer = Timer()
+    token = _timer.set(timer)
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    try:
+        if profiler:
+            profiler.enable()
+        try:
+            yield timer
+        finally:
+            if profiler:
+                profiler.disable()
+    finally:
+        timer.total = time.perf_counter() - start
+        _timer.reset(token)
+    # A rerun cut short (st.rerun, st.stop) is not recorded; the run that follows it is
+    if profiler:
+        timer.profile = pstats.Stats(profiler)
+    if history is not None:
+        history.record(timer)
+
+
+class History:
+    """The last ``runs`` timings of every section, for rolling percentiles."""
+
+    def __init__(self, runs=HISTORY_RUNS):
+        self.runs = runs
+        self.totals = deque(maxlen=runs)
+        self.sections = {}
+
+    def record(self, timer):
+        self.totals.append(timer.total)
+        for path, seconds in timer.sections.items():
+            self.sections.setdefault(path, deque(maxlen=self.runs)).append(seconds)
+
+    def summary(self, timer):
+        """Rows of (section, this run, p50, p95, runs) in milliseconds, this run's sections in order."""
+        rows = [('Total', timer.total, *self._percentiles(self.totals))]
+        accounted = 0.0
+        for path, seconds in timer.sections.items():
+            if SEPARATOR not in path:
+                accounted += seconds
+            rows.append((path, seconds, *self._percentiles(self.sections.get(path, ()))))
+        rows.insert(1, ('(outside any section)', timer.total - accounted, None, None, None))
+        return [(name, *(None if v is None else v * 1e3 for v in values[:3]), values[3])
+                for name, *values in rows]
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return None, None, 0
+        if len(samples) == 1:
+            return samples[0], samples[0], 1
+        # Linear interpolation between the closest ranks, as numpy.percentile does
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+        return cuts[49], cuts[94], len(samples)
+
+
+def profile_report(stats, lines=PROFILE_LINES):
+    """The top ``lines`` functions by cumulative time, as pstats prints them."""
+    output = io.StringIO()
+    stats.stream = output
+    stats.sort_stats('cumulative').print_stats(lines)
+    return output.getvalue()
+
+
+def profile_dump(stats):
+    """``stats`` in the .prof format of ``pstats.Stats.dump_stats`` (snakeviz, pstats, ...)."""
+    return marshal.dumps(stats.stats)
@@ -0,0 +1,248 @@
+"""PDF reports of CECS scenarios.
+
+A report covers the headline KPIs, the financial statement, the enrollment
+scenario matrix, the multi-year projection and the risk dashboard. Charts are
+rendered to static PNGs offline (Plotly + Kaleido) and memoized on disk per
+chart and parameter hash, so rebuilding a report for an unchanged scenario
+never starts the renderer. Run as a script to write reports for many saved
+scenarios in parallel:
+
+    python report.py -o reports/
+    python report.py -o reports/ --user CECS --workers 4
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+import charts
+import model
+import scenarios
+import tables
+
+PDF_MIME = 'application/pdf'
+
+CHART_CACHE_ENV = 'CECS_CHART_CACHE'
+CHART_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'cecs-charts')
+# Bump when a chart's look changes so stale images are not reused
+CHART_CACHE_VERSION = 2
+CHART_WIDTH, CHART_HEIGHT, CHART_SCALE = 900, 450, 2
+
+ORANGE = colors.HexColor('#FF8200')
+
+# Each takes the parameters, their results and the projection assumptions
+CHARTS = {
+    'revenue_vs_expenses': lambda p, r, a: charts.revenue_vs_expenses(r['total_revenue'], r['total_cost']),
+    'expense_distribution': lambda p, r, a: charts.expense_distribution(tables.expenses(p, r)),
+    'enrollment_impact': lambda p, r, a: charts.enrollment_impact(model.enrollment_scenarios(p)),
+    'projection_forecast': lambda p, r, a: charts.projection_forecast(
+        model.project(p, **a._asdict()), model.projection_label(a, p.inflation_rate)),
+}
+
+
+def _money(value):
+    return f'${value:,.0f}'
+
+
+def parameter_hash(params, assumptions=None):
+    payload = [CHART_CACHE_VERSION, params._asdict()]
+    if assumptions is not None:
+        payload.append(assumptions._asdict())
+    payload = json.dumps(payload, sort_keys=True, default=float)
+    return hashlib.sha256(payload.encode()).hexdigest()[:20]
+
+
+def chart_image(name, params, results=None, assumptions=None):
+    """PNG bytes of chart ``name`` for ``params``, rendered once per parameter hash.
+
+    ``assumptions`` is the ``model.Projection`` of a projection chart; it is
+    hashed with the parameters, and None draws the default projection.
+    """
+    cache_dir = os.environ.get(CHART_CACHE_ENV) or CHART_CACHE_DIR
+    path = os.path.join(cache_dir, f'{name}-{parameter_hash(params, assumptions)}.png')
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    results = results or model.scalars(model.evaluate(params))
+    figure = CHARTS[name](params, results, assumptions or model.Projection())
+    png = figure.to_image(format='png', width=CHART_WIDTH, height=CHART_HEIGHT, scale=CHART_SCALE)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write then rename, so concurrent workers never read a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.png.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(png)
+    os.replace(tmp_path, path)
+    return png
+
+
+def _table(rows, header=True, widths=None):
+    table = Table(rows, colWidths=widths, repeatRows=1 if header else 0, hAlign='LEFT')
+    style = [
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]
+    if header:
+        style += [('BACKGROUND', (0, 0), (-1, 0), ORANGE),
+                  ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                  ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold')]
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def _chart(name, params, results, styles, assumptions=None):
+    try:
+        png = chart_image(name, params, results, assumptions)
+    except (RuntimeError, ValueError) as exc:
+        # Kaleido (and the Chrome it drives) is needed for static charts; the tables still stand alone
+        return Paragraph(f'<i>Chart unavailable: {exc}</i>', styles['Normal'])
+    width = 6.5 * inch
+    return Image(io.BytesIO(png), width=width, height=width * CHART_HEIGHT / CHART_WIDTH)
+
+
+def pdf_report(params, results=None, title='Financial Scenario Report', assumptions=model.Projection()):
+    """Return a PDF (bytes) covering KPIs, statement, scenarios, projections and risk for ``params``.
+
+    ``assumptions`` is the ``model.Projection`` behind the projection section.
+    """
+    results = results or model.scalars(model.evaluate(params))
+    r = results
+    styles = getSampleStyleSheet()
+    story = [
+        Paragraph('CECS Financial Analytics | UTK', styles['Title']),
+        Paragraph(f'{title} &mdash; {datetime.now():%Y-%m-%d %H:%M}', styles['Heading3']),
+        Spacer(1, 0.2 * inch),
+    ]
+
+    # KEY METRICS
+    breakeven = r['breakeven_students']
+    story += [
+        Paragraph('Key Metrics', styles['Heading2']),
+        _table([
+            ['Metric', 'Value'],
+            ['Students', f'{params.students:,}'],
+            ['Total Revenue', _money(r['total_revenue'])],
+            ['Total Expenses', _money(r['total_cost'])],
+            ['Net Position', _money(r['net_result'])],
+            ['Profit Margin', f"{r['margin']:.2f}%"],
+            ['Effective Net Position', _money(r['effective_net'])],
+            ['Total Personnel', f"{r['total_personnel']:,}"],
+            ['Break-Even Enrollment', f'{breakeven:,.0f} students' if pd.notna(breakeven) else 'Not reachable'],
+        ], widths=[2.5 * inch, 2 * inch]),
+        Spacer(1, 0.15 * inch),
+        _chart('revenue_vs_expenses', params, r, styles),
+        _chart('expense_distribution', params, r, styles),
+    ]
+
+    # FINANCIAL STATEMENT
+    statement = tables.financial_statement(params, r)
+    rows = [['Line Item', 'Amount', 'Details']]
+    rows += [[item, _money(amount) if pd.notna(amount) else '', details]
+             for item, amount, details in statement.itertuples(index=False, name=None)]
+    story += [Paragraph('Financial Statement', styles['Heading2']),
+              _table(rows, widths=[2.3 * inch, 1.4 * inch, 3 * inch])]
+
+    # ENROLLMENT SCENARIOS
+    scenario_data = model.enrollment_scenarios(params)
+    rows = [['Scenario', 'Students', 'Personnel', 'Revenue', 'Expenses', 'Net Position', 'Margin %']]
+    rows += [[label, f'{s:,}', f'{n:,}', _money(rev), _money(exp), _money(net), f'{m:.2f}%']
+             for label, s, n, rev, exp, net, m in scenario_data.itertuples(index=False, name=None)]
+    story += [Paragraph('Enrollment Scenarios', styles['Heading2']), _table(rows),
+              _chart('enrollment_impact', params, r, styles)]
+
+    # PROJECTIONS
+    projection_data = model.project(params, **assumptions._asdict())
+    rows = [['Year', 'Students', 'Revenue', 'Expenses', 'Net Position', 'Margin %']]
+    rows += [[year, f'{s:,}', _money(rev), _money(exp), _money(net), f'{m:.2f}%']
+             for year, s, rev, exp, net, m in projection_data.itertuples(index=False, name=None)]
+    story += [Paragraph(f'{assumptions.years}-Year Projections', styles['Heading2']), _table(rows),
+              _chart('projection_forecast', params, r, styles, assumptions)]
+
+    # RISK ASSESSMENT
+    buffer = r['breakeven_buffer']
+    story += [
+        Paragraph('Risk Assessment', styles['Heading2']),
+        _table([
+            ['Risk', 'Level', 'Indicator'],
+            ['Enrollment', model.risk_label(r['enrollment_risk']),
+             f'Buffer {buffer:.1f}%' if pd.notna(buffer) else 'Buffer N/A'],
+            ['Margin', model.risk_label(r['margin_risk']), f"Margin {r['margin']:.2f}%"],
+            ['Revenue Dependency', model.risk_label(r['dependency_risk']),
+             f"Tuition {r['tuition_share'] * 100:.1f}% of revenue"],
+            ['Personnel Cost', model.risk_label(r['personnel_risk']),
+             f"Personnel {r['personnel_ratio']:.1f}% of expenses"],
+        ], widths=[1.8 * inch, 1 * inch, 2.5 * inch]),
+    ]
+
+    output = io.BytesIO()
+    SimpleDocTemplate(output, pagesize=letter, title=title,
+                      leftMargin=0.75 * inch, rightMargin=0.75 * inch).build(story)
+    return output.getvalue()
+
+
+# ========== BATCH MODE ==========
+def _file_name(scenario):
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', scenario.name).strip('-').lower() or 'scenario'
+    return f'{scenario.id:05d}-{slug}.pdf'
+
+
+def _write_report(job):
+    path, params, results, title = job
+    with open(path, 'wb') as f:
+        f.write(pdf_report(params, results, title))
+    return path
+
+
+def run(output_dir, store_url=None, user=None, workers=None):
+    """Write one PDF per saved scenario into ``output_dir``; returns the paths written."""
+    store = scenarios.open_store(store_url)
+    saved = store.list(user=user, limit=store.count(user=user))
+    os.makedirs(output_dir, exist_ok=True)
+    # Stored results are recomputed, so reports always reflect the current model
+    jobs = [(os.path.join(output_dir, _file_name(s)), s.params, None, s.name) for s in saved]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_write_report, jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write PDF reports for saved CECS scenarios.")
+    parser.add_argument("-o", "--output", required=True, help="directory to write the PDFs into")
+    parser.add_argument("--store", default=None,
+                        help=f"scenario store URL (default: ${scenarios.STORE_URL_ENV} or {scenarios.DEFAULT_URL})")
+    parser.add_argument("--user", default=None, help="only scenarios saved by this user")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be positive")
+
+    start = time.perf_counter()
+    try:
+        paths = run(args.output, args.store, args.user, args.workers)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(paths):,} reports to {args.output} in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Monte Carlo risk simulation on top of the financial model.
+
+Enrollment, tuition, inflation and salaries are sampled around the current
+scenario and every draw is pushed through ``model.evaluate`` in one
+vectorized batch, so the integer-floor staffing rules apply draw by draw.
+"""
+
+import numpy as np
+
+import model
+
+DEFAULT_DRAWS = 100000
+DEFAULT_SEED = 2025
+DEFAULT_CONFIDENCE = 0.95
+
+# Standard deviations: enrollment, tuition and salaries are relative (0.10 = 10%),
+# inflation is in percentage points around the planned inflation_rate
+DEFAULT_ENROLLMENT_SD = 0.10
+DEFAULT_TUITION_SD = 0.05
+DEFAULT_INFLATION_SD = 1.0
+DEFAULT_SALARY_SD = 0.03
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Probability-of-deficit thresholds for the LOW / MEDIUM / HIGH risk levels
+DEFICIT_RISK_THRESHOLDS = (0.05, 0.20)
+
+
+def sample_inputs(inputs=None, draws=DEFAULT_DRAWS, enrollment_sd=DEFAULT_ENROLLMENT_SD,
+                  tuition_sd=DEFAULT_TUITION_SD, inflation_sd=DEFAULT_INFLATION_SD,
+                  salary_sd=DEFAULT_SALARY_SD, seed=DEFAULT_SEED):
+    """Draw ``draws`` perturbed parameter sets around ``inputs``."""
+    p = model.resolve_inputs(inputs)
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((4, draws))
+
+    sampled = dict(p)
+    sampled['students'] = np.maximum(np.floor(p['students'] * (1 + enrollment_sd * z[0])), 0)
+    sampled['tuition_per_student'] = np.maximum(p['tuition_per_student'] * (1 + tuition_sd * z[1]), 0)
+
+    # Costs are budgeted at the planned inflation rate; only the surprise moves them
+    inflation = p['inflation_rate'] + inflation_sd * z[2]
+    cost_factor = np.maximum(1 + (inflation - p['inflation_rate']) / 100, 0)
+    salary_factor = np.maximum(1 + salary_sd * z[3], 0) * cost_factor
+    for field in model.PAY_FIELDS:
+        sampled[field] = p[field] * salary_factor
+    sampled['operating_per_student'] = p['operating_per_student'] * cost_factor
+    sampled['inflation_rate'] = inflation
+    return sampled
+
+
+def summarize(net, confidence=DEFAULT_CONFIDENCE):
+    """Deficit probability, VaR/CVaR and percentile bands of simulated net positions."""
+    net = np.asarray(net, dtype=float)
+    p_deficit = float(np.mean(net < 0))
+    var = float(np.quantile(net, 1 - confidence))
+    tail = net[net <= var]
+    cvar = float(tail.mean()) if tail.size else var
+    thresholds = DEFICIT_RISK_THRESHOLDS
+    return {
+        'draws': int(net.size),
+        'confidence': confidence,
+        'mean': float(net.mean()),
+        'std': float(net.std()),
+        'p_deficit': p_deficit,
+        'var': var,
+        'cvar': cvar,
+        'percentiles': dict(zip(PERCENTILES, np.percentile(net, PERCENTILES).tolist())),
+        'deficit_risk': 0 if p_deficit < thresholds[0] else (1 if p_deficit < thresholds[1] else 2),
+    }
+
+
+def simulate(inputs=None, draws=DEFAULT_DRAWS, confidence=DEFAULT_CONFIDENCE, **uncertainty):
+    """Run a Monte Carlo simulation and return (summary, simulated net positions).
+
+    ``uncertainty`` accepts the keyword arguments of ``sample_inputs``.
+    """
+    sampled = sample_inputs(inputs, draws=draws, **uncertainty)
+    # Only the net position is summarized, so the per-draw break-even solve is skipped
+    net = model.evaluate(sampled, breakeven=False)['net_result']
+    return summarize(net, confidence), net
@@ -0,0 +1,223 @@
+"""Persistent scenario store for the CECS dashboard.
+
+A saved scenario is the full ``model.Parameters`` bundle plus the scalar
+results computed from it, tagged with a name, the user who saved it and a
+timestamp. Storage is pluggable: ``open_store`` picks a backend from a URL
+scheme (only ``sqlite`` ships here), and ``CachedStore`` puts a small
+per-session LRU cache in front of whichever backend is shared by the server.
+"""
+
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+import model
+
+DEFAULT_URL = 'sqlite:///scenarios.db'
+STORE_URL_ENV = 'CECS_SCENARIO_STORE'
+
+PAGE_SIZE = 5
+SESSION_CACHE_ENTRIES = 32
+# Cached list pages expire so scenarios saved from other sessions show up
+SESSION_PAGE_TTL_SECONDS = 30
+
+Scenario = namedtuple('Scenario', ('id', 'name', 'user', 'created_at', 'params', 'results'))
+
+
+def _to_json(values):
+    return json.dumps({k: v.item() if hasattr(v, 'item') else v for k, v in values.items()})
+
+
+class ScenarioStore(abc.ABC):
+    """Backend interface; every backend implements these methods."""
+
+    @abc.abstractmethod
+    def save(self, name, user, params, results):
+        """Store a scenario and return its id."""
+
+    @abc.abstractmethod
+    def get(self, scenario_id):
+        """Return the Scenario with ``scenario_id``, or None."""
+
+    @abc.abstractmethod
+    def list(self, user=None, name=None, since=None, until=None, limit=PAGE_SIZE, offset=0):
+        """Newest-first Scenarios, optionally filtered by user, name prefix and date range."""
+
+    @abc.abstractmethod
+    def count(self, user=None, name=None, since=None, until=None):
+        """Number of scenarios matching the same filters as ``list``."""
+
+    @abc.abstractmethod
+    def delete(self, scenario_id):
+        """Remove the scenario with ``scenario_id``; an unknown id is ignored."""
+
+
+class SQLiteScenarioStore(ScenarioStore):
+    """Scenarios in one SQLite table, indexed for lookup by user, name and date."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scenarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL COLLATE NOCASE,
+            user TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            params TEXT NOT NULL,
+            results TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scenarios_user_created ON scenarios (user, created_at);
+        CREATE INDEX IF NOT EXISTS scenarios_name ON scenarios (name);
+        CREATE INDEX IF NOT EXISTS scenarios_created ON scenarios (created_at);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # One connection shared by every session thread, serialized by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(self._SCHEMA)
+
+    @staticmethod
+    def _where(user, name, since, until):
+        clauses, args = [], []
+        if user is not None:
+            clauses.append('user = ?')
+            args.append(user)
+        if name:
+            # Prefix match; served by the NOCASE name index
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            args.append(name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if since is not None:
+            clauses.append('created_at >= ?')
+            args.append(since)
+        if until is not None:
+            clauses.append('created_at < ?')
+            args.append(until)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', args
+
+    @staticmethod
+    def _scenario(row):
+        scenario_id, name, user, created_at, params, results = row
+        return Scenario(scenario_id, name, user, created_at,
+                        model.Parameters(**json.loads(params)), json.loads(results))
+
+    def save(self, name, user, params, results):
+        created_at = datetime.now().isoformat(sep=' ', timespec='seconds')
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO scenarios (name, user, created_at, params, results) VALUES (?, ?, ?, ?, ?)',
+                (name, user, created_at, _to_json(params._asdict()), _to_json(results)))
+        return cursor.lastrowid
+
+    def get(self, scenario_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, name, user, created_at, params, results FROM scenarios WHERE id = ?',
+                (scenario_id,)).fetchone()
+        return self._scenario(row) if row else None
+
+    def list(self, user=None, name=None, since=None, until=None, limit=PAGE_SIZE, offset=0):
+        where, args = self._where(user, name, since, until)
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, name, user, created_at, params, results FROM scenarios'
+                f'{where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?',
+                (*args, limit, offset)).fetchall()
+        return [self._scenario(row) for row in rows]
+
+    def count(self, user=None, name=None, since=None, until=None):
+        where, args = self._where(user, name, since, until)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM scenarios{where}', args).fetchone()[0]
+
+    def delete(self, scenario_id):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM scenarios WHERE id = ?', (scenario_id,))
+
+    def close(self):
+        self._conn.close()
+
+
+# Backends by URL scheme; register another ScenarioStore subclass here to swap storage
+BACKENDS = {
+    'sqlite': lambda location: SQLiteScenarioStore(location or ':memory:'),
+}
+
+
+def open_store(url=None):
+    """Open the store at ``url`` (``scheme:///location``), defaulting to $CECS_SCENARIO_STORE.
+
+    A bare path is treated as a SQLite file.
+    """
+    url = url or os.environ.get(STORE_URL_ENV) or DEFAULT_URL
+    scheme, separator, location = url.partition('://')
+    if not separator:
+        scheme, location = 'sqlite', url
+    elif location.startswith('/'):
+        location = location[1:]
+    if scheme not in BACKENDS:
+        raise ValueError(f"unknown scenario store '{scheme}'; expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[scheme](location)
+
+
+class CachedStore:
+    """Bounded per-session LRU cache in front of a shared ScenarioStore.
+
+    Scenarios are cached by id and list pages by their query for up to
+    ``page_ttl`` seconds; saving or deleting through this wrapper drops the
+    cached pages at once.
+    """
+
+    def __init__(self, store, max_entries=SESSION_CACHE_ENTRIES, page_ttl=SESSION_PAGE_TTL_SECONDS):
+        self.store = store
+        self.max_entries = max_entries
+        self.page_ttl = page_ttl
+        self._scenarios = OrderedDict()
+        self._pages = OrderedDict()
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+        return value
+
+    def _page(self, key, fetch):
+        cached = self._pages.get(key)
+        if cached is None or time.monotonic() - cached[0] > self.page_ttl:
+            cached = self._remember(self._pages, key, (time.monotonic(), fetch()))
+        self._pages.move_to_end(key)
+        return cached[1]
+
+    def save(self, name, user, params, results):
+        scenario_id = self.store.save(name, user, params, results)
+        self._pages.clear()
+        return scenario_id
+
+    def get(self, scenario_id):
+        if scenario_id in self._scenarios:
+            self._scenarios.move_to_end(scenario_id)
+            return self._scenarios[scenario_id]
+        scenario = self.store.get(scenario_id)
+        return self._remember(self._scenarios, scenario_id, scenario) if scenario else None
+
+    def list(self, user=None, name=None, since=None, until=None, limit=PAGE_SIZE, offset=0):
+        page = self._page(('list', user, name, since, until, limit, offset),
+                          lambda: self.store.list(user, name, since, until, limit, offset))
+        for scenario in page:
+            self._remember(self._scenarios, scenario.id, scenario)
+        return page
+
+    def count(self, user=None, name=None, since=None, until=None):
+        return self._page(('count', user, name, since, until),
+                          lambda: self.store.count(user, name, since, until))
+
+    def delete(self, scenario_id):
+        self.store.delete(scenario_id)
+        self._scenarios.pop(scenario_id, None)
+        self._pages.clear()
@@ -0,0 +1,51 @@
+"""Minified build of the dashboard stylesheet.
+
+static/cecs.css is the source; the dashboard serves static/cecs.min.css, which
+Streamlit's static file serving sends uncompressed. Rebuild it after editing
+the source (tests/test_stylesheet.py fails while the two are out of sync):
+
+    python stylesheet.py
+"""
+
+import argparse
+import os
+import re
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+SOURCE_PATH = os.path.join(STATIC_DIR, 'cecs.css')
+MINIFIED_PATH = os.path.join(STATIC_DIR, 'cecs.min.css')
+
+
+def minify(css):
+    """``css`` without comments and optional whitespace.
+
+    Conservative: a space before ':' is kept, since in a selector it is a
+    descendant combinator, and nothing inside parentheses is rewritten beyond
+    collapsing runs of whitespace.
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip() + '\n'
+
+
+def build(source=SOURCE_PATH, output=MINIFIED_PATH):
+    with open(source, encoding='utf-8') as f:
+        css = minify(f.read())
+    with open(output, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(css)
+    return css
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the minified dashboard stylesheet.")
+    parser.add_argument("-o", "--output", default=MINIFIED_PATH, help=f"output file (default: {MINIFIED_PATH})")
+    args = parser.parse_args(argv)
+
+    css = build(output=args.output)
+    print(f"{os.path.getsize(SOURCE_PATH):,} -> {len(css.encode()):,} bytes: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
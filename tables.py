@@ -0,0 +1,170 @@
+"""Numeric tables behind the dashboard's dataframes and exports.
+
+Each function takes a ``model.Parameters`` bundle and the scalar results for
+it (``model.scalars(model.evaluate(params))``) and returns a DataFrame whose
+money, count and percentage columns are real numbers; formatting is left to
+whoever displays or exports the table.
+"""
+
+import numpy as np
+import pandas as pd
+
+import model
+
+
+# Display formats per column as printf patterns (st.column_config / sprintf-js);
+# export.py maps the same patterns onto Excel number formats
+MONEY = '$%,.0f'
+COUNT = '%,d'
+RATIO = '1:%d'
+PERCENT = '%.1f%%'
+MARGIN = '%.2f%%'
+DECIMAL = '%.1f'
+
+COLUMN_FORMATS = {
+    **{column: MONEY for column in (
+        'Amount', 'Total Annual Cost', 'Avg Salary', 'Total Cost', 'Tuition',
+        'Revenue', 'Expenses', 'Net Position',
+        *(model.INPUT_LABELS[f] for f in ('tuition_per_student', 'other_revenue', *model.PAY_FIELDS,
+                                          'operating_per_student')))},
+    **{column: COUNT for column in (
+        'Count', 'Students', 'Personnel', 'Break-Even Students', *model.ROLE_LABELS,
+        *(model.INPUT_LABELS[f] for f in ('students', *model.RATIO_FIELDS)))},
+    **{column: COUNT for column in ('Current Count', 'Optimal Count')},
+    **{column: RATIO for column in ('Ratio', 'Current Ratio', 'Optimal Ratio')},
+    'Students per Faculty': DECIMAL,
+    '% of Total': PERCENT,
+    '% of Personnel Budget': PERCENT,
+    'Margin %': MARGIN,
+}
+
+
+def _share(part, whole):
+    return part / whole * 100 if whole > 0 else 0.0
+
+
+def inputs(params):
+    return pd.DataFrame({
+        'Input': [model.INPUT_LABELS[f] for f in model.INPUT_FIELDS],
+        'Value': [getattr(params, f) for f in model.INPUT_FIELDS],
+    })
+
+
+def cost(params, results):
+    return pd.DataFrame({
+        'Position': list(model.ROLE_LABELS),
+        'Total Cost': [results[k] for k in model.COST_FIELDS]
+    })
+
+
+def expenses(params, results):
+    r = results
+    return pd.DataFrame({
+        'Category': ['Faculty (FT)', 'Faculty (Adj)', 'Staff', 'Ambassadors',
+                     'Graders', 'Tutors', 'Operations'],
+        'Amount': [*(r[k] for k in model.COST_FIELDS), r['operating_cost']]
+    })
+
+
+def staffing(params, results):
+    r = results
+    return pd.DataFrame({
+        'Position': list(model.ROLE_LABELS),
+        'Count': [r[k] for k in model.HEADCOUNT_FIELDS],
+        'Ratio': [getattr(params, k) for k in model.RATIO_FIELDS],
+        '% of Total': [_share(r[k], r['total_personnel']) for k in model.HEADCOUNT_FIELDS]
+    })
+
+
+def staffing_plan(params, results, optimal, optimal_results):
+    """Current against optimal ratio and headcount per role (see ``model.optimize_staffing``)."""
+    return pd.DataFrame({
+        'Position': list(model.ROLE_LABELS),
+        'Current Ratio': [getattr(params, k) for k in model.RATIO_FIELDS],
+        'Optimal Ratio': [getattr(optimal, k) for k in model.RATIO_FIELDS],
+        'Current Count': [results[k] for k in model.HEADCOUNT_FIELDS],
+        'Optimal Count': [optimal_results[k] for k in model.HEADCOUNT_FIELDS],
+    })
+
+
+def compensation(params, results):
+    r = results
+    return pd.DataFrame({
+        'Position': list(model.ROLE_LABELS),
+        'Total Annual Cost': [r[k] for k in model.COST_FIELDS],
+        'Avg Salary': [getattr(params, k) for k in model.PAY_FIELDS],
+        '% of Personnel Budget': [_share(r[k], r['total_personnel_cost']) for k in model.COST_FIELDS]
+    })
+
+
+def financial_statement(params, results):
+    r = results
+    p = params
+    rows = [
+        ('═══ REVENUE ═══', None, ''),
+        ('Tuition Revenue', r['tuition_revenue'], f'{p.students:,} students × ${p.tuition_per_student:,}/student'),
+        ('Other Revenue Sources', p.other_revenue, 'Grants, donations, auxiliary services'),
+        ('Total Revenue', r['total_revenue'], f'{r["total_revenue"]:,.0f}'),
+        ('', None, ''),
+        ('═══ EXPENSES ═══', None, ''),
+        ('--- Personnel ---', None, ''),
+        ('Full-Time Faculty Salaries', r['faculty_cost'],
+         f'{r["full_time_faculty"]} positions × ${p.faculty_salary:,}/year'),
+        ('Adjunct Faculty Salaries', r['adjunct_cost'],
+         f'{r["adjunct_faculty"]} positions × ${p.adjunct_salary:,}/year'),
+        ('Staff Salaries', r['staff_cost'], f'{r["staff_members"]} positions × ${p.staff_salary:,}/year'),
+        ('Student Ambassador Pay', r['ambassador_cost'], f'{r["ambassadors"]} positions × ${p.ambassador_pay:,}/year'),
+        ('Grader Compensation', r['grader_cost'], f'{r["graders"]} positions × ${p.grader_pay:,}/year'),
+        ('Tutor Compensation', r['tutor_cost'], f'{r["tutors"]} positions × ${p.tutor_pay:,}/year'),
+        ('Total Personnel Cost', r['total_personnel_cost'], f'{r["total_personnel"]} total positions'),
+        ('', None, ''),
+        ('--- Operations ---', None, ''),
+        ('Operating Supplies', r['operating_cost'], f'{p.students:,} students × ${p.operating_per_student}/student'),
+        ('Total Operating Cost', r['operating_cost'], 'Books, supplies, technology'),
+        ('', None, ''),
+        ('TOTAL EXPENSES', r['total_cost'],
+         f'{(r["total_cost"] / r["total_revenue"] * 100):.1f}% of revenue' if r['total_revenue'] > 0 else ''),
+        ('', None, ''),
+        ('═══ SUMMARY ═══', None, ''),
+        ('Net Position', r['net_result'], 'Surplus' if r['net_result'] >= 0 else 'Deficit'),
+        ('Contingency Fund', r['contingency_amount'], f'{p.contingency_fund}% reserve'),
+        ('Effective Net Position', r['effective_net'], 'After contingency'),
+    ]
+    line_items, amounts, details = zip(*rows)
+    return pd.DataFrame({
+        'Line Item': line_items,
+        'Amount': np.array([np.nan if a is None else a for a in amounts], dtype=float),
+        'Details': details,
+    })
+
+
+def saved_scenarios(scenarios):
+    """One row per saved scenario: name, owner, date, every input and the headline results."""
+    return pd.DataFrame({
+        'Scenario': [s.name for s in scenarios],
+        'Saved By': [s.user for s in scenarios],
+        'Saved': [s.created_at for s in scenarios],
+        **{model.INPUT_LABELS[f]: [getattr(s.params, f) for s in scenarios] for f in model.INPUT_FIELDS},
+        'Revenue': [s.results.get('total_revenue') for s in scenarios],
+        'Expenses': [s.results.get('total_cost') for s in scenarios],
+        'Net Position': [s.results.get('net_result') for s in scenarios],
+        'Margin %': [s.results.get('margin') for s in scenarios],
+        'Personnel': [s.results.get('total_personnel') for s in scenarios],
+        'Break-Even Students': [s.results.get('breakeven_students') for s in scenarios],
+    })
+
+
+def comparison(scenarios, results, labels):
+    """One row per parameter bundle in ``scenarios``, from its scalar ``results``, under its label."""
+    return pd.DataFrame({
+        'Scenario': list(labels),
+        'Students': np.array([p.students for p in scenarios], dtype=np.int64),
+        'Tuition': np.array([p.tuition_per_student for p in scenarios], dtype=float),
+        'Revenue': [r['total_revenue'] for r in results],
+        'Expenses': [r['total_cost'] for r in results],
+        'Net Position': [r['net_result'] for r in results],
+        'Margin %': [r['margin'] for r in results],
+        'Personnel': [r['total_personnel'] for r in results],
+        **{label: [r[k] for r in results] for label, k in zip(model.ROLE_LABELS, model.HEADCOUNT_FIELDS)},
+        'Break-Even Students': [r['breakeven_students'] for r in results],
+    })
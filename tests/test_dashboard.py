@@ -0,0 +1,42 @@
+import json
+import os
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Calc.py')
+DASHBOARD = "📊 Executive Dashboard"
+ADVANCED = "📈 Advanced Analytics"
+
+
+def open_tab(app, label):
+    app.session_state['active_tab'] = label
+    return app.run()
+
+
+def test_tab_widgets_keep_their_values_across_tab_switches():
+    # Closed tabs are not rendered, so their widgets must come back with the values they were left at
+    app = AppTest.from_file(APP, default_timeout=60)
+    app.session_state['logged_in'] = True
+    open_tab(app, ADVANCED)
+    app.slider(key='tornado_change').set_value(30).run()
+    app.toggle(key='monte_carlo_mode').set_value(True).run()
+    app.selectbox(key='grid_metric').set_value('margin').run()
+
+    open_tab(app, DASHBOARD)
+    open_tab(app, ADVANCED)
+
+    assert not app.exception
+    assert app.slider(key='tornado_change').value == 30
+    assert app.toggle(key='monte_carlo_mode').value is True
+    assert app.selectbox(key='grid_metric').value == 'margin'
+
+
+def test_light_theme_draws_charts_with_the_light_template():
+    app = AppTest.from_file(APP, default_timeout=60)
+    app.session_state['logged_in'] = True
+    app.session_state['theme'] = 'light'
+    open_tab(app, DASHBOARD)
+
+    templates = {json.loads(chart.proto.spec)['layout']['template']['layout']['paper_bgcolor']
+                 for chart in app.get('plotly_chart')}
+    assert templates == {'#ffffff'}
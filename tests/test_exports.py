@@ -0,0 +1,22 @@
+import io
+
+import pandas as pd
+
+import export
+import model
+import report
+
+
+def test_excel_projections_follow_the_projection_assumptions():
+    assumptions = model.Projection(years=7, growth=(0.05, 0.02), enrollment='cohort')
+    workbook = export.excel_workbook(model.Parameters(), assumptions=assumptions)
+
+    sheet = pd.read_excel(io.BytesIO(workbook), sheet_name='Projections')
+    expected = model.project(model.Parameters(), **assumptions._asdict())
+    assert sheet['Year'].tolist() == expected['Year'].tolist()
+    assert sheet['Net Position'].tolist() == expected['Net Position'].tolist()
+
+
+def test_projection_chart_images_are_keyed_on_the_assumptions():
+    params = model.Parameters()
+    assert report.parameter_hash(params, model.Projection(years=7)) != report.parameter_hash(params, model.Projection())
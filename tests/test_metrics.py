@@ -0,0 +1,26 @@
+import gc
+import os
+
+from streamlit.testing.v1 import AppTest
+
+import metrics
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Calc.py')
+
+
+def gauge(name):
+    # Collect first, so a session whose state nothing else holds is not counted
+    gc.collect()
+    samples = dict(line.rsplit(' ', 1) for line in metrics.exposition().splitlines() if not line.startswith('#'))
+    return float(samples[name])
+
+
+def test_a_session_stays_counted_across_reruns():
+    app = AppTest.from_file(APP, default_timeout=60)
+    app.session_state['logged_in'] = True
+    app.run()
+    app.run()
+
+    # Every AppTest runs under the same session id, so earlier tests' apps count as this one
+    assert gauge('cecs_scenario_sessions') == 1
+    assert gauge('cecs_scenario_session_memory_bytes') > 0
@@ -0,0 +1,117 @@
+import gc
+import itertools
+import tracemalloc
+
+import numpy as np
+
+import model
+
+
+def test_evaluate_releases_batch_memory_without_gc():
+    # Every intermediate array must be freed by reference counting alone; a reference
+    # cycle would keep each call's arrays alive until the cyclic collector happens to run
+    batch = {'students': np.arange(200_000) + 1000}
+    model.evaluate(batch)
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        for _ in range(5):
+            model.evaluate(batch)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    assert retained < 2 ** 20
+
+
+def test_recalculation_matches_a_full_evaluation():
+    recalculation = model.Recalculation()
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        inputs = {'students': int(rng.integers(0, 20000)), 'tutor_pay': float(rng.choice([12000, 12500])),
+                  'faculty_ratio': int(rng.choice([40, 50])), 'contingency_fund': float(rng.choice([5, 8]))}
+        expected = model.scalars(model.evaluate(inputs))
+        actual = recalculation.update(inputs).results()
+        assert actual.keys() == expected.keys()
+        assert all(np.isclose(actual[k], expected[k], equal_nan=True) for k in expected)
+
+
+def test_recalculation_recomputes_only_nodes_downstream_of_a_changed_input():
+    recalculation = model.Recalculation().update()
+    recalculation.results()
+
+    recalculation.update().results()
+    assert recalculation.recomputed == {}
+
+    recalculation.update({'tutor_pay': 12500}).results()
+    assert 'tutor_cost' in recalculation.recomputed
+    assert not set(recalculation.recomputed) & set(model.HEADCOUNT_FIELDS)
+    assert 'revenue_per_student' not in recalculation.recomputed
+
+    recalculation.update({'tutor_pay': 12500, 'contingency_fund': 8}).results()
+    assert list(recalculation.recomputed) == ['contingency_amount', 'effective_net']
+
+
+def test_breakeven_enrollment_matches_a_linear_scan():
+    students = np.arange(20_001)
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        inputs = {'tuition_per_student': rng.uniform(2500, 6000), 'faculty_ratio': int(rng.integers(20, 60)),
+                  'other_revenue': float(rng.choice([0, -1e6]))}
+        target = float(rng.choice([0, 1e6, 5e6]))
+        net = model.evaluate({**inputs, 'students': students}, breakeven=False)['net_result']
+        # The smallest enrollment after the last one that misses the target
+        misses = np.flatnonzero(net < target)
+        expected = misses[-1] + 1 if misses.size else 0
+
+        actual = model.breakeven_enrollment(inputs, target).item()
+        if expected > students[-1]:
+            assert np.isnan(actual) or actual > students[-1]
+        else:
+            assert actual == expected
+
+
+def test_goal_seek_reaches_its_target():
+    params = model.Parameters()
+    for metric, target in (('net_result', 2e7), ('net_result', 5e7), ('margin', 40.0), ('margin', 70.0)):
+        for field in model.GOAL_FIELDS:
+            value = model.goal_seek(params, field, target, metric).item()
+            if field == 'students' or field in model.RATIO_FIELDS:
+                # Stepped fields: the smallest whole value that meets the target, found by exhaustive search
+                low, high = (0, 20_000) if field == 'students' else model.RATIO_BOUNDS[field]
+                candidates = np.arange(low, high + 1)
+                reached = model.evaluate({**params._asdict(), field: candidates}, breakeven=False)[metric] >= target
+                if field == 'students':
+                    # From which the target keeps holding, as break-even enrollment
+                    reached = np.logical_and.accumulate(reached[::-1])[::-1]
+                expected = candidates[reached][0] if reached.any() else np.nan
+                assert value == expected or np.isnan(value) and np.isnan(expected), (field, metric, target)
+            else:
+                reached = model.scalars(model.evaluate({**params._asdict(), field: value}, breakeven=False))[metric]
+                if value == 0:
+                    assert reached >= target, (field, metric, target)
+                else:
+                    assert np.isclose(reached, target), (field, metric, target)
+
+
+def test_optimize_staffing_matches_an_exhaustive_search():
+    bounds = {**model.RATIO_BOUNDS, 'faculty_ratio': (10, 40), 'adjunct_ratio': (20, 60), 'staff_ratio': (50, 52),
+              'ambassador_ratio': (100, 102), 'grader_ratio': (50, 52), 'tutor_ratio': (50, 52)}
+    grid = np.array(list(itertools.product(*(range(low, high + 1) for low, high in
+                                              (bounds[r] for r in model.RATIO_FIELDS)))))
+    for students, min_margin, limit, budget in ((600, 0, 35, None), (1000, 30, 20, None), (1000, 0, 25, 5e6),
+                                                (450, 95, 35, None)):
+        params = model.Parameters(students=students)
+        out = model.evaluate({**params._asdict(), **dict(zip(model.RATIO_FIELDS, grid.T))}, breakeven=False)
+        feasible = ((out['margin'] >= min_margin)
+                    & (out['full_time_faculty'] + out['adjunct_faculty'] >= np.ceil(students / limit)))
+        if budget is not None:
+            feasible &= out['total_cost'] <= budget
+
+        best, _ = model.optimize_staffing(params, min_margin, limit, budget, bounds=bounds)
+        if not feasible.any():
+            assert best is None
+            continue
+        assert best is not None
+        assert model.scalars(model.evaluate(best))['net_result'] == out['net_result'][feasible].max()
@@ -0,0 +1,11 @@
+import stylesheet
+
+
+def test_minified_stylesheet_is_built_from_the_source():
+    with open(stylesheet.SOURCE_PATH, encoding='utf-8') as f:
+        source = f.read()
+    with open(stylesheet.MINIFIED_PATH, encoding='utf-8') as f:
+        minified = f.read()
+    # Rebuild with `python stylesheet.py` after editing static/cecs.css
+    assert minified == stylesheet.minify(source)
+    assert minified.count('{') == minified.count('}') == source.count('}')